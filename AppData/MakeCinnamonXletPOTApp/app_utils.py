@@ -12,15 +12,15 @@ root_folder : str
     from this location without exceptions.
 """
 
+import copy
 import datetime
 import json
 import os
+import re
 import time
 
 from collections import OrderedDict
-from shutil import copy2
-from shutil import ignore_patterns
-from shutil import rmtree
+from fnmatch import fnmatch
 
 
 from .__init__ import __version__
@@ -29,6 +29,8 @@ from .python_utils import exceptions
 from .python_utils import file_utils
 from .python_utils import misc_utils
 from .python_utils import polib
+from .source_catalog import SourceCatalog
+from .source_catalog import occurrence_sort_key
 
 
 root_folder = os.path.realpath(os.path.abspath(os.path.join(
@@ -36,6 +38,9 @@ root_folder = os.path.realpath(os.path.abspath(os.path.join(
 
 LOCALE_DIR = os.path.join(os.path.expanduser("~"), ".local/share/locale")
 
+_pot_creation_date_re = re.compile(r'^("POT-Creation-Date: )[^\n]*\\n"$', re.MULTILINE)
+_non_ascii_re = re.compile(r"[^\x00-\x7f]")
+
 POT_HEADER = """# This is a template file for translating the {PACKAGE} package.
 # Copyright (C) {COPY_INITIAL_YEAR}{COPY_CURRENT_YEAR}
 # This file is distributed under the same license as the {PACKAGE} package.
@@ -106,64 +111,555 @@ def _get_timestamp():
     return "%s-%s-%s %s:%s%s" % (YEAR, MO, DA, HO, MI, ZONE)
 
 
-def _scan_json(xlet_dir, pot_path, ignored_keys=[]):
+def _is_ignored(name, rel_path, ignored_patterns):
+    """Check if a file or folder should be ignored.
+
+    Parameters
+    ----------
+    name : str
+        A file or folder name.
+    rel_path : str
+        The path to the file or folder relative to the xlet directory.
+    ignored_patterns : list
+        A list of glob-style patterns.
+
+    Returns
+    -------
+    bool
+        If any of the patterns matches the name or the relative path.
+    """
+    for pattern in ignored_patterns:
+        if fnmatch(name, pattern) or fnmatch(rel_path, pattern):
+            return True
+
+    return False
+
+
+def _walk_xlet(xlet_dir, ignored_patterns=[]):
+    """Walk an xlet directory once and sort the files found by type.
+
+    Folders matching any of the ignored patterns are not entered and files matching any of them
+    are not stored. Symbolic links to folders are not followed and symbolic links to JSON files
+    are ignored.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    ignored_patterns : list, optional
+        A list of glob-style file/folder name patterns to ignore.
+
+    Returns
+    -------
+    dict
+        The paths of the found files relative to the xlet directory, in the same order that
+        ``os.walk`` would find them with sorted folders and files. JavaScript files are stored
+        in the ``js`` key, Python files in the ``py`` key and ``metadata.json`` and
+        ``settings-schema.json`` files in the ``json`` key.
+    """
+    found = {
+        "js": [],
+        "py": [],
+        "json": []
+    }
+    # NOTE: The relative paths are built exactly as they were built when using os.path.relpath
+    # on the roots returned by os.walk. That is, files at the root of the xlet are prefixed
+    # with "./" but files inside sub-folders are not.
+    stack = [(xlet_dir, "")]
+
+    while stack:
+        root, rel_root = stack.pop()
+        sub_dirs = []
+
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+
+        for entry in entries:
+            rel_path = os.path.join(rel_root or ".", entry.name)
+
+            if ignored_patterns and _is_ignored(entry.name, rel_path, ignored_patterns):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                sub_dirs.append((entry.path, os.path.join(rel_root, entry.name)))
+            elif entry.name[-3:] == ".js":
+                found["js"].append(rel_path)
+            elif entry.name[-3:] == ".py":
+                found["py"].append(rel_path)
+            elif entry.name in ("metadata.json", "settings-schema.json") and \
+                    not entry.is_symlink():
+                found["json"].append(rel_path)
+
+        stack.extend(reversed(sub_dirs))
+
+    return found
+
+
+def _call_xgettext(xlet_dir, files, language, keywords):
+    """Run xgettext over one or more files.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    files : list
+        The paths to the files to scan. Relative to the xlet directory or absolute.
+    language : str
+        The language of the files as recognized by xgettext (JavaScript or Python).
+    keywords : list
+        The keywords to look for.
+
+    Returns
+    -------
+    subprocess.CompletedProcess
+        The result of the command. Its output is the generated POT file.
+    """
+    return cmd_utils.run_cmd(["xgettext"] + ["--keyword=" + item for item in keywords] + [
+        "--no-wrap",
+        "--add-comments",
+        "--from-code=UTF-8",
+        "--language=%s" % language,
+        "--output=-",
+    ] + list(files), cwd=xlet_dir)
+
+
+def _parse_xgettext_output(output):
+    """Parse the POT file generated by xgettext.
+
+    Parameters
+    ----------
+    output : bytes
+        The output of xgettext.
+
+    Returns
+    -------
+    polib.POFile|list
+        The extracted entries.
+    """
+    output = output.decode("UTF-8")
+
+    if not output.strip():
+        return []
+
+    return polib.pofile(output, encoding="UTF-8", fast_parser=True)
+
+
+def _run_xgettext(xlet_dir, file, language, keywords):
+    """Extract the translatable strings from a single file using xgettext.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    file : str
+        The path to the file to scan. Relative to the xlet directory or absolute.
+    language : str
+        The language of the file as recognized by xgettext (JavaScript or Python).
+    keywords : list
+        The keywords to look for.
+
+    Returns
+    -------
+    list
+        The extracted entries. See :any:`_entry_to_dict`.
+    """
+    return [_entry_to_dict(entry) for entry in _parse_xgettext_output(
+        _call_xgettext(xlet_dir, [file], language, keywords).stdout)]
+
+
+def _run_xgettext_batch(xlet_dir, files, language, keywords):
+    """Extract the translatable strings from several files using a single xgettext run.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    files : list
+        The paths to the files to scan. See :any:`_run_xgettext`.
+    language : str
+        See :any:`_run_xgettext`.
+    keywords : list
+        The keywords to look for.
+
+    Returns
+    -------
+    list
+        The extracted entries of each file, in the same order as ``files``. See
+        :any:`_split_xgettext_entries`.
+    """
+    result = _call_xgettext(xlet_dir, files, language, keywords)
+
+    # NOTE: A file that xgettext can't read makes it fail. Scanning the files one by one still
+    # extracts the strings of the rest of the files.
+    if result.returncode != 0:
+        return [None] * len(files)
+
+    return _split_xgettext_entries(_parse_xgettext_output(result.stdout), files)
+
+
+def _split_xgettext_entries(entries, files):
+    """Split the entries extracted from several files by the file they were found in.
+
+    The entries of each file are the same that scanning the file on its own would give, except
+    for strings found in more than one file that have comments, flags or a plural form. The
+    comments and flags of those strings are merged and they have a plural form if any of the
+    files uses it, so there is no way to tell which of them belong to each file.
+
+    Parameters
+    ----------
+    entries : polib.POFile|list
+        The entries extracted by xgettext.
+    files : list
+        The scanned files, as passed to xgettext.
+
+    Returns
+    -------
+    list
+        A list with the extracted entries of each file (see :any:`_entry_to_dict`), in the same
+        order as ``files``. The entries of a file are None if the file has to be scanned on its
+        own.
+    """
+    file_indexes = {os.path.normpath(file): i for i, file in enumerate(files)}
+    fragments = [[] for file in files]
+    ambiguous = set()
+
+    for entry in entries:
+        data = _entry_to_dict(entry)
+        occurrences = OrderedDict()
+
+        for occurrence in data["occurrences"]:
+            i = file_indexes.get(os.path.normpath(occurrence[0]))
+
+            if i is None:
+                return [None] * len(files)
+
+            occurrences.setdefault(i, []).append(occurrence)
+
+        if not occurrences:
+            return [None] * len(files)
+
+        if len(occurrences) > 1 and (data["comment"] or data["flags"] or data["msgid_plural"]):
+            ambiguous.update(occurrences)
+            continue
+
+        for i, file_occurrences in occurrences.items():
+            fragments[i].append(dict(data, occurrences=file_occurrences))
+
+    # NOTE: xgettext lists the strings of a file in the order they are found. In the output of
+    # several files, the strings also found in a previous file come first.
+    for fragment in fragments:
+        fragment.sort(key=lambda data: occurrence_sort_key(data["occurrences"][0]))
+
+    return [None if i in ambiguous else fragment for i, fragment in enumerate(fragments)]
+
+
+def _extract_file(xlet_dir, file, language, keywords, extractor="xgettext"):
+    """Extract the translatable strings from a single file.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    file : str
+        See :any:`_run_xgettext`.
+    language : str
+        See :any:`_run_xgettext`.
+    keywords : list
+        The keywords to look for.
+    extractor : str, optional
+        The extractor to use (**xgettext** or **builtin**). Files without a built-in extractor
+        for their language are always scanned with xgettext.
+
+    Returns
+    -------
+    list
+        The extracted entries. See :any:`_entry_to_dict`.
+    """
+    if extractor == "builtin":
+        from . import extractors
+
+        if extractors.is_supported(language):
+            errors = []
+            entries = extractors.extract_file(os.path.join(xlet_dir, file), file, language,
+                                              keywords, errors)
+
+            for line, message in errors:
+                logger.warning("**Tokenizer error in %s at line %i:** %s" % (file, line, message),
+                               date=False)
+
+            return entries
+
+    return _run_xgettext(xlet_dir, file, language, keywords)
+
+
+def _entry_to_dict(entry):
+    """Convert an extracted entry into a JSON serializable dictionary.
+
+    Parameters
+    ----------
+    entry : polib.POEntry
+        The entry to convert.
+
+    Returns
+    -------
+    dict
+        The entry data.
+    """
+    return {
+        "msgid": entry.msgid,
+        "msgid_plural": entry.msgid_plural,
+        "msgctxt": entry.msgctxt,
+        "comment": entry.comment,
+        "flags": list(entry.flags),
+        "occurrences": [list(occurrence) for occurrence in entry.occurrences]
+    }
+
+
+def _extract_source_strings(xlet_dir, source_files, keywords, cache=None, extractor="xgettext"):
+    """Extract the translatable strings from JavaScript and Python files.
+
+    Files not found in the cache are scanned concurrently. When they are scanned with
+    xgettext, all the files of the same language are passed to a single xgettext run.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    source_files : list
+        A list of tuples containing the language and the path of each file to scan.
+    keywords : list
+        The keywords to look for.
+    cache : ExtractionCache, optional
+        A cache from which to get the strings of unmodified files.
+    extractor : str, optional
+        See :any:`_extract_file`.
+
+    Returns
+    -------
+    list
+        A list with the extracted entries of each file, in the same order as ``source_files``.
+    """
+    fragments = [None] * len(source_files)
+    pending = []
+
+    for i, (language, file) in enumerate(source_files):
+        if cache is not None:
+            fragments[i] = cache.get(file, os.path.join(xlet_dir, file))
+
+        if fragments[i] is None:
+            pending.append(i)
+
+    if pending:
+        from concurrent.futures import ThreadPoolExecutor
+
+        batches = OrderedDict()
+
+        if extractor == "builtin":
+            from . import extractors
+
+        for i in pending:
+            language = source_files[i][0]
+
+            if extractor != "builtin" or not extractors.is_supported(language):
+                batches.setdefault(language, []).append(i)
+
+        batches = [(language, indexes) for language, indexes in batches.items()
+                   if len(indexes) > 1]
+
+        with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+            results = executor.map(lambda batch: _run_xgettext_batch(
+                xlet_dir, [source_files[i][1] for i in batch[1]], batch[0], keywords), batches)
+
+            for (language, indexes), batch_results in zip(batches, results):
+                for i, entries in zip(indexes, batch_results):
+                    fragments[i] = entries
+
+            remaining = [i for i in pending if fragments[i] is None]
+            results = executor.map(lambda i: _extract_file(
+                xlet_dir, source_files[i][1], source_files[i][0], keywords, extractor), remaining)
+
+            for i, entries in zip(remaining, results):
+                fragments[i] = entries
+
+        if cache is not None:
+            for i in pending:
+                cache.set(source_files[i][1], fragments[i])
+
+    logger.info("**Scanned %i file(s), %i taken from cache.**" %
+                (len(pending), len(source_files) - len(pending)), date=False)
+
+    return fragments
+
+
+def _new_pot_file(charset="UTF-8"):
+    """Create a catalog with the same header that xgettext would generate.
+
+    Parameters
+    ----------
+    charset : str, optional
+        The charset declared in the header.
+
+    Returns
+    -------
+    polib.POFile
+        A new catalog.
+    """
+    pot_file = polib.POFile(indexed=True, wrapwidth=99999999)
+    pot_file.header = "\n".join([
+        "SOME DESCRIPTIVE TITLE.",
+        "Copyright (C) YEAR THE PACKAGE'S COPYRIGHT HOLDER",
+        "This file is distributed under the same license as the PACKAGE package.",
+        "FIRST AUTHOR <EMAIL@ADDRESS>, YEAR.",
+        ""
+    ])
+    pot_file.metadata_is_fuzzy = True
+    pot_file.metadata = {
+        "Project-Id-Version": "PACKAGE VERSION",
+        "Report-Msgid-Bugs-To": "",
+        "POT-Creation-Date": _get_timestamp(),
+        "PO-Revision-Date": "YEAR-MO-DA HO:MI+ZONE",
+        "Last-Translator": "FULL NAME <EMAIL@ADDRESS>",
+        "Language-Team": "LANGUAGE <LL@li.org>",
+        "Language": "",
+        "MIME-Version": "1.0",
+        "Content-Type": "text/plain; charset=%s" % charset,
+        "Content-Transfer-Encoding": "8bit",
+    }
+
+    return pot_file
+
+
+def _build_source_catalog(fragments, files=None, catalog=None):
+    """Merge the entries extracted from each source file into a single catalog.
+
+    The result mimics the output of a single xgettext run over all the files using the
+    ``--sort-by-file`` option. Strings found in more than one file get all their occurrences,
+    comments and flags merged and the entries are sorted by their first occurrence.
+
+    Parameters
+    ----------
+    fragments : list
+        See :any:`_extract_source_strings`.
+    files : list, optional
+        The path of the file of each fragment. Needed to update a catalog kept between runs.
+    catalog : SourceCatalog, optional
+        The merged entries of a previous run. Only the entries of the modified files are merged
+        again.
+
+    Returns
+    -------
+    polib.POFile
+        The catalog.
+    """
+    if catalog is None:
+        catalog = SourceCatalog()
+
+    catalog.update(list(range(len(fragments))) if files is None else files, fragments)
+    # NOTE: The entries are copied so the strings added by the JSON files don't modify them.
+    entries = OrderedDict((key, copy.copy(entry)) for key, entry in catalog.entries.items())
+
+    # NOTE: Like xgettext, only declare the charset if a string or a comment isn't ASCII. The
+    # strings of JSON files are added later and don't change it.
+    pot_file = _new_pot_file("UTF-8" if any(
+        _non_ascii_re.search(text)
+        for entry in entries.values()
+        for text in (entry.msgid, entry.msgid_plural, entry.msgctxt or "", entry.comment)
+    ) else "CHARSET")
+
+    if any(entry.msgid_plural for entry in entries.values()):
+        pot_file.metadata["Plural-Forms"] = "nplurals=INTEGER; plural=EXPRESSION;"
+
+    for entry in sorted(entries.values(), key=lambda e: (
+            occurrence_sort_key(e.occurrences[0]) if e.occurrences else ("", 0),
+            e.msgid, e.msgctxt or "")):
+        pot_file.append(entry)
+
+    return pot_file
+
+
+def _load_json_file(path, json_cache=None):
+    """Load a JSON file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    json_cache : dict, optional
+        The data of the files loaded by a previous run. A file is only loaded again if it was
+        modified.
+
+    Returns
+    -------
+    object
+        The file data.
+    """
+    if json_cache is None:
+        with open(path, "r", encoding="UTF-8") as json_file:
+            return json.load(json_file)
+
+    fingerprint = _get_file_fingerprint(path)
+    cached = json_cache.get(path)
+
+    if cached is None or cached[0] != fingerprint:
+        with open(path, "r", encoding="UTF-8") as json_file:
+            cached = json_cache[path] = (fingerprint, json.load(json_file))
+
+    return cached[1]
+
+
+def _scan_json(xlet_dir, pot_file, json_files, ignored_keys=[], json_cache=None):
     """Scan the settings-schema.json and metadata.json files.
 
     Parameters
     ----------
     xlet_dir : str
         The xlet root directory.
-    pot_path : str
-        The path to the POT file.
+    pot_file : <class "polib.POFile">
+        The catalog in which to store the extracted strings.
+    json_files : list
+        The paths to the JSON files to scan relative to the xlet directory.
     ignored_keys : list
         List of keys to ignore from the string extraction.
+    json_cache : dict, optional
+        See :any:`_load_json_file`. The data of removed files is dropped from it.
     """
-    append = os.path.exists(pot_path)
+    # NOTE: The comments of each entry are collected first and joined once all files are scanned.
+    comments = {}
+    paths = set()
 
-    if append:
-        pot_file = polib.pofile(pot_path, encoding="UTF-8",
-                                check_for_duplicates=True, wrapwidth=99999999)
-    else:
-        pot_file = polib.POFile()
+    for json_file in json_files:
+        data = None
+        file = os.path.basename(json_file)
+        rel_path = os.path.normpath(json_file)
+        path = os.path.join(xlet_dir, rel_path)
+        paths.add(path)
 
-    for root, dirs, files in os.walk(xlet_dir):
-        dirs.sort()
-        files.sort()
-        rel_root = os.path.relpath(root)
-        for file in files:
-            if os.path.islink(os.path.join(root, file)):
-                continue
+        if file == "settings-schema.json":
+            data = _load_json_file(path, json_cache)
 
-            data = None
+            if data:
+                for msgid, comment in _iter_settings_strings(
+                        data, rel_path.replace("/", "->"), ignored_keys):
+                    _save_entry(msgid, comment, pot_file, comments)
+        elif file == "metadata.json":
+            data = _load_json_file(path, json_cache)
 
-            if rel_root == ".":
-                rel_path = file
-            else:
-                rel_path = os.path.join(rel_root, file)
-
-            if file == "settings-schema.json":
-                with open(os.path.join(root, file), "r", encoding="UTF-8") as settings_schema_file:
-                    data = json.load(settings_schema_file,
-                                     object_pairs_hook=OrderedDict)
+            if data:
+                _extract_metadata_strings(data, rel_path.replace("/", "->"), pot_file, comments)
 
-                if data:
-                    _extract_settings_strings(data, rel_path.replace(
-                        "/", "->"), pot_file, ignored_keys=ignored_keys)
-            elif file == "metadata.json":
-                with open(os.path.join(root, file), "r", encoding="UTF-8") as metadata_file:
-                    data = json.load(metadata_file, object_pairs_hook=OrderedDict)
+    for entry, entry_comments, seen in comments.values():
+        entry.comment = "\n".join(entry_comments)
 
-                if data:
-                    _extract_metadata_strings(data, rel_path.replace("/", "->"), pot_file)
+    if json_cache is not None:
+        for path in set(json_cache) - paths:
+            del json_cache[path]
 
-    if append:
-        pot_file.save()
-    else:
-        pot_file.save(fpath=pot_path)
 
+def _iter_settings_strings(data, rel_path, ignored_keys=[]):
+    """Extract the strings from the settings-schema.json file data.
 
-def _extract_settings_strings(data, rel_path, pot_file, parent="", ignored_keys=[]):
-    """Extract data from the settings-schema.json file.
+    The data is traversed depth first with a stack of iterators instead of recursion. Values of
+    an unexpected type are skipped.
 
     Parameters
     ----------
@@ -171,46 +667,62 @@ def _extract_settings_strings(data, rel_path, pot_file, parent="", ignored_keys=
         Dictionary from which to extract strings.
     rel_path : str
         Relative path used to generate a comment for a POT entry.
-    pot_file : <class "polib.POFile">
-        The "polib.POFile" object to work with.
-    parent : str, optional
-        A key name of the "data" dictionary to insert into the comment for a POT entry.
     ignored_keys : list, optional
-        List of keys to ignore from the string extraction.
+        List of keys to ignore from the string extraction. Each ignored key is logged once.
+
+    Yields
+    ------
+    tuple
+        The string to save into the POT file and the comment for its entry.
     """
-    for key in data.keys():
-        if key in ignored_keys:
-            logger.info("**Key <%s> ignored.**" % key, date=False)
-            continue
+    if not isinstance(data, dict):
+        return
 
-        if key in ("description", "tooltip", "units", "title"):
-            comment = "%s->%s->%s" % (rel_path, parent, key)
-            _save_entry(data[key], comment, pot_file)
-        elif key == "options":
-            opt_data = data[key]
+    ignored_keys = set(ignored_keys)
+    logged_keys = set()
+    stack = [("", iter(data.items()))]
 
-            for option in opt_data.keys():
-                if opt_data[option] == "custom":
-                    continue
+    while stack:
+        parent, items = stack[-1]
 
-                comment = "%s->%s->%s" % (rel_path, parent, key)
-                _save_entry(option, comment, pot_file)
-        elif key == "columns":
-            columns = data[key]
+        for key, value in items:
+            if key in ignored_keys:
+                if key not in logged_keys:
+                    logged_keys.add(key)
+                    logger.info("**Key <%s> ignored.**" % key, date=False)
 
-            for i, col in enumerate(columns):
-                for col_key in col:
-                    if col_key in ("title", "units"):
-                        comment = "%s->%s->columns->%s" % (rel_path, parent, col_key)
-                        _save_entry(col[col_key], comment, pot_file)
+                continue
 
-        try:
-            _extract_settings_strings(data[key], rel_path, pot_file, key, ignored_keys)
-        except AttributeError:
-            pass
+            if key in ("description", "tooltip", "units", "title"):
+                if isinstance(value, str):
+                    yield value, "%s->%s->%s" % (rel_path, parent, key)
+            elif key == "options":
+                if isinstance(value, dict):
+                    comment = "%s->%s->%s" % (rel_path, parent, key)
+
+                    for option, option_value in value.items():
+                        if option_value != "custom":
+                            yield option, comment
+            elif key == "columns":
+                if isinstance(value, list):
+                    for col in value:
+                        if not isinstance(col, dict):
+                            continue
+
+                        for col_key, col_value in col.items():
+                            if col_key in ("title", "units") and isinstance(col_value, str):
+                                yield col_value, "%s->%s->columns->%s" % (
+                                    rel_path, parent, col_key)
+
+            if isinstance(value, dict):
+                # NOTE: Resume the current dictionary once the nested one is exhausted.
+                stack.append((key, iter(value.items())))
+                break
+        else:
+            stack.pop()
 
 
-def _extract_metadata_strings(data, rel_path, pot_file):
+def _extract_metadata_strings(data, rel_path, pot_file, comments):
     """Extract data from the metadata.json file.
 
     Parameters
@@ -221,11 +733,13 @@ def _extract_metadata_strings(data, rel_path, pot_file):
         Relative path used to generate a comment for a POT entry.
     pot_file : <class "polib.POFile">
         The "polib.POFile" object to work with.
+    comments : dict
+        See :any:`_save_entry`.
     """
     for key in data:
         if key in ("name", "description", "comments"):
             comment = "%s->%s" % (rel_path, key)
-            _save_entry(data[key], comment, pot_file)
+            _save_entry(data[key], comment, pot_file, comments)
         elif key == "contributors":
             comment = "%s->%s" % (rel_path, key)
             values = data[key]
@@ -234,20 +748,26 @@ def _extract_metadata_strings(data, rel_path, pot_file):
                 values = values.split(",")
 
             for value in values:
-                _save_entry(value.strip(), comment, pot_file)
+                _save_entry(value.strip(), comment, pot_file, comments)
 
 
-def _save_entry(msgid, comment, pot_file):
+def _save_entry(msgid, comment, pot_file, comments):
     """Save entry.
 
+    The comment isn't added to the entry right away. It's stored in ``comments`` and the comment
+    lines of each entry have to be joined into its comment once all the strings are saved.
+
     Parameters
     ----------
     msgid : str
         The string that will be saved into the POT file.
     comment : str
         The comment for the msgid.
-    pot_file : str
+    pot_file : <class "polib.POFile">
         The "polib.POFile" object to work with.
+    comments : dict
+        Maps each saved msgid to its entry, to the list of its comment lines and to the set of
+        the same lines.
 
     Returns
     -------
@@ -257,16 +777,25 @@ def _save_entry(msgid, comment, pot_file):
     if not msgid.strip():
         return
 
-    entry = pot_file.find(msgid)
+    if msgid not in comments:
+        entry = pot_file.find(msgid)
 
-    if entry:
-        if comment not in entry.comment:
-            if entry.comment:
-                entry.comment += "\n"
-            entry.comment += comment
-    else:
-        entry = polib.POEntry(msgid=msgid, comment=comment)
-        pot_file.append(entry)
+        if entry:
+            # NOTE: The comment lines the entry already has (the ones extracted from source
+            # files) are kept as they are, even if some of them are repeated.
+            entry_comments = entry.comment.split("\n") if entry.comment else []
+        else:
+            entry = polib.POEntry(msgid=msgid)
+            pot_file.append(entry)
+            entry_comments = []
+
+        comments[msgid] = (entry, entry_comments, set(entry_comments))
+
+    entry, entry_comments, seen = comments[msgid]
+
+    if comment not in seen:
+        seen.add(comment)
+        entry_comments.append(comment)
 
 
 def _remove_empty_folders(path):
@@ -302,9 +831,50 @@ def _remove_empty_folders(path):
         os.rmdir(path)
 
 
+def _compile_po_file(po_path, mo_path, use_msgfmt=True):
+    """Compile a .po file into a .mo file.
+
+    Parameters
+    ----------
+    po_path : str
+        The path to the .po file.
+    mo_path : str
+        The path to the .mo file.
+    use_msgfmt : bool, optional
+        Compile the file with msgfmt. Otherwise, it's compiled by polib (with a hash table, just
+        like msgfmt does), but without msgfmt's checks.
+
+    Returns
+    -------
+    str
+        An error message or an empty string if the file was compiled successfully.
+    """
+    os.makedirs(os.path.dirname(mo_path), mode=0o755, exist_ok=True)
+
+    if not use_msgfmt:
+        try:
+            polib.pofile(po_path, fast_parser=True).save_as_mofile(mo_path, hash_table=True)
+        except Exception as err:
+            return str(err)
+
+        return ""
+
+    result = cmd_utils.run_cmd(["msgfmt", "-c", po_path, "-o", mo_path])
+
+    if result.returncode:
+        return result.stderr.decode("UTF-8", errors="replace").strip() or \
+            "msgfmt exited with status %i." % result.returncode
+
+    return ""
+
+
 def _do_install(uuid, xlet_dir):
     """Install xlet's localizations.
 
+    The .po files are compiled concurrently. Languages whose installed .mo file is newer than
+    their .po file are skipped. If msgfmt isn't available, the .po files are compiled without
+    being checked for errors.
+
     Parameters
     ----------
     uuid : str
@@ -316,9 +886,10 @@ def _do_install(uuid, xlet_dir):
     ------
     exceptions.WrongExecutionLocation
         Wrong execution location.
+    SystemExit
+        Halt execution if a file failed to compile.
     """
     podir = os.path.join(xlet_dir, "po")
-    files_installed = 0
 
     if not os.path.exists(podir):
         msg = [
@@ -328,20 +899,50 @@ def _do_install(uuid, xlet_dir):
         ]
         raise exceptions.WrongExecutionLocation("\n".join(msg))
 
+    to_install = []
+    files_skipped = 0
+
     for root, dirs, files in os.walk(podir):
         for file in files:
             locale_name, ext = os.path.splitext(file)
             if ext == ".po":
-                lang_locale_dir = os.path.join(LOCALE_DIR, locale_name, "LC_MESSAGES")
-                os.makedirs(lang_locale_dir, mode=0o755, exist_ok=True)
-                cmd_utils.run_cmd(["msgfmt", "-c", os.path.join(root, file), "-o",
-                                   os.path.join(lang_locale_dir, "%s.mo" % uuid)])
-                files_installed += 1
+                po_path = os.path.join(root, file)
+                mo_path = os.path.join(LOCALE_DIR, locale_name, "LC_MESSAGES", "%s.mo" % uuid)
+
+                if file_utils.newer(po_path, mo_path):
+                    to_install.append((po_path, mo_path))
+                else:
+                    files_skipped += 1
+
+    failed = []
+
+    if to_install:
+        from concurrent.futures import ThreadPoolExecutor
+
+        use_msgfmt = bool(cmd_utils.which("msgfmt"))
+
+        if not use_msgfmt:
+            logger.warning("**msgfmt command not found. The .po files will not be checked for "
+                           "errors. Install the gettext package to check them.**", date=False)
 
-    if files_installed == 0:
+        with ThreadPoolExecutor(max_workers=min(len(to_install), os.cpu_count() or 1)) as executor:
+            errors = executor.map(lambda paths: _compile_po_file(*paths, use_msgfmt=use_msgfmt),
+                                  to_install)
+
+            for (po_path, mo_path), error in zip(to_install, errors):
+                if error:
+                    failed.append(po_path)
+                    logger.error("**%s:** %s" % (os.path.relpath(po_path, xlet_dir), error),
+                                 date=False)
+
+    if not to_install and files_skipped == 0:
         logger.info("**Nothing to install.**", date=False)
     else:
-        logger.info("**Installed %i files.**" % files_installed, date=False)
+        logger.info("**Installed %i files, %i skipped (up to date), %i failed.**" %
+                    (len(to_install) - len(failed), files_skipped, len(failed)), date=False)
+
+    if failed:
+        raise SystemExit(1)
 
 
 def _do_remove(uuid):
@@ -370,15 +971,15 @@ def _do_remove(uuid):
         logger.info("**Removed %i files.**" % files_removed, date=False)
 
 
-def _insert_custom_header(xlet_dir, pot_path, pot_settings_data):
-    """Insert custom header.
+def _apply_custom_header(xlet_dir, pot_file, pot_settings_data):
+    """Replace the header of a catalog with a custom one.
 
     Parameters
     ----------
     xlet_dir : str
         The xlet root directory.
-    pot_path : str
-        The path to the POT file.
+    pot_file : <class "polib.POFile">
+        The catalog whose header should be replaced.
     pot_settings_data : dict
         Extra settings found inside the JSON file next to the generated POT file.
 
@@ -432,10 +1033,7 @@ def _insert_custom_header(xlet_dir, pot_path, pot_settings_data):
         pass
 
     try:
-        with open(pot_path, "r", encoding="UTF-8") as pot_file:
-            raw_data = pot_file.readlines()
-
-        new_header = POT_HEADER.format(
+        new_header = polib.pofile(POT_HEADER.format(
             FIRST_AUTHOR=metadata["FIRST_AUTHOR"],
             FIRST_AUTHOR_EMAIL=metadata["FIRST_AUTHOR_EMAIL"],
             COPY_CURRENT_YEAR=metadata["COPY_CURRENT_YEAR"],
@@ -444,11 +1042,11 @@ def _insert_custom_header(xlet_dir, pot_path, pot_settings_data):
             VERSION=metadata["VERSION"],
             SCRIPT_VERSION=metadata["SCRIPT_VERSION"],
             TIMESTAMP=metadata["TIMESTAMP"]
-        )
+        ), encoding="UTF-8")
 
-        with open(pot_path, "w", encoding="UTF-8") as pot_file:
-            raw_data_no_header = "".join(raw_data[raw_data.index("\n"):])
-            pot_file.write(new_header + raw_data_no_header)
+        pot_file.header = new_header.header
+        pot_file.metadata = new_header.metadata
+        pot_file.metadata_is_fuzzy = False
     except Exception as detail:
         logger.error(detail)
         raise SystemExit("Failed to set custom header.")
@@ -456,10 +1054,163 @@ def _insert_custom_header(xlet_dir, pot_path, pot_settings_data):
     logger.info("**POT header customization complete.**", date=False)
 
 
-def _generate_trans_stats(uuid, xlet_dir, pot_path):
+def _normalize_pot_contents(contents):
+    """Remove the creation date from the contents of a POT file.
+
+    Parameters
+    ----------
+    contents : str
+        The contents of a POT file.
+
+    Returns
+    -------
+    str
+        The contents without the value of the POT-Creation-Date header field.
+    """
+    return _pot_creation_date_re.sub(r"\1", contents, count=1)
+
+
+def _save_pot_file(pot_file, pot_path, skip_unchanged=False):
+    """Save a catalog.
+
+    The catalog is saved atomically by :any:`polib.POFile.save`, so an interrupted run never
+    leaves a half-written POT file behind.
+
+    Parameters
+    ----------
+    pot_file : <class "polib.POFile">
+        The catalog to save.
+    pot_path : str
+        The path to the POT file.
+    skip_unchanged : bool, optional
+        Do not write the POT file if its content (ignoring the creation date) didn't change.
+
+    Returns
+    -------
+    bool
+        Whether the POT file was written.
+    """
+    if skip_unchanged and os.path.exists(pot_path):
+        with open(pot_path, "r", encoding=pot_file.encoding) as existing_file:
+            existing_contents = existing_file.read()
+
+        if _normalize_pot_contents(existing_contents) == \
+                _normalize_pot_contents(pot_file.__unicode__()):
+            return False
+
+    pot_file.save(pot_path)
+
+    return True
+
+
+def _get_nplurals(metadata):
+    """Get the number of plural forms declared in the header of a catalog.
+
+    Parameters
+    ----------
+    metadata : dict
+        The metadata of a catalog.
+
+    Returns
+    -------
+    int|None
+        The number of plural forms or None if they aren't declared.
+    """
+    match = re.search(r"nplurals\s*=\s*([0-9]+)", metadata.get("Plural-Forms", ""))
+
+    return int(match.group(1)) if match else None
+
+
+def _merged_po_file_stats(po_file):
+    """Count the untranslated, fuzzy and obsolete strings of a .po file.
+
+    The strings are counted like the ``msggrep -v -T -e "." | grep -c ^msgstr`` pipeline
+    did it. That is, an untranslated entry is counted once per msgstr it has (plural entries
+    have one msgstr per plural form).
+
+    Parameters
+    ----------
+    po_file : <class "polib.POFile">
+        A .po file already updated from a POT file.
+
+    Returns
+    -------
+    tuple
+        The amount of untranslated, fuzzy and obsolete strings.
+    """
+    nplurals = _get_nplurals(po_file.metadata)
+    untranslated = fuzzy = obsolete = 0
+
+    for entry in po_file:
+        if entry.obsolete:
+            obsolete += 1
+        elif entry.msgid_plural:
+            # NOTE: msgmerge adds as many msgstr as plural forms the header declares.
+            if not any(entry.msgstr_plural.values()):
+                untranslated += max(len(entry.msgstr_plural), nplurals or 0)
+            elif entry.fuzzy:
+                fuzzy += 1
+        elif not entry.msgstr:
+            untranslated += 1
+        elif entry.fuzzy:
+            fuzzy += 1
+
+    return (untranslated, fuzzy, obsolete)
+
+
+def _po_file_stats(po_file_path, pot_file):
+    """Count the untranslated, fuzzy and obsolete strings of a .po file.
+
+    The .po file is updated in memory from the POT file, just like
+    ``msgmerge --no-fuzzy-matching`` would do it, before counting its strings. See
+    :any:`_merged_po_file_stats`.
+
+    Parameters
+    ----------
+    po_file_path : str
+        Path to a .po file.
+    pot_file : <class "polib.POFile">
+        The POT file.
+
+    Returns
+    -------
+    tuple|str
+        The amount of untranslated, fuzzy and obsolete strings or an error message.
+    """
+    try:
+        po_file = polib.pofile(po_file_path, encoding="UTF-8", fast_parser=True)
+    except Exception as err:
+        return str(err)
+
+    po_file.merge(pot_file)
+
+    return _merged_po_file_stats(po_file)
+
+
+def _get_file_fingerprint(path):
+    """Get the data used to detect if a file was modified.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file.
+
+    Returns
+    -------
+    tuple
+        The file modification time and size.
+    """
+    st = os.stat(path)
+
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _generate_trans_stats(uuid, xlet_dir, pot_path, caches=None, full_stats=False,
+                          open_file=None):
     """Generate translations statistics.
 
-    Generates files that contain the amount of untranslated strings an xlet has.
+    Generates files that contain the amount of untranslated strings an xlet has. The .po files
+    are processed concurrently by worker processes unless ``caches`` is passed.
 
     Parameters
     ----------
@@ -469,163 +1220,346 @@ def _generate_trans_stats(uuid, xlet_dir, pot_path):
         Path to an xlet folder.
     pot_path : str
         Path to a POT file.
+    caches : dict, optional
+        See :any:`_process_xlet`. If passed, the statistics of a .po file are reused while
+        neither the .po file nor the POT file are modified.
+    full_stats : bool, optional
+        Whether to also include the amount of fuzzy and obsolete strings.
+    open_file : function, optional
+        See :any:`scan_xlet`.
 
     Raises
     ------
     SystemExit
-        Halt execution if the msgmerge command is not found.
+        Halt execution if the POT file doesn't exist.
     """
-    if not cmd_utils.which("msgmerge"):
-        logger.error("**MissingCommand:** msgmerge command not found!!!")
+    import shutil
+
+    if not os.path.isfile(pot_path):
+        logger.error("**POT file not found:** %s" % pot_path, date=False)
         raise SystemExit(1)
 
     markdown_content = []
     po_tmp_storage = os.path.join(misc_utils.get_system_tempdir(),
                                   "MakeCinnamonXletPOT-tmp", uuid)
     trans_stats_file = os.path.join(po_tmp_storage, "po_files_untranslated_table.md")
-    rmtree(po_tmp_storage, ignore_errors=True)
+    shutil.rmtree(po_tmp_storage, ignore_errors=True)
     os.makedirs(po_tmp_storage, exist_ok=True)
 
     xlet_po_dir = os.path.join(xlet_dir, "po")
-    tmp_xlet_po_dir = os.path.join(po_tmp_storage, "po")
-    os.makedirs(tmp_xlet_po_dir, exist_ok=True)
 
     if file_utils.is_real_dir(xlet_po_dir):
         xlet_po_list = file_utils.recursive_glob(xlet_po_dir, "*.po")
 
         if xlet_po_list:
             logger.info(uuid, date=False)
+            logger.info("**Counting untranslated strings...**", date=False)
             markdown_content = [
                 "### %s" % uuid,
                 "",
+                "|LANGUAGE|UNTRANSLATED|FUZZY|OBSOLETE|" if full_stats else
                 "|LANGUAGE|UNTRANSLATED|",
+                "|--------|------------|-----|--------|" if full_stats else
                 "|--------|------------|",
             ]
 
-            for po_file_path in xlet_po_list:
+            pot_fingerprint = _get_file_fingerprint(pot_path)
+            results = [None] * len(xlet_po_list)
+            pending = []
+
+            for i, po_file_path in enumerate(xlet_po_list):
+                fingerprint = (pot_fingerprint, _get_file_fingerprint(po_file_path))
+                cached = caches.get(("stats", po_file_path)) if caches is not None else None
+
+                if cached is not None and cached[0] == fingerprint:
+                    results[i] = cached[1]
+                else:
+                    pending.append((i, fingerprint))
+
+            if pending:
+                pot_file = polib.pofile(pot_path, encoding="UTF-8", fast_parser=True)
+                pending_paths = [xlet_po_list[i] for i, fingerprint in pending]
+
+                # NOTE: The daemon (the only caller that keeps caches) doesn't fork worker
+                # processes. Between its runs, only the modified .po files are counted again.
+                if caches is None and len(pending) > 1:
+                    import multiprocessing
+
+                    from concurrent.futures import ProcessPoolExecutor
+
+                    with ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1),
+                                             mp_context=multiprocessing.get_context("fork")
+                                             ) as executor:
+                        pending_results = list(executor.map(
+                            _po_file_stats, pending_paths, [pot_file] * len(pending_paths)))
+                else:
+                    pending_results = [_po_file_stats(path, pot_file) for path in pending_paths]
+
+                for (i, fingerprint), stats in zip(pending, pending_results):
+                    results[i] = stats
+
+                    if caches is not None and not isinstance(stats, str):
+                        caches[("stats", xlet_po_list[i])] = (fingerprint, stats)
+
+            for po_file_path, stats in zip(xlet_po_list, results):
                 po_base_name = os.path.basename(po_file_path)
-                tmp_po_file_path = os.path.join(tmp_xlet_po_dir, po_base_name)
-
-                logger.info("**Copying %s to temporary location...**" %
-                            po_base_name, date=False)
-                copy2(po_file_path, tmp_po_file_path)
-
-                logger.info("**Updating temporary %s from localization template...**" %
-                            po_base_name, date=False)
-                cmd_utils.run_cmd([
-                    "msgmerge",
-                    "--silent",             # Shut the heck up.
-                    "--no-wrap",            # Do not wrap long lines.
-                    "--no-fuzzy-matching",  # Do not use fuzzy matching.
-                    "--backup=off",         # Never make backups.
-                    "--update",             # Update .po file, do nothing if up to date.
-                    tmp_po_file_path,       # The .po file to update.
-                    pot_path                # The template file to update from.
-                ], stdout=None, stderr=None)
-
-                logger.info("**Counting untranslated strings...**", date=False)
-                trans_count_cmd = 'msggrep -v -T -e "." "%s" | grep -c ^msgstr'
-                trans_count_output = cmd_utils.run_cmd(trans_count_cmd % tmp_po_file_path,
-                                                       shell=True).stdout
-                trans_count = int(trans_count_output.decode("UTF-8").strip())
-                markdown_content.append("|%s|%d|" % (
-                    po_base_name, trans_count - 1 if trans_count > 0 else trans_count))
+
+                if isinstance(stats, str):
+                    logger.error("**%s:** %s" % (po_base_name, stats), date=False)
+                    continue
+
+                if full_stats:
+                    markdown_content.append("|%s|%d|%d|%d|" % ((po_base_name,) + stats))
+                else:
+                    markdown_content.append("|%s|%d|" % (po_base_name, stats[0]))
 
     if markdown_content:
         with open(trans_stats_file, "w", encoding="UTF-8") as trans_file:
             trans_file.write("\n".join(markdown_content))
 
-        cmd_utils.run_cmd(["xdg-open", trans_stats_file])
+        if open_file is None:
+            cmd_utils.run_cmd(["xdg-open", trans_stats_file])
+        else:
+            open_file(trans_stats_file)
 
 
-def scan_xlet(args, app_logger):
-    """Scan xlet.
+def _find_xlets(paths):
+    """Find xlets.
 
     Parameters
     ----------
-    args : list
-        The list of arguments passed by the CLI application.
-    app_logger : object
-        See <class :any:`LogSystem`>.
+    paths : list
+        A list of paths to xlet directories or to directories containing xlets. A directory is
+        considered to be an xlet directory if it contains a ``metadata.json`` file. Directories
+        inside an xlet directory and hidden directories are not searched.
+
+    Returns
+    -------
+    list
+        The sorted list of absolute paths to the xlet directories found.
 
     Raises
     ------
-    exceptions.MissingCommand
-        See <class :any:`exceptions.MissingCommand`>.
     SystemExit
-        Quit program.
+        Halt execution if a path doesn't exist.
     """
-    global logger
-    logger = app_logger
+    xlet_dirs = []
 
-    # NOTE: list(set()) is cast to workaround docopt bug that duplicates arguments.
-    keywords = list(set(args["--keyword"])) if args["--keyword"] else ["_"]
-    ignored_patterns = list(set(args["--ignored-pattern"]))
-    additional_files = list(set(args["--scan-additional-file"]))
-    skip_keys = list(set(args["--skip-key"]))
+    for path in paths:
+        path = os.path.abspath(path)
 
-    xlet_dir = os.path.abspath(args["--xlet-dir"])
+        if not os.path.exists(path):
+            raise SystemExit("%s does not exist." % path)
 
-    if not os.path.exists(xlet_dir):
-        raise SystemExit("%s does not exist." % xlet_dir)
+        found = []
 
-    uuid = os.path.basename(xlet_dir)
+        for root, dirs, files in os.walk(path):
+            if "metadata.json" in files:
+                found.append(root)
+                dirs[:] = []
+            else:
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+
+        # NOTE: Keep the old behavior of accepting a folder without a metadata.json file as the
+        # xlet directory itself.
+        for xlet_dir in found or [path]:
+            if xlet_dir not in xlet_dirs:
+                xlet_dirs.append(xlet_dir)
+
+    return sorted(xlet_dirs)
 
-    logger.info("**Xlet: %s**" % uuid, date=False)
 
+def _process_xlet_worker(xlet_dir, args, caches=None, open_file=None):
+    """Process an xlet and report the result instead of exiting.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    args : dict
+        The arguments passed by the CLI application.
+    caches : dict, optional
+        See :any:`_process_xlet`.
+    open_file : function, optional
+        See :any:`scan_xlet`.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the xlet directory, an exit status and an error message (or an empty
+        string).
+    """
+    try:
+        _process_xlet(xlet_dir, args, caches, open_file)
+    except SystemExit as err:
+        if err.code is None or isinstance(err.code, int):
+            return (xlet_dir, err.code or 0, "")
+
+        return (xlet_dir, 1, str(err.code))
+    except Exception as err:
+        return (xlet_dir, 1, "%s: %s" % (type(err).__name__, err))
+
+    return (xlet_dir, 0, "")
+
+
+def _get_pot_paths(xlet_dir, args):
+    """Get the paths to the POT file of an xlet and to its settings file.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    args : dict
+        The arguments passed by the CLI application.
+
+    Returns
+    -------
+    tuple
+        The path to the POT file and the path to the JSON file with the POT settings.
+    """
     if args["--output"]:
         pot_path = os.path.abspath(args["--output"])
         pot_options_path = pot_path[:-4] + ".json"
     else:
+        uuid = os.path.basename(xlet_dir)
         pot_path = os.path.join(xlet_dir, "po", uuid + ".pot")
         pot_options_path = os.path.join(xlet_dir, "po", uuid + ".json")
 
+    return pot_path, pot_options_path
+
+
+def _get_keywords(args):
+    """Get the keywords to look for when extracting strings from source files.
+
+    Parameters
+    ----------
+    args : dict
+        The arguments passed by the CLI application.
+
+    Returns
+    -------
+    list
+        The keywords.
+    """
+    # NOTE: list(set()) is cast to workaround docopt bug that duplicates arguments.
+    return list(set(args["--keyword"])) if args["--keyword"] else ["_"]
+
+
+def _get_extraction_cache(pot_path, args, caches=None):
+    """Get the cache of the strings extracted from the source files of an xlet.
+
+    Parameters
+    ----------
+    pot_path : str
+        The path to the POT file. The cache file is stored next to it.
+    args : dict
+        The arguments passed by the CLI application.
+    caches : dict, optional
+        See :any:`_process_xlet`. If passed, the cache is reused between runs. It's only kept
+        in memory unless the ``--use-cache`` option is passed.
+
+    Returns
+    -------
+    ExtractionCache|None
+        The cache or None if no cache should be used.
+    """
+    from .extraction_cache import ExtractionCache
+
+    settings = {
+        "keywords": sorted(_get_keywords(args)),
+        "extractor": args["--extractor"] or "xgettext"
+    }
+    cache_path = os.path.join(os.path.dirname(pot_path), ".%s.cache" % os.path.basename(pot_path))
+
+    if caches is None:
+        return ExtractionCache(cache_path, settings) if args["--use-cache"] else None
+
+    key = ("extraction", pot_path, bool(args["--use-cache"]), tuple(settings["keywords"]),
+           settings["extractor"])
+
+    if key not in caches:
+        caches[key] = ExtractionCache(cache_path if args["--use-cache"] else None, settings)
+
+    return caches[key]
+
+
+def _process_xlet(xlet_dir, args, caches=None, open_file=None):
+    """Process an xlet.
+
+    Parameters
+    ----------
+    xlet_dir : str
+        The xlet root directory.
+    args : dict
+        The arguments passed by the CLI application.
+    caches : dict, optional
+        Data kept between runs by the watch mode and the daemon, so files that weren't
+        modified aren't read again. It stores the strings extracted from source files (see
+        :any:`_get_extraction_cache`), the catalog in which they are merged (see
+        :any:`SourceCatalog`), the data of JSON files (see :any:`_load_json_file`) and the
+        statistics of .po files (see :any:`_generate_trans_stats`).
+    open_file : function, optional
+        See :any:`scan_xlet`.
+
+    Returns
+    -------
+    None
+        Halt function execution.
+
+    Raises
+    ------
+    exceptions.MissingCommand
+        See <class :any:`exceptions.MissingCommand`>.
+    """
+    keywords = _get_keywords(args)
+    ignored_patterns = list(set(args["--ignored-pattern"]))
+    additional_files = list(set(args["--scan-additional-file"]))
+    skip_keys = list(set(args["--skip-key"]))
+
+    uuid = os.path.basename(xlet_dir)
+
+    logger.info("**Xlet: %s**" % uuid, date=False)
+
+    pot_path, pot_options_path = _get_pot_paths(xlet_dir, args)
+
     if args["--gen-stats"]:
         pot_path = args["--pot-file"] if args["--pot-file"] else pot_path
-        raise SystemExit(_generate_trans_stats(uuid, xlet_dir, pot_path))
+        return _generate_trans_stats(uuid, xlet_dir, pot_path, caches, args["--full-stats"],
+                                     open_file)
 
     if args["--install"]:
-        raise SystemExit(_do_install(uuid, xlet_dir))
+        return _do_install(uuid, xlet_dir)
 
     if args["--remove"]:
-        raise SystemExit(_do_remove(uuid))
+        return _do_remove(uuid)
 
     # NOTE: From this point down, all actions are to generate a new POT file.
 
-    # Remove an existent POT file. This is to force `xgettext` to always create a new POT file.
-    # `xgettext` doesn't remove obsolete strings from existent POT files and it doesn't update
-    # the line reference from a msgid whose source code has been moved.
-    if os.path.exists(pot_path):
-        os.remove(pot_path)
-
-    pwd = os.getcwd()
-    os.chdir(xlet_dir)
-
-    # NOTE: To future me to avoid headaches and nightmares!!!
-    #
-    # 1. Create the po directory. Otherwise, the polib module will fail if there isn't an
-    #    existent POT file when calling its `potfile.save()` method.
-    # 2. Run xgettext commands (to scan JavaScript and Python files) BEFORE running the _scan_json
-    #    function using polib. Because:
-    #    - Running polib before xgettext will generate POT files with double headers. ¬¬
-    #    - Running polib before xgettext with --omit-header fixes the double headers problem, but
-    #      the absolutely retarded xgettext will f*ck up all unicode characters.
-
+    # NOTE: All strings (from JavaScript, Python and JSON files) and the custom header are
+    # collected into a single in-memory catalog that is written once at the end. An existent
+    # POT file is always replaced so obsolete strings and outdated line references aren't kept.
     os.makedirs(os.path.dirname(pot_path), mode=0o755, exist_ok=True)
 
-    if not args["--skip-js"] or not args["--skip-python"]:
+    xlet_files = _walk_xlet(xlet_dir, ignored_patterns)
+
+    source_files = []
+    extractor = args["--extractor"] or "xgettext"
+    languages = [language for language, skipped in (("JavaScript", args["--skip-js"]),
+                                                    ("Python", args["--skip-python"]))
+                 if not skipped]
+
+    if extractor == "builtin":
+        from . import extractors
+
+        needs_xgettext = not all(extractors.is_supported(language) for language in languages)
+    else:
+        needs_xgettext = bool(languages)
+
+    if needs_xgettext:
         if not cmd_utils.which("xgettext"):
             raise exceptions.MissingCommand(
                 "xgettext command not found, you may need to install the gettext package.")
 
-        xgettext_command = ["xgettext"] + ["--keyword=" + item for item in keywords] + [
-            "--no-wrap",
-            "--sort-by-file",
-            "--add-comments",
-            "--from-code=UTF-8",
-            "--output=%s" % pot_path
-        ]
-
     if not args["--skip-js"]:
         logger.info("**Scanning JavaScript files...**", date=False)
 
@@ -633,7 +1567,8 @@ def scan_xlet(args, app_logger):
 
         if additional_files:
             for file in additional_files:
-                if file[-3:] == ".js":
+                if file[-3:] == ".js" and not _is_ignored(
+                        os.path.basename(file), file, ignored_patterns):
                     js_files.append(file)
 
             if len(js_files) > 0:
@@ -642,26 +1577,13 @@ def scan_xlet(args, app_logger):
                 for f in js_files:
                     logger.info(f, date=False)
 
-        for root, dirs, files in os.walk(xlet_dir):
-            dirs.sort()
-            rel_root = os.path.relpath(root)
-            for file in files:
-                if file[-3:] == ".js":
-                    js_files.append(os.path.join(rel_root, file))
+        js_files.extend(xlet_files["js"])
 
         if len(js_files) == 0:
             logger.info("**No JavaScript files found.**", date=False)
         else:
-            if ignored_patterns:
-                ignored_js_files = ignore_patterns(*ignored_patterns)(None, js_files)
-                js_files = [file for file in js_files if file not in ignored_js_files]
-
             logger.info("**Found %i JavaScript file(s)**" % len(js_files), date=False)
-
-            if os.path.exists(pot_path):
-                xgettext_command.append("--join-existing")
-
-            cmd_utils.run_cmd(xgettext_command + ["--language=JavaScript"] + sorted(js_files))
+            source_files.extend([("JavaScript", file) for file in sorted(js_files)])
 
     if not args["--skip-python"]:
         logger.info("**Scanning Python files...**", date=False)
@@ -670,7 +1592,8 @@ def scan_xlet(args, app_logger):
 
         if additional_files:
             for file in additional_files:
-                if file[-3:] == ".py":
+                if file[-3:] == ".py" and not _is_ignored(
+                        os.path.basename(file), file, ignored_patterns):
                     py_files.append(file)
 
             if len(py_files) > 0:
@@ -679,30 +1602,32 @@ def scan_xlet(args, app_logger):
                 for f in py_files:
                     logger.info(f, date=False)
 
-        for root, dirs, files in os.walk(xlet_dir):
-            dirs.sort()
-            rel_root = os.path.relpath(root)
-            for file in files:
-                if file[-3:] == ".py":
-                    py_files.append(os.path.join(rel_root, file))
+        py_files.extend(xlet_files["py"])
 
         if len(py_files) == 0:
             logger.info("**No Python files found.**", date=False)
         else:
-            if ignored_patterns:
-                ignored_py_files = ignore_patterns(*ignored_patterns)(None, py_files)
-                py_files = [file for file in py_files if file not in ignored_py_files]
-
             logger.info("**Found %i Python file(s)**" % len(py_files), date=False)
+            source_files.extend([("Python", file) for file in sorted(py_files)])
 
-            # Adding the --join-existing argument when there isn't a generated .pot file will
-            # not save the strings extracted from Python files.
-            # A .pot file might not be created if there isn't any translatable
-            # string found inside the JavaScript files or if the --skip-js argument is used.
-            if os.path.exists(pot_path):
-                xgettext_command.append("--join-existing")
+    pot_file = None
 
-            cmd_utils.run_cmd(xgettext_command + ["--language=Python"] + sorted(py_files))
+    if source_files:
+        cache = _get_extraction_cache(pot_path, args, caches)
+        fragments = _extract_source_strings(xlet_dir, source_files, keywords, cache, extractor)
+
+        if cache is not None:
+            cache.save()
+
+        if any(fragments):
+            pot_file = _build_source_catalog(
+                fragments, [file for language, file in source_files],
+                caches.setdefault(("catalog", pot_path), SourceCatalog())
+                if caches is not None else None)
+
+    # NOTE: Without strings from source files, the POT file only gets a bare header.
+    if pot_file is None:
+        pot_file = polib.POFile(indexed=True)
 
     pot_settings_data = None
 
@@ -728,17 +1653,211 @@ def scan_xlet(args, app_logger):
     ignored_keys = list(set(ignored_keys))
 
     logger.info("**Scanning metadata.json and settings-schema.json files...**", date=False)
-    _scan_json(xlet_dir, pot_path, ignored_keys)
-
-    os.chdir(pwd)
+    _scan_json(xlet_dir, pot_file, xlet_files["json"], ignored_keys,
+               caches.setdefault(("json", pot_path), {}) if caches is not None else None)
 
     logger.info("**Extraction complete.**", date=False)
 
     if args["--custom-header"]:
         logger.info("**Customizing POT header...**", date=False)
-        _insert_custom_header(xlet_dir, pot_path, pot_settings_data)
+        _apply_custom_header(xlet_dir, pot_file, pot_settings_data)
+
+    # NOTE: In watch mode, a source file can be saved without any change to its strings.
+    if _save_pot_file(pot_file, pot_path, args["--skip-unchanged"] or args["--watch"]):
+        logger.info("**POT file saved.**", date=False)
+    else:
+        logger.info("**POT file unchanged.**", date=False)
+
+
+def _is_inside(path, dir_path):
+    """Check if a path is a directory or is inside it.
+
+    Parameters
+    ----------
+    path : str
+        A normalized absolute path.
+    dir_path : str
+        A normalized absolute path to a directory.
+
+    Returns
+    -------
+    bool
+        If the path is inside the directory or is the directory itself.
+    """
+    return path == dir_path or path.startswith(dir_path + os.sep)
+
+
+def _watch_xlets(xlet_dirs, args):
+    """Generate the POT files of xlets and regenerate them whenever their files change.
+
+    The strings extracted from the files of each xlet and the catalog in which they are merged
+    are kept in memory between runs. Only the JavaScript, Python and JSON files that changed are
+    read again and only the strings they contain are merged again. Bursts of changes (e.g.
+    saving several files at once) trigger a single run.
+
+    Parameters
+    ----------
+    xlet_dirs : list
+        The xlet root directories.
+    args : dict
+        The arguments passed by the CLI application.
+    """
+    ignored_patterns = list(set(args["--ignored-pattern"]))
+    additional_files = list(set(args["--scan-additional-file"]))
+    caches = {}
+    xlets = []
+    extra_files = set()
+    roots = [(xlet_dir, True) for xlet_dir in xlet_dirs]
+
+    for xlet_dir in xlet_dirs:
+        pot_options_path = _get_pot_paths(xlet_dir, args)[1]
+        # NOTE: Files that aren't found by walking the xlet directory but that are used to
+        # generate its POT file. They can be outside the xlet directory.
+        xlet_extra_files = set(os.path.normpath(os.path.join(xlet_dir, file))
+                               for file in additional_files + [pot_options_path])
+        extra_files |= xlet_extra_files
+        xlets.append((xlet_dir, xlet_extra_files))
+
+    for file in extra_files:
+        dir_path = os.path.dirname(file)
+
+        if os.path.isdir(dir_path) and (dir_path, False) not in roots and \
+                not any(_is_inside(dir_path, xlet_dir) for xlet_dir in xlet_dirs):
+            roots.append((dir_path, False))
+
+    def accept(path, is_dir):
+        if path in extra_files:
+            return True
+
+        for xlet_dir in xlet_dirs:
+            if _is_inside(path, xlet_dir):
+                name = os.path.basename(path)
+                # NOTE: Relative paths built like in _walk_xlet.
+                rel_path = os.path.relpath(path, xlet_dir)
+                rel_path = rel_path if os.sep in rel_path else os.path.join(".", rel_path)
+
+                if ignored_patterns and _is_ignored(name, rel_path, ignored_patterns):
+                    return False
+
+                return is_dir or name[-3:] in (".js", ".py") or \
+                    name in ("metadata.json", "settings-schema.json")
+
+        return False
+
+    def regenerate(xlet_dir):
+        start = time.time()
+        status, msg = _process_xlet_worker(xlet_dir, args, caches)[1:]
+
+        if status != 0:
+            logger.error("**%s:** %s" % (os.path.basename(xlet_dir), msg or "Failed."),
+                         date=False)
+        else:
+            logger.info("**Done in %i ms.**" % ((time.time() - start) * 1000), date=False)
+
+    from . import file_watcher
+
+    # NOTE: Start watching before the first run so changes made during it aren't missed.
+    watcher = file_watcher.new_watcher(roots, accept)
+
+    try:
+        for xlet_dir, xlet_extra_files in xlets:
+            regenerate(xlet_dir)
+
+        logger.info("**Watching %i xlet(s) for changes (using %s). Press Ctrl+C to stop.**" %
+                    (len(xlets), watcher.name), date=False)
+
+        while True:
+            changed = watcher.wait()
+
+            for xlet_dir, xlet_extra_files in xlets:
+                if any(path in xlet_extra_files or _is_inside(path, xlet_dir)
+                       for path in changed):
+                    regenerate(xlet_dir)
+    except KeyboardInterrupt:
+        logger.info("**Watch mode stopped.**", date=False)
+    finally:
+        watcher.close()
+
+
+def scan_xlet(args, app_logger, caches=None, open_file=None):
+    """Scan xlet.
+
+    Parameters
+    ----------
+    args : list
+        The list of arguments passed by the CLI application.
+    app_logger : object
+        See <class :any:`LogSystem`>.
+    caches : dict, optional
+        See :any:`_process_xlet`. Used by the daemon to keep data between requests. If passed,
+        xlets are processed one at a time so the data of all of them ends up in it.
+    open_file : function, optional
+        The function that opens the generated statistics files. It receives the path to a file.
+        By default, the file is opened with xdg-open.
+
+    Raises
+    ------
+    exceptions.WrongValueForOption
+        See <class :any:`exceptions.WrongValueForOption`>.
+    SystemExit
+        Quit program.
+    """
+    global logger
+    logger = app_logger
+
+    if args["--extractor"] and args["--extractor"] not in ("xgettext", "builtin"):
+        raise exceptions.WrongValueForOption(
+            "--extractor should be **xgettext** or **builtin**.")
+
+    xlet_dirs = _find_xlets(args["--xlet-dir"] or [os.getcwd()])
+
+    if len(xlet_dirs) > 1 and (args["--output"] or args["--pot-file"]):
+        raise exceptions.WrongValueForOption(
+            "The --output and --pot-file options cannot be used with more than one xlet.")
+
+    if args["--watch"]:
+        _watch_xlets(xlet_dirs, args)
+        raise SystemExit()
+
+    if len(xlet_dirs) == 1:
+        _process_xlet(xlet_dirs[0], args, caches, open_file)
+        raise SystemExit()
+
+    try:
+        jobs = int(args["--jobs"]) if args["--jobs"] else (os.cpu_count() or 1)
+    except ValueError:
+        jobs = 0
+
+    if jobs < 1:
+        raise exceptions.WrongValueForOption("--jobs should be a positive integer.")
+
+    logger.info("**Processing %i xlets...**" % len(xlet_dirs), date=False)
+
+    # NOTE: Installing and removing localizations modify the same folders in the system locale
+    # store. Do it one xlet at a time.
+    if jobs == 1 or args["--install"] or args["--remove"] or caches is not None:
+        results = [_process_xlet_worker(xlet_dir, args, caches, open_file)
+                   for xlet_dir in xlet_dirs]
+    else:
+        import multiprocessing
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        # NOTE: The "fork" start method is used so the workers inherit the logger.
+        with ProcessPoolExecutor(max_workers=min(jobs, len(xlet_dirs)),
+                                 mp_context=multiprocessing.get_context("fork")) as executor:
+            results = list(executor.map(_process_xlet_worker, xlet_dirs,
+                                        [args] * len(xlet_dirs)))
+
+    failed = [(xlet_dir, msg) for xlet_dir, status, msg in results if status != 0]
+
+    for xlet_dir, msg in failed:
+        logger.error("**%s:** %s" % (os.path.basename(xlet_dir), msg or "Failed."), date=False)
+
+    logger.info("**Processed %i xlets: %i succeeded, %i failed.**" %
+                (len(results), len(results) - len(failed), len(failed)), date=False)
 
-    raise SystemExit()
+    raise SystemExit(1 if failed else 0)
 
 
 if __name__ == "__main__":
@@ -9,14 +9,16 @@ root_folder : str
     The main folder containing the application. All commands must be executed from this location
     without exceptions.
 """
+import copy
+import functools
 import os
 
-from . import app_utils
 from .__init__ import __appdescription__
 from .__init__ import __appname__
 from .__init__ import __status__
 from .__init__ import __version__
 from .python_utils import cli_utils
+from .python_utils.docopt import docopt
 
 root_folder = os.path.realpath(os.path.abspath(os.path.join(
     os.path.normpath(os.getcwd()))))
@@ -29,15 +31,19 @@ Usage:
     app.py (-h | --help | --manual | --version)
     app.py [-j | --skip-js] [-p | --skip-python]
            [-o <path> | --output=<path>]
-           [-c | --custom-header]
+           [-c | --custom-header] [--use-cache] [--skip-unchanged]
            [-a <path>... | --scan-additional-file=<path>...]
            [-s <key>... | --skip-key=<key>...]
            [-k <keyword>... | --keyword=<keyword>...]
            [-g <pattern>... | --ignored-pattern=<pattern>...]
-           [-x <path> | --xlet-dir=<path>]
+           [-x <path>... | --xlet-dir=<path>...]
+           [--jobs=<number>] [--extractor=<name>] [--watch]
     app.py (-i | --install | -r | --remove | -t | --gen-stats)
-           [-x <path> | --xlet-dir=<path>]
+           [-x <path>... | --xlet-dir=<path>...]
            [-f <path> | --pot-file=<path>]
+           [--jobs=<number>] [--full-stats]
+    app.py daemon [--socket=<path>]
+    app.py client [--socket=<path>] [--] [<arg>...]
     app.py generate system_executable
 
 Options:
@@ -66,7 +72,10 @@ Options:
 
 -g <pattern>, --ignored-pattern=<pattern>
     A list of file/folder names patterns (in glob-style) to ignore when
-    scanning an xlet directory.
+    scanning an xlet directory. A pattern is matched against the name of each
+    file and folder and against its path relative to the xlet folder.
+    Ignored folders are not entered at all, so the **metadata.json** and
+    **settings-schema.json** files inside them are ignored too.
 
 -o <path>, --output=<path>
     Use this option to specify the location where to store the generated .pot
@@ -77,6 +86,32 @@ Options:
     from a file named exactly **<uuid>.pot** that should be placed inside an xlet
     **po** folder.
 
+--use-cache
+    Store the strings extracted from each JavaScript and Python file in a
+    cache file next to the generated .pot file (**.<uuid>.pot.cache**). Only
+    new or modified files will be scanned again on subsequent runs.
+
+--skip-unchanged
+    Do not overwrite the .pot file if the only difference with the newly
+    generated one is its creation date. This keeps the file modification time
+    intact for tools that rely on it.
+
+--extractor=<name>
+    The program used to extract translatable strings from source files.
+    **xgettext** (the default) runs the xgettext command.
+    **builtin** uses an extractor included with this application that doesn't
+    require gettext to be installed.
+
+--watch
+    Keep running after generating the .pot file and generate it again every
+    time a JavaScript, Python, **metadata.json** or **settings-schema.json**
+    file of the xlet changes. The strings of unmodified files and the catalog in
+    which they are merged are kept in memory, so only the modified files are
+    read again and only their strings are merged again. Changes are detected
+    with inotify if it's available or by checking the files modification time
+    otherwise. The .pot file is only overwritten if its content changed (see
+    **--skip-unchanged**). Press Ctrl+C to stop.
+
 -a <path>, --scan-additional-file=<path>
     Specify additional files to scan that are outside the xlet folder.
     Can be full paths or relative (to the xlet folder) paths.
@@ -91,7 +126,13 @@ Options:
 
 -x <path>, --xlet-dir=<path>
     The path to the xlet directory. If not specified, the current working
-    directory will be used.
+    directory will be used. It can be specified more than once and it can also
+    be the path to a folder containing xlets. Any folder containing a
+    **metadata.json** file will be processed as an xlet.
+
+--jobs=<number>
+    The maximum number of xlets to process at the same time when more than one
+    xlet is found. By default, the number of processors of the machine is used.
 
 -f <path>, --pot-file=<path>
     The path to a POT file used to count untranslated strings when running the
@@ -100,7 +141,8 @@ Options:
 -i, --install
     Compiles and installs any .po files contained inside an xlet **po** folder
     to the system locale store. The xlet UUID will be used as the
-    translation domain.
+    translation domain. The files are compiled and checked for errors with
+    msgfmt. If it isn't installed, they are compiled without being checked.
 
 -r, --remove
     The opposite of install, removes translations from the system locale store.
@@ -111,6 +153,27 @@ Options:
     containg the number of untranslated strings for each .po file inside
     an xlet's **po** folder.
 
+--full-stats
+    Add the number of fuzzy and obsolete strings to the table generated by
+    the **--gen-stats** option.
+
+--socket=<path>
+    The Unix domain socket used by the **daemon** and **client** commands. By
+    default **$XDG_RUNTIME_DIR/make-cinnamon-xlet-pot.sock** is used or, if
+    **$XDG_RUNTIME_DIR** isn't defined, **daemon.sock** inside a private
+    **make-cinnamon-xlet-pot-<uid>** folder in the temporary directory.
+
+daemon
+    Keep running and execute the commands received from the **client** command.
+    The strings extracted from source files and the statistics of .po files are
+    kept in memory between commands, so only modified files are read again.
+
+client
+    Send the rest of the arguments to the daemon, which executes them as if they
+    were passed to app.py, and print its output. Generating, installing,
+    removing and generating statistics are supported. If no daemon is running,
+    the command is executed without it.
+
 """.format(appname=__appname__,
            appdescription=__appdescription__,
            version=__version__,
@@ -145,6 +208,10 @@ class CommandLineInterface(cli_utils.CommandLineInterfaceSuper):
 
         if self.a["--manual"]:
             self.action = self.display_manual_page
+        elif self.a["daemon"]:
+            self.action = self.run_daemon
+        elif self.a["client"]:
+            self.action = self.run_client
         elif self.a["generate"]:
             if self.a["system_executable"]:
                 self.logger.info("**System executable generation...**")
@@ -161,8 +228,66 @@ class CommandLineInterface(cli_utils.CommandLineInterfaceSuper):
     def scan_xlet(self):
         """See :any:`app_utils.scan_xlet`
         """
+        from . import app_utils
+
         app_utils.scan_xlet(self.a, self.logger)
 
+    def run_daemon(self):
+        """See :any:`daemon.serve`.
+        """
+        from . import daemon
+        from . import daemon_client
+
+        daemon.serve(self.a["--socket"] or daemon_client.get_socket_path(),
+                     self.run_daemon_command, self.logger)
+
+    def run_daemon_command(self, argv, caches, cwd, open_file):
+        """Run a command received by the daemon.
+
+        Parameters
+        ----------
+        argv : list
+            The command line arguments.
+        caches : dict
+            See :any:`app_utils.scan_xlet`.
+        cwd : str
+            The working directory of the client. Relative paths are resolved against it.
+        open_file : function
+            See :any:`app_utils.scan_xlet`.
+
+        Raises
+        ------
+        SystemExit
+            If the command isn't supported by the daemon.
+        """
+        # NOTE: The parsed arguments could be modified by the command.
+        args = copy.deepcopy(_parse_daemon_args(tuple(argv)))
+
+        if args["--manual"] or args["generate"] or args["daemon"] or args["client"] or \
+                args["--watch"]:
+            raise SystemExit("This command cannot be executed by the daemon.")
+
+        # NOTE: The daemon doesn't change its working directory for each command. Additional
+        # files are relative to the xlet folder, not to the working directory.
+        args["--xlet-dir"] = [os.path.join(cwd, path) for path in args["--xlet-dir"]] or [cwd]
+
+        for option in ("--output", "--pot-file"):
+            if args[option]:
+                args[option] = os.path.join(cwd, args[option])
+
+        from . import app_utils
+
+        app_utils.scan_xlet(args, self.logger, caches, open_file)
+
+    def run_client(self):
+        """See :any:`daemon_client.main`.
+        """
+        from . import daemon_client
+
+        raise SystemExit(daemon_client.main(
+            (["--socket=%s" % self.a["--socket"]] if self.a["--socket"] else []) +
+            self.a["<arg>"]))
+
     def system_executable_generation(self):
         """See :any:`cli_utils.CommandLineInterfaceSuper._system_executable_generation`.
         """
@@ -184,6 +309,26 @@ class CommandLineInterface(cli_utils.CommandLineInterfaceSuper):
         call(["man", "./app.py.1"], cwd=os.path.join(root_folder, "AppData", "data", "man"))
 
 
+@functools.lru_cache(maxsize=64)
+def _parse_daemon_args(argv):
+    """Parse the arguments of a command received by the daemon.
+
+    The results are cached since clients usually send the same commands over and over.
+
+    Parameters
+    ----------
+    argv : tuple
+        The command line arguments.
+
+    Returns
+    -------
+    dict
+        The parsed arguments.
+    """
+    return docopt(docopt_doc, argv=list(argv), version="%s %s%s" % (
+        __appname__, __version__, " (%s)" % __status__ if __status__ else ""))
+
+
 def main():
     """Initialize command line interface.
     """
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""Daemon that runs the commands sent by :any:`daemon_client` through a Unix domain socket.
+
+Keeping a single process alive saves the interpreter startup, the imports and the logger
+initialization of every command. It also keeps the strings extracted from source files and
+the statistics of .po files in memory between commands.
+
+The protocol is line based. The client sends a JSON object with the command line arguments
+(``args``) and its working directory (``cwd``). The daemon answers with JSON objects that
+contain output to print (``stream`` and ``data``) or the path to a file to open (``open``) and,
+at last, one with the command exit status (``exit``). Relative paths are resolved against the
+working directory of the client, the daemon never changes its own.
+"""
+import contextlib
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import time
+
+from collections import OrderedDict
+
+
+MAX_CACHED_ITEMS = 256
+"""int: Maximum number of items kept in memory between commands.
+
+Each extraction cache holds every string of one xlet and each statistics item the figures of
+one .po file. The least recently used items are dropped first.
+"""
+
+
+class _BoundedCache(OrderedDict):
+    """Dictionary that drops its least recently used items when it grows too large.
+    """
+
+    def __init__(self, max_items=MAX_CACHED_ITEMS):
+        """Initialization.
+
+        Parameters
+        ----------
+        max_items : int, optional
+            The maximum number of items to keep.
+        """
+        super().__init__()
+        self._max_items = max_items
+
+    def __getitem__(self, key):
+        """Get an item and mark it as the most recently used.
+
+        Parameters
+        ----------
+        key : object
+            The item key.
+
+        Returns
+        -------
+        object
+            The item value.
+        """
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+
+        return value
+
+    def __setitem__(self, key, value):
+        """Store an item and drop the least recently used ones if there are too many.
+
+        Parameters
+        ----------
+        key : object
+            The item key.
+        value : object
+            The item value.
+        """
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+
+        while len(self) > self._max_items:
+            self.popitem(last=False)
+
+    def get(self, key, default=None):
+        """Get an item and mark it as the most recently used.
+
+        Parameters
+        ----------
+        key : object
+            The item key.
+        default : object, optional
+            The value returned if there is no such item.
+
+        Returns
+        -------
+        object
+            The item value or ``default``.
+        """
+        return self[key] if key in self else default
+
+
+class _ConnectionWriter():
+    """File-like object that sends what is written to it to the client.
+    """
+
+    def __init__(self, connection, stream):
+        """Initialization.
+
+        Parameters
+        ----------
+        connection : socket.socket
+            The connection with the client.
+        stream : str
+            The stream the client should print the data to (**stdout** or **stderr**).
+        """
+        self._connection = connection
+        self._stream = stream
+
+    def write(self, data):
+        """Send data to the client.
+
+        Parameters
+        ----------
+        data : str
+            The data to send.
+
+        Returns
+        -------
+        int
+            The number of characters written.
+        """
+        if data:
+            _send(self._connection, {"stream": self._stream, "data": data})
+
+        return len(data)
+
+    def flush(self):
+        """Nothing to flush, data is sent as soon as it's written.
+        """
+        pass
+
+
+def _send(connection, message):
+    """Send a message to the client.
+
+    Parameters
+    ----------
+    connection : socket.socket
+        The connection with the client.
+    message : dict
+        The message.
+    """
+    connection.sendall(json.dumps(message).encode("UTF-8") + b"\n")
+
+
+def _on_sigterm(signum, frame):
+    """Stop the daemon the same way a KeyboardInterrupt does.
+
+    Parameters
+    ----------
+    signum : int
+        The signal number.
+    frame : frame
+        The current stack frame.
+
+    Raises
+    ------
+    KeyboardInterrupt
+        Always.
+    """
+    raise KeyboardInterrupt()
+
+
+def _remove_stale_socket(socket_path):
+    """Remove a socket nobody is listening on.
+
+    Parameters
+    ----------
+    socket_path : str
+        The path to the socket.
+
+    Raises
+    ------
+    SystemExit
+        Halt execution if the socket can't be removed.
+    """
+    try:
+        os.remove(socket_path)
+    except PermissionError as err:
+        raise SystemExit("Cannot remove the socket %s: %s." % (socket_path, err.strerror))
+
+
+def _bind(socket_path):
+    """Create the socket the daemon listens on.
+
+    Only the current user can connect to it.
+
+    Parameters
+    ----------
+    socket_path : str
+        The path to the socket.
+
+    Returns
+    -------
+    socket.socket
+        The socket.
+
+    Raises
+    ------
+    SystemExit
+        Halt execution if another daemon is already listening on the socket, if the path
+        exists and isn't a socket owned by the current user or if the socket can't be created.
+    """
+    try:
+        st = os.lstat(socket_path)
+    except FileNotFoundError:
+        st = None
+
+    if st is not None:
+        if not stat.S_ISSOCK(st.st_mode):
+            raise SystemExit("%s exists and isn't a socket." % socket_path)
+
+        if st.st_uid != os.getuid():
+            raise SystemExit("%s belongs to another user." % socket_path)
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            # NOTE: Left behind by a daemon that didn't stop cleanly.
+            _remove_stale_socket(socket_path)
+        else:
+            raise SystemExit("A daemon is already listening on %s." % socket_path)
+        finally:
+            probe.close()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+
+    try:
+        server.bind(socket_path)
+    except PermissionError as err:
+        server.close()
+        raise SystemExit("Cannot create the socket %s: %s." % (socket_path, err.strerror))
+    finally:
+        os.umask(old_umask)
+
+    server.listen(16)
+
+    return server
+
+
+def _handle_request(connection, run_command, app_logger, caches):
+    """Run a command sent by a client.
+
+    Parameters
+    ----------
+    connection : socket.socket
+        The connection with the client.
+    run_command : function
+        See :any:`serve`.
+    app_logger : object
+        See <class :any:`LogSystem`>.
+    caches : _BoundedCache
+        The data kept between commands.
+    """
+    try:
+        with connection.makefile("rb") as request_file:
+            request = json.loads(request_file.readline().decode("UTF-8"))
+
+        args = [str(arg) for arg in request["args"]]
+        cwd = str(request["cwd"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+
+    start = time.time()
+    status = 0
+
+    def open_file(path):
+        # NOTE: The client opens the file, it's the one running in the user session.
+        _send(connection, {"open": path})
+
+    try:
+        with contextlib.redirect_stdout(_ConnectionWriter(connection, "stdout")), \
+                contextlib.redirect_stderr(_ConnectionWriter(connection, "stderr")):
+            try:
+                run_command(args, caches, cwd, open_file)
+            except SystemExit as err:
+                if err.code is None or isinstance(err.code, int):
+                    status = err.code or 0
+                else:
+                    print(err.code, file=sys.stderr)
+                    status = 1
+            except Exception as err:
+                print("%s: %s" % (type(err).__name__, err), file=sys.stderr)
+                status = 1
+
+        _send(connection, {"exit": status})
+    except OSError:
+        # NOTE: The client went away.
+        status = None
+
+    app_logger.info("**Request:** %s (exit status: %s, %i ms)" %
+                    (" ".join(args), status, (time.time() - start) * 1000), date=False)
+
+
+def serve(socket_path, run_command, app_logger):
+    """Run the commands sent by clients until the daemon is stopped.
+
+    Commands are run one at a time, in the order they are received. The daemon is stopped with
+    Ctrl+C or the SIGTERM signal.
+
+    Parameters
+    ----------
+    socket_path : str
+        The path to the socket to listen on.
+    run_command : function
+        The function that runs a command. It receives the list of command line arguments, a
+        dictionary where to keep data between commands (at most :any:`MAX_CACHED_ITEMS`
+        items are kept), the working directory of the client and a function that asks the
+        client to open a file. It can raise SystemExit to set the exit status.
+    app_logger : object
+        See <class :any:`LogSystem`>.
+    """
+    socket_path = os.path.abspath(socket_path)
+    server = _bind(socket_path)
+    caches = _BoundedCache()
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+    app_logger.info("**Daemon listening on %s. Press Ctrl+C to stop.**" % socket_path,
+                    date=False)
+
+    try:
+        while True:
+            connection = server.accept()[0]
+
+            with connection:
+                _handle_request(connection, run_command, app_logger, caches)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+        try:
+            os.remove(socket_path)
+        except OSError:
+            pass
+
+    app_logger.info("**Daemon stopped.**", date=False)
+
+
+if __name__ == "__main__":
+    pass
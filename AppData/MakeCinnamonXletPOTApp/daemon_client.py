@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Client of the daemon (see :any:`daemon`).
+
+It only imports the modules needed to talk to the daemon, so it starts as fast as possible.
+"""
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+
+
+def get_socket_path():
+    """Get the default path to the daemon socket.
+
+    Returns
+    -------
+    str
+        A path inside the user runtime directory if it's defined or inside a private folder in
+        the system temporary directory otherwise.
+
+    Raises
+    ------
+    SystemExit
+        Halt execution if the private folder exists and isn't a folder only the current user
+        can access.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "make-cinnamon-xlet-pot.sock")
+
+    # NOTE: Other users can create files in the temporary directory, so the socket is put in a
+    # folder that only the current user can access.
+    private_dir = os.path.join(tempfile.gettempdir(), "make-cinnamon-xlet-pot-%i" % os.getuid())
+
+    try:
+        os.mkdir(private_dir, 0o700)
+    except FileExistsError:
+        pass
+
+    st = os.lstat(private_dir)
+
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise SystemExit("%s isn't a private folder of the current user." % private_dir)
+
+    return os.path.join(private_dir, "daemon.sock")
+
+
+def _open_file(path):
+    """Open a file with the default application.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    """
+    import subprocess
+
+    try:
+        subprocess.run(["xdg-open", path])
+    except OSError as err:
+        sys.stderr.write("Cannot open %s: %s\n" % (path, err.strerror))
+
+
+def run(args, socket_path=None):
+    """Send a command to the daemon and print its output.
+
+    Parameters
+    ----------
+    args : list
+        The command line arguments, as they would be passed to ``app.py``.
+    socket_path : str, optional
+        The path to the daemon socket. By default, :any:`get_socket_path` is used.
+
+    Returns
+    -------
+    int|None
+        The exit status of the command or None if no daemon is listening.
+
+    Raises
+    ------
+    SystemExit
+        Halt execution if the socket belongs to another user.
+    """
+    socket_path = socket_path or get_socket_path()
+
+    try:
+        st = os.lstat(socket_path)
+    except FileNotFoundError:
+        return None
+
+    # NOTE: Don't send commands to a daemon started by someone else.
+    if st.st_uid != os.getuid():
+        raise SystemExit("%s belongs to another user." % socket_path)
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+
+    with client, client.makefile("rb") as response:
+        client.sendall(json.dumps({
+            "args": args,
+            "cwd": os.getcwd()
+        }).encode("UTF-8") + b"\n")
+
+        for line in response:
+            message = json.loads(line.decode("UTF-8"))
+
+            if "exit" in message:
+                return message["exit"]
+
+            if "open" in message:
+                _open_file(message["open"])
+                continue
+
+            stream = sys.stderr if message["stream"] == "stderr" else sys.stdout
+            stream.write(message["data"])
+            stream.flush()
+
+    sys.stderr.write("The daemon closed the connection.\n")
+
+    return 1
+
+
+def main(argv):
+    """Run a command through the daemon.
+
+    If no daemon is listening, the command is run by this process instead.
+
+    Parameters
+    ----------
+    argv : list
+        The arguments passed after the ``client`` command. They can start with the
+        ``--socket=<path>`` option and a ``--`` separator.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    socket_path = None
+
+    if argv and argv[0].startswith("--socket="):
+        socket_path = argv[0][len("--socket="):]
+        argv = argv[1:]
+
+    if argv and argv[0] == "--":
+        argv = argv[1:]
+
+    status = run(argv, socket_path)
+
+    if status is None:
+        from .cli import main as cli_main
+
+        sys.argv = sys.argv[:1] + argv
+
+        return cli_main()
+
+    return status
+
+
+if __name__ == "__main__":
+    pass
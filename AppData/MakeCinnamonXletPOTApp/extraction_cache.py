@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Per-file cache of extracted strings.
+"""
+import json
+import os
+import tempfile
+
+from .python_utils import hash_utils
+
+
+class ExtractionCache():
+    """Cache of the strings extracted from source files.
+
+    The cache is stored as a JSON file. Each source file is identified by its path and its
+    extracted entries are considered valid while the file modification time and size don't
+    change. If they do change but the file content hash is still the same (e.g. after switching
+    between branches), the cached entries are still used.
+
+    Attributes
+    ----------
+    VERSION : int
+        Version of the cache format. Cache files with a different version are ignored.
+    path : str|None
+        Path to the cache file. None for a cache that is only kept in memory.
+    """
+    VERSION = 1
+
+    def __init__(self, path, settings):
+        """Initialization.
+
+        Parameters
+        ----------
+        path : str|None
+            Path to the cache file. If None, the cache is only kept in memory (e.g. to be
+            reused across the runs of the watch mode).
+        settings : dict
+            The extraction settings (keywords, etc.). If they don't match the settings stored
+            in an existent cache file, the cached data is discarded.
+        """
+        self.path = path
+        self._settings = settings
+        self._files = {}
+        self._pending = {}
+        self._used = set()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Load the cache file.
+        """
+        if self.path is None:
+            return
+
+        try:
+            with open(self.path, "r", encoding="UTF-8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get("version") == self.VERSION and \
+                data.get("settings") == self._settings:
+            self._files = data.get("files", {})
+
+    def get(self, key, file_path):
+        """Get the cached entries of a file.
+
+        Parameters
+        ----------
+        key : str
+            The key used to store the file data. Usually the path as passed to the extractor.
+        file_path : str
+            The absolute path to the file.
+
+        Returns
+        -------
+        list|None
+            The cached entries or None if the file needs to be scanned. In the latter case, the
+            entries have to be stored with :any:`ExtractionCache.set` after extracting them.
+        """
+        self._used.add(key)
+
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+
+        cached = self._files.get(key)
+
+        if cached is not None:
+            if cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+                return cached["entries"]
+
+            if cached["size"] == st.st_size:
+                file_hash = hash_utils.file_hash(file_path)
+
+                if cached["hash"] == file_hash:
+                    cached["mtime_ns"] = st.st_mtime_ns
+                    self._dirty = True
+                    return cached["entries"]
+
+                self._pending[key] = (st.st_mtime_ns, st.st_size, file_hash)
+                return None
+
+        self._pending[key] = (st.st_mtime_ns, st.st_size, hash_utils.file_hash(file_path))
+
+        return None
+
+    def set(self, key, entries):
+        """Store the entries extracted from a file.
+
+        Parameters
+        ----------
+        key : str
+            See :any:`ExtractionCache.get`.
+        entries : list
+            The extracted entries. They must be JSON serializable.
+        """
+        fingerprint = self._pending.pop(key, None)
+
+        if fingerprint is None:
+            return
+
+        self._files[key] = {
+            "mtime_ns": fingerprint[0],
+            "size": fingerprint[1],
+            "hash": fingerprint[2],
+            "entries": entries
+        }
+        self._dirty = True
+
+    def save(self):
+        """Save the cache file.
+
+        Data of files that weren't requested since the cache was loaded (or last saved) is
+        dropped.
+        """
+        for key in list(self._files):
+            if key not in self._used:
+                del self._files[key]
+                self._dirty = True
+
+        self._used = set()
+
+        if self.path is None or not self._dirty:
+            return
+
+        cache_dir = os.path.dirname(self.path)
+        os.makedirs(cache_dir, mode=0o755, exist_ok=True)
+        # NOTE: A unique temporary file, so concurrent saves (e.g. the daemon and a manual run)
+        # never write to the same file. Whichever is replaced last wins, but it's always whole.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=os.path.basename(self.path) + ".")
+
+        try:
+            with os.fdopen(fd, "w", encoding="UTF-8") as cache_file:
+                json.dump({
+                    "version": self.VERSION,
+                    "settings": self._settings,
+                    "files": self._files
+                }, cache_file, ensure_ascii=False, separators=(",", ":"))
+
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+            raise
+
+        self._dirty = False
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,1064 @@
+# -*- coding: utf-8 -*-
+"""Built-in extractors of translatable strings.
+
+They are in-process alternatives to xgettext that produce the same entries that xgettext would
+extract from a single file when called with the ``--add-comments`` option.
+
+Attributes
+----------
+DEFAULT_KEYWORDS : dict
+    The keywords that xgettext always looks for, by language.
+"""
+import ast
+import io
+import re
+import tokenize
+
+from collections import OrderedDict
+
+
+DEFAULT_KEYWORDS = {
+    "JavaScript": ["_", "gettext", "dgettext:2", "dcgettext:2", "ngettext:1,2",
+                   "dngettext:2,3", "pgettext:1c,2", "dpgettext:2c,3"],
+    "Python": ["_", "gettext", "ugettext", "dgettext:2", "ngettext:1,2", "ungettext:1,2",
+               "dngettext:2,3", "pgettext:1c,2", "npgettext:1c,2,3", "dpgettext:2c,3",
+               "dnpgettext:2c,3,4"],
+}
+
+_js_format_re = re.compile(r"%(?:[1-9][0-9]*\$)?[#0\- +']*[0-9]*(?:\.[0-9]+)?(.?)")
+_js_conversions = "bcdieEfFgGosxXj"
+_py_format_re = re.compile(
+    r"%(?:\([^)]*\))?[#0\- +]*(?:\*|[0-9]+)?(?:\.(?:\*|[0-9]+))?[hlL]?(.?)")
+_py_conversions = "diouxXeEfFgGcrsa"
+_python_skipped_tokens = {tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT,
+                          tokenize.ENCODING, tokenize.ENDMARKER}
+_js_name_re = re.compile(r"[A-Za-z_$\x80-\U0010ffff][\w$\x80-\U0010ffff]*")
+_js_number_re = re.compile(r"\.?[0-9][\w.]*")
+_js_hex_escape_re = re.compile(r"[0-9A-Fa-f]{2}")
+_js_unicode_escape_re = re.compile(r"\{([0-9A-Fa-f]+)\}|([0-9A-Fa-f]{4})")
+_js_low_surrogate_re = re.compile(r"\\u([dD][c-fC-F][0-9A-Fa-f]{2})")
+_js_escapes = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+}
+# Tokens after which a slash starts a regular expression instead of being a division operator.
+_js_regex_prefix_names = {"return", "typeof", "case", "do", "else", "in", "instanceof", "new",
+                          "delete", "void", "throw", "yield", "await"}
+
+
+def parse_keyword(keyword):
+    """Parse a keyword specification as accepted by the xgettext ``--keyword`` option.
+
+    Parameters
+    ----------
+    keyword : str
+        A keyword specification. For example, ``_``, ``ngettext:1,2`` or ``pgettext:1c,2``.
+
+    Returns
+    -------
+    tuple
+        The keyword name and its shape. The shape is a tuple with the positions of the msgid,
+        the msgid_plural and the msgctxt arguments and the total number of arguments (all of
+        them 1-based and all but the first one can be None). The shape is None if the
+        specification is invalid.
+    """
+    name, sep, spec = keyword.partition(":")
+    name = name.strip()
+    msgid = plural = context = total = None
+
+    if not name:
+        return name, None
+
+    for part in spec.split(",") if sep else []:
+        part = part.strip()
+
+        if not part or part.startswith('"'):
+            continue
+
+        try:
+            if part[-1] == "c":
+                context = int(part[:-1])
+            elif part[-1] == "t":
+                total = int(part[:-1])
+            elif msgid is None:
+                msgid = int(part)
+            else:
+                plural = int(part)
+        except ValueError:
+            return name, None
+
+    return name, (msgid or 1, plural, context, total)
+
+
+def parse_keywords(keywords, language):
+    """Parse keyword specifications.
+
+    Parameters
+    ----------
+    keywords : list
+        Keyword specifications. See :any:`parse_keyword`.
+    language : str
+        The language whose default keywords should also be included.
+
+    Returns
+    -------
+    dict
+        The shapes of each keyword name.
+    """
+    shapes = OrderedDict()
+
+    for keyword in DEFAULT_KEYWORDS.get(language, []) + list(keywords):
+        name, shape = parse_keyword(keyword)
+
+        if shape is None:
+            continue
+
+        shapes.setdefault(name, [])
+
+        if shape not in shapes[name]:
+            shapes[name].append(shape)
+
+    return shapes
+
+
+def _is_format(string, format_re, conversions):
+    """Check if a string looks like a format string.
+
+    Parameters
+    ----------
+    string : str
+        The string to check.
+    format_re : re.Pattern
+        Pattern matching a directive. Its only group must match the conversion character.
+    conversions : str
+        The valid conversion characters (not counting ``%``).
+
+    Returns
+    -------
+    bool
+        If the string contains at least one directive and all its directives are valid.
+    """
+    directives = 0
+    pos = string.find("%")
+
+    while pos != -1:
+        match = format_re.match(string, pos)
+        conversion = match.group(1)
+
+        if conversion == "%":
+            if match.end() - pos != 2:
+                return False
+        elif conversion and conversion in conversions:
+            directives += 1
+        else:
+            return False
+
+        pos = string.find("%", match.end())
+
+    return directives > 0
+
+
+def is_javascript_format(string):
+    """Check if a string looks like a JavaScript format string.
+
+    Parameters
+    ----------
+    string : str
+        The string to check.
+
+    Returns
+    -------
+    bool
+        See :any:`_is_format`.
+    """
+    return _is_format(string, _js_format_re, _js_conversions)
+
+
+def _clean_comment(text, block):
+    """Clean a comment the way xgettext does.
+
+    Parameters
+    ----------
+    text : str
+        The comment text without its delimiters.
+    block : bool
+        If the comment is a block comment (it might contain more than one line).
+
+    Returns
+    -------
+    list
+        The comment lines with leading and trailing white spaces removed.
+    """
+    lines = text.split("\n") if block else [text]
+
+    return [line.strip(" \t\r\f\v") for line in lines]
+
+
+def _comment_to_entry_data(comment, flags):
+    """Convert the comment lines attached to a string into an entry comment.
+
+    Lines containing special ``xgettext:`` comments are not added. Instead, the flags they
+    contain are stored in ``flags``.
+
+    Parameters
+    ----------
+    comment : tuple
+        The comment lines.
+    flags : list
+        Where to store the flags found in special comments.
+
+    Returns
+    -------
+    list
+        The comment lines to add to the entry.
+    """
+    lines = []
+
+    for line in comment:
+        if "xgettext:" in line:
+            for flag in line[line.index("xgettext:") + 9:].replace(",", " ").split():
+                if flag not in flags:
+                    flags.append(flag)
+        else:
+            lines.append(line)
+
+    return lines
+
+
+class _Catalog():
+    """Accumulate the messages extracted from a single file.
+    """
+
+    def __init__(self, file, format_flag, is_format):
+        """Initialization.
+
+        Parameters
+        ----------
+        file : str
+            The file path to use in the entry occurrences.
+        format_flag : str
+            The format flag of the language (e.g. ``javascript-format``).
+        is_format : function
+            Function that checks if a string looks like a format string.
+        """
+        self._file = file
+        self._format_flag = format_flag
+        self._is_format = is_format
+        self._entries = OrderedDict()
+
+    def add(self, msgid, msgid_plural, msgctxt, line, comment):
+        """Add a message.
+
+        Parameters
+        ----------
+        msgid : str
+            The message ID.
+        msgid_plural : str|None
+            The plural form of the message ID.
+        msgctxt : str|None
+            The message context.
+        line : int
+            The line in which the message was found.
+        comment : tuple
+            The comment lines attached to the message.
+        """
+        # NOTE: An empty msgid is reserved for the header entry.
+        if not msgid:
+            return
+
+        key = (msgctxt, msgid)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            entry = self._entries[key] = {
+                "msgid": msgid,
+                "msgid_plural": msgid_plural or "",
+                "msgctxt": msgctxt,
+                "comment": [],
+                "flags": [],
+                "occurrences": []
+            }
+        elif msgid_plural and not entry["msgid_plural"]:
+            entry["msgid_plural"] = msgid_plural
+
+        for comment_line in _comment_to_entry_data(comment, entry["flags"]):
+            if comment_line not in entry["comment"]:
+                entry["comment"].append(comment_line)
+
+        occurrence = [self._file, str(line)]
+
+        if occurrence not in entry["occurrences"]:
+            entry["occurrences"].append(occurrence)
+
+    def entries(self):
+        """Get the extracted entries.
+
+        Returns
+        -------
+        list
+            The extracted entries in the order in which they were first found. See
+            :any:`app_utils._entry_to_dict`.
+        """
+        result = []
+
+        for entry in self._entries.values():
+            flags = entry["flags"]
+            no_flag = "no-" + self._format_flag
+
+            if self._format_flag not in flags and no_flag not in flags and (
+                    self._is_format(entry["msgid"]) or
+                    (entry["msgid_plural"] and self._is_format(entry["msgid_plural"]))):
+                flags.append(self._format_flag)
+
+            result.append({
+                "msgid": entry["msgid"],
+                "msgid_plural": entry["msgid_plural"],
+                "msgctxt": entry["msgctxt"],
+                "comment": "\n".join(entry["comment"]),
+                "flags": flags,
+                "occurrences": entry["occurrences"]
+            })
+
+        return result
+
+
+class _JavaScriptLexer():
+    """A minimal JavaScript tokenizer.
+
+    It only distinguishes the tokens needed to find keyword calls: names, string literals,
+    template literals without substitutions and punctuation. Comments are tracked following
+    the same rules as xgettext: the comments found before a string are attached to it, unless
+    a line containing code is found between them.
+    """
+
+    def __init__(self, source):
+        """Initialization.
+
+        Parameters
+        ----------
+        source : str
+            The JavaScript source code.
+        """
+        self._src = source
+        self._pos = 0
+        self._line = 1
+        self._comment = []
+        self._last_comment_line = -1
+        self._last_non_comment_line = -1
+        self._prev = None
+
+    def tokens(self):
+        """Tokenize the source code.
+
+        Returns
+        -------
+        list
+            A list of tuples containing the token kind (``name``, ``string``, ``punct`` or
+            ``other``), its value, the line in which it was found and the comment lines
+            attached to it.
+        """
+        tokens = []
+        self._tokenize(tokens, False)
+
+        return tokens
+
+    def _tokenize(self, tokens, substitution):
+        """Tokenize the source code from the current position.
+
+        Parameters
+        ----------
+        tokens : list
+            Where to store the tokens.
+        substitution : bool
+            Whether a template literal substitution is being tokenized. If True, stop after its
+            closing brace.
+        """
+        src = self._src
+        length = len(src)
+        depth = 0
+
+        while self._pos < length:
+            char = src[self._pos]
+
+            if char == "\n":
+                if self._last_non_comment_line > self._last_comment_line:
+                    self._comment = []
+
+                self._line += 1
+                self._pos += 1
+                continue
+
+            if char in " \t\r\f\v\ufeff\xa0":
+                self._pos += 1
+                continue
+
+            if src.startswith("//", self._pos):
+                end = src.find("\n", self._pos)
+                end = length if end == -1 else end
+                self._add_comment(src[self._pos + 2:end], False)
+                self._pos = end
+                continue
+
+            if src.startswith("/*", self._pos):
+                end = src.find("*/", self._pos + 2)
+                end = length if end == -1 else end
+                text = src[self._pos + 2:end]
+                self._line += text.count("\n")
+                self._add_comment(text, True)
+                self._pos = end + 2
+                continue
+
+            line = self._line
+
+            if char in "\"'":
+                token = ("string", self._read_string(char), line)
+            elif char == "`":
+                value = self._read_template(tokens)
+                token = ("string", value, line) if value is not None else ("other", "`", line)
+            elif char == "/" and self._regex_allowed():
+                self._skip_regex()
+                token = ("other", "/", line)
+            else:
+                match = _js_name_re.match(src, self._pos)
+
+                if match is None:
+                    match = _js_number_re.match(src, self._pos)
+                    kind = "other"
+                else:
+                    kind = "name"
+
+                if match is not None:
+                    token = (kind, match.group(0), line)
+                    self._pos = match.end()
+                else:
+                    token = ("punct", char, line)
+                    self._pos += 1
+
+                    if substitution and char == "{":
+                        depth += 1
+                    elif substitution and char == "}":
+                        if depth == 0:
+                            return
+
+                        depth -= 1
+
+            self._last_non_comment_line = line
+            self._prev = token
+            tokens.append(token + (tuple(self._comment),))
+
+    def _add_comment(self, text, block):
+        """Store a comment.
+
+        Parameters
+        ----------
+        text : str
+            The comment text.
+        block : bool
+            See :any:`_clean_comment`.
+        """
+        self._comment.extend(_clean_comment(text, block))
+        self._last_comment_line = self._line
+
+    def _regex_allowed(self):
+        """Check if a slash at the current position starts a regular expression.
+
+        Returns
+        -------
+        bool
+            Whether a regular expression is allowed.
+        """
+        if self._prev is None:
+            return True
+
+        kind, value = self._prev[0], self._prev[1]
+
+        if kind == "name":
+            return value in _js_regex_prefix_names
+
+        if kind == "punct":
+            return value not in ")]}"
+
+        return kind == "other" and value == "/"
+
+    def _read_escape(self):
+        """Read an escape sequence (the position is at the character after the backslash).
+
+        Returns
+        -------
+        str
+            The escaped character(s).
+        """
+        src = self._src
+        char = src[self._pos:self._pos + 1]
+        self._pos += 1
+
+        if char == "\n":
+            self._line += 1
+            return ""
+
+        if char == "\r":
+            if src.startswith("\n", self._pos):
+                self._pos += 1
+                self._line += 1
+
+            return ""
+
+        if char == "x":
+            digits = src[self._pos:self._pos + 2]
+
+            if _js_hex_escape_re.fullmatch(digits):
+                self._pos += 2
+                return chr(int(digits, 16))
+
+            return char
+
+        if char == "u":
+            match = _js_unicode_escape_re.match(src, self._pos)
+
+            if match is not None:
+                self._pos = match.end()
+                code = int(match.group(1) or match.group(2), 16)
+
+                # Combine surrogate pairs written as two escape sequences.
+                if 0xD800 <= code < 0xDC00:
+                    low = _js_low_surrogate_re.match(src, self._pos)
+
+                    if low is not None:
+                        self._pos = low.end()
+                        code = 0x10000 + ((code - 0xD800) << 10) + (int(low.group(1), 16) - 0xDC00)
+
+                return chr(code) if code <= 0x10FFFF else ""
+
+            return char
+
+        return _js_escapes.get(char, char)
+
+    def _read_string(self, quote):
+        """Read a string literal.
+
+        Parameters
+        ----------
+        quote : str
+            The quote character that delimits the string.
+
+        Returns
+        -------
+        str
+            The string value.
+        """
+        src = self._src
+        self._pos += 1
+        chunks = []
+
+        while self._pos < len(src):
+            char = src[self._pos]
+
+            if char == quote:
+                self._pos += 1
+                break
+
+            if char == "\n":
+                # Unterminated string.
+                break
+
+            self._pos += 1
+
+            if char == "\\":
+                chunks.append(self._read_escape())
+            else:
+                chunks.append(char)
+
+        return "".join(chunks)
+
+    def _read_template(self, tokens):
+        """Read a template literal.
+
+        The tokens of its substitutions are stored enclosed in square brackets so they are seen
+        as nested expressions.
+
+        Parameters
+        ----------
+        tokens : list
+            Where to store the tokens of the substitutions.
+
+        Returns
+        -------
+        str|None
+            The template value or None if the template contains substitutions.
+        """
+        src = self._src
+        self._pos += 1
+        chunks = []
+        substitutions = False
+
+        while self._pos < len(src):
+            char = src[self._pos]
+            self._pos += 1
+
+            if char == "`":
+                break
+
+            if char == "\\":
+                chunks.append(self._read_escape())
+            elif char == "$" and src.startswith("{", self._pos):
+                substitutions = True
+                self._pos += 1
+                tokens.append(("punct", "[", self._line, tuple(self._comment)))
+                self._prev = None
+                self._tokenize(tokens, True)
+                tokens.append(("punct", "]", self._line, tuple(self._comment)))
+            else:
+                if char == "\n":
+                    self._line += 1
+
+                chunks.append(char)
+
+        return None if substitutions else "".join(chunks)
+
+    def _skip_regex(self):
+        """Skip a regular expression literal.
+        """
+        src = self._src
+        self._pos += 1
+        in_class = False
+
+        while self._pos < len(src):
+            char = src[self._pos]
+
+            if char == "\n":
+                return
+
+            self._pos += 1
+
+            if char == "\\":
+                self._pos += 1
+            elif char == "[":
+                in_class = True
+            elif char == "]":
+                in_class = False
+            elif char == "/" and not in_class:
+                break
+
+        match = _js_name_re.match(src, self._pos)
+
+        if match is not None:
+            self._pos = match.end()
+
+
+def _string_argument(tokens):
+    """Get the value of an argument made only of concatenated string literals.
+
+    Parameters
+    ----------
+    tokens : list
+        The tokens of the argument.
+
+    Returns
+    -------
+    tuple|None
+        The string value, the line and the comment of its first token or None if the argument
+        isn't a string.
+    """
+    if not tokens or len(tokens) % 2 == 0:
+        return None
+
+    for i, token in enumerate(tokens):
+        if token is None:
+            return None
+
+        if i % 2 == 0 and token[0] != "string":
+            return None
+
+        if i % 2 == 1 and token[:2] != ("punct", "+"):
+            return None
+
+    return ("".join(token[1] for token in tokens[::2]), tokens[0][2], tokens[0][3])
+
+
+def _remember_call(shapes, args, catalog):
+    """Add the message of a keyword call to the catalog.
+
+    Parameters
+    ----------
+    shapes : list
+        The shapes of the keyword. See :any:`parse_keyword`.
+    args : list
+        The tokens of each argument.
+    catalog : _Catalog
+        Where to store the message.
+    """
+    num_args = 0 if args == [[]] else len(args)
+
+    for msgid_pos, plural_pos, context_pos, total in shapes:
+        if total is not None and total != num_args:
+            continue
+
+        values = []
+
+        for pos in (msgid_pos, plural_pos, context_pos):
+            if pos is None:
+                values.append(None)
+                continue
+
+            value = _string_argument(args[pos - 1]) if pos <= num_args else None
+
+            if value is None:
+                break
+
+            values.append(value)
+        else:
+            msgid, plural, context = values
+            catalog.add(msgid[0],
+                        plural[0] if plural else None,
+                        context[0] if context else None,
+                        msgid[1],
+                        msgid[2])
+            return
+
+
+def _extract_calls(tokens, shapes, catalog):
+    """Find the keyword calls in a list of tokens and add their messages to a catalog.
+
+    Parameters
+    ----------
+    tokens : list
+        The tokens of a source file. See :any:`_JavaScriptLexer.tokens`.
+    shapes : dict
+        The shapes of each keyword. See :any:`parse_keywords`.
+    catalog : _Catalog
+        Where to store the messages.
+    """
+    # Each frame contains the shapes of the called keyword (or None for any other kind of
+    # bracket), the arguments already parsed and the tokens of the current argument.
+    stack = []
+    i = 0
+
+    while i < len(tokens):
+        token = tokens[i]
+        kind, value = token[0], token[1]
+        frame = stack[-1] if stack else None
+        in_call = frame is not None and frame[0] is not None
+
+        if kind == "name" and value in shapes and i + 1 < len(tokens) and \
+                tokens[i + 1][:2] == ("punct", "("):
+            if in_call:
+                frame[2].append(None)
+
+            stack.append((shapes[value], [], []))
+            i += 2
+            continue
+
+        if kind == "punct":
+            if value in "([{":
+                if in_call:
+                    frame[2].append(None)
+
+                stack.append((None, [], []))
+                i += 1
+                continue
+
+            if value in ")]}":
+                if frame is not None:
+                    stack.pop()
+
+                    if frame[0] is not None:
+                        frame[1].append(frame[2])
+                        _remember_call(frame[0], frame[1], catalog)
+
+                i += 1
+                continue
+
+            if value == "," and in_call:
+                frame[1].append(list(frame[2]))
+                del frame[2][:]
+                i += 1
+                continue
+
+        if in_call:
+            frame[2].append(token)
+
+        i += 1
+
+
+def extract_javascript(source, file, keywords, errors=None):
+    """Extract translatable strings from JavaScript source code.
+
+    Parameters
+    ----------
+    source : str
+        The JavaScript source code.
+    file : str
+        The file path to use in the entry occurrences.
+    keywords : list
+        Keyword specifications. See :any:`parse_keyword`.
+    errors : list, optional
+        See :any:`extract_file`. The JavaScript lexer never fails, so it's left untouched.
+
+    Returns
+    -------
+    list
+        The extracted entries. See :any:`app_utils._entry_to_dict`.
+    """
+    catalog = _Catalog(file, "javascript-format", is_javascript_format)
+    _extract_calls(_JavaScriptLexer(source).tokens(), parse_keywords(keywords, "JavaScript"),
+                   catalog)
+
+    return catalog.entries()
+
+
+def _python_tokens(source, errors=None):
+    """Tokenize Python source code.
+
+    Comments are attached to the tokens following the same rules used by
+    :any:`_JavaScriptLexer`. Adjacent string literals are joined into a single token.
+
+    The tokenize module stops at the first error (bad indentation, unterminated brackets or
+    multi-line strings, etc.) while xgettext doesn't care about them. When that happens,
+    tokenizing starts again at the line of the error, or after it if it's the line where the
+    tokenizer started.
+
+    Parameters
+    ----------
+    source : str
+        The Python source code.
+    errors : list, optional
+        Where to append a tuple with the line number and the message of each error.
+
+    Returns
+    -------
+    list
+        See :any:`_JavaScriptLexer.tokens`.
+    """
+    lines = source.splitlines(True)
+    tokens = []
+    offset = 0
+
+    while offset < len(lines):
+        try:
+            _tokenize_python_lines(lines[offset:], offset, tokens)
+            break
+        except (tokenize.TokenError, SyntaxError) as err:
+            if isinstance(err, SyntaxError):
+                line, message = err.lineno or 1, err.msg
+            else:
+                line, message = err.args[1][0], err.args[0]
+
+            if errors is not None:
+                errors.append((offset + min(line, len(lines) - offset), message))
+
+            # NOTE: An error past the last line (e.g. unclosed brackets) means all the tokens
+            # were already found.
+            if line > len(lines) - offset:
+                break
+
+            if line > 1:
+                offset += line - 1
+
+                # NOTE: The line of the error is tokenized again.
+                while tokens and tokens[-1][2] > offset:
+                    tokens.pop()
+            else:
+                offset += 1
+
+            # NOTE: Keep strings and calls from being joined across the error.
+            tokens.append(("other", "", offset, ()))
+
+    return tokens
+
+
+def _tokenize_python_lines(lines, offset, tokens):
+    """Tokenize lines of Python source code.
+
+    Parameters
+    ----------
+    lines : list
+        The lines to tokenize.
+    offset : int
+        The number of lines that precede ``lines`` in the source code.
+    tokens : list
+        Where to append the tokens. See :any:`_JavaScriptLexer.tokens`.
+
+    Raises
+    ------
+    tokenize.TokenError, SyntaxError
+        If the tokenizer fails. The tokens found until then are kept in ``tokens``.
+    """
+    comment = []
+    last_comment_line = -1
+    last_non_comment_line = -1
+    prev_line = 1
+
+    for tok in tokenize.generate_tokens(io.StringIO("".join(lines)).readline):
+        tok_type, value, (line, _col), (end_line, _end_col) = tok[:4]
+
+        if line > prev_line and last_non_comment_line > last_comment_line:
+            comment = []
+
+        prev_line = end_line
+
+        if tok_type == tokenize.COMMENT:
+            comment.extend(_clean_comment(value[1:], False))
+            last_comment_line = line
+            continue
+
+        if tok_type in _python_skipped_tokens:
+            continue
+
+        last_non_comment_line = end_line
+        line += offset
+
+        if tok_type == tokenize.STRING:
+            string = _python_string(value)
+
+            if string is None:
+                token = ("other", value, line)
+            elif tokens and tokens[-1][0] == "string":
+                # Implicit concatenation of string literals.
+                prev = tokens.pop()
+                token = ("string", prev[1] + string, prev[2])
+                tokens.append(token + (prev[3],))
+                continue
+            else:
+                token = ("string", string, line)
+        elif tok_type == tokenize.NAME:
+            token = ("name", value, line)
+        elif tok_type == tokenize.OP:
+            token = ("punct", value, line)
+        else:
+            token = ("other", value, line)
+
+        tokens.append(token + (tuple(comment),))
+
+
+def _python_string(literal):
+    """Get the value of a Python string literal.
+
+    Parameters
+    ----------
+    literal : str
+        The string literal as found in the source code.
+
+    Returns
+    -------
+    str|None
+        The string value or None if the literal isn't a text string (bytes or f-strings).
+    """
+    prefix = literal[:len(literal) - len(literal.lstrip("bBfFrRuU"))].lower()
+
+    if "b" in prefix or "f" in prefix:
+        return None
+
+    try:
+        return ast.literal_eval(literal)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def is_python_format(string):
+    """Check if a string looks like a Python format string.
+
+    Parameters
+    ----------
+    string : str
+        The string to check.
+
+    Returns
+    -------
+    bool
+        See :any:`_is_format`.
+    """
+    return _is_format(string, _py_format_re, _py_conversions)
+
+
+def extract_python(source, file, keywords, errors=None):
+    """Extract translatable strings from Python source code.
+
+    Parameters
+    ----------
+    source : str
+        The Python source code.
+    file : str
+        The file path to use in the entry occurrences.
+    keywords : list
+        Keyword specifications. See :any:`parse_keyword`.
+    errors : list, optional
+        See :any:`extract_file`.
+
+    Returns
+    -------
+    list
+        The extracted entries. See :any:`app_utils._entry_to_dict`.
+    """
+    catalog = _Catalog(file, "python-format", is_python_format)
+    _extract_calls(_python_tokens(source, errors), parse_keywords(keywords, "Python"), catalog)
+
+    return catalog.entries()
+
+
+def is_supported(language):
+    """Check if there is a built-in extractor for a language.
+
+    Parameters
+    ----------
+    language : str
+        The language name as recognized by xgettext.
+
+    Returns
+    -------
+    bool
+        Whether the language is supported.
+    """
+    return language in _extractors
+
+
+def extract_file(file_path, file, language, keywords, errors=None):
+    """Extract translatable strings from a file.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file to read.
+    file : str
+        The file path to use in the entry occurrences.
+    language : str
+        The language of the file.
+    keywords : list
+        Keyword specifications. See :any:`parse_keyword`.
+    errors : list, optional
+        Where to append a tuple with the line number and the message of each error found
+        while scanning the file. Scanning resumes after them.
+
+    Returns
+    -------
+    list
+        The extracted entries. See :any:`app_utils._entry_to_dict`.
+
+    Raises
+    ------
+    ValueError
+        If there isn't a built-in extractor for the language. See :any:`is_supported`.
+    """
+    extractor = _extractors.get(language)
+
+    if extractor is None:
+        raise ValueError("No built-in extractor for %s files." % language)
+
+    with open(file_path, "r", encoding="UTF-8") as source_file:
+        source = source_file.read()
+
+    return extractor(source, file, keywords, errors)
+
+
+_extractors = {
+    "JavaScript": extract_javascript,
+    "Python": extract_python,
+}
+
+
+if __name__ == "__main__":
+    pass
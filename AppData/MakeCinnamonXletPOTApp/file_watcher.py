@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""Watch directory trees for file changes.
+
+Attributes
+----------
+DEBOUNCE : float
+    Seconds without new changes after which a burst of changes is considered finished.
+POLL_INTERVAL : float
+    Seconds between two scans of the watched directories when inotify isn't available.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+
+DEBOUNCE = 0.05
+POLL_INTERVAL = 0.25
+
+# NOTE: Values from <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | \
+    _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher():
+    """Watcher that uses the Linux inotify API (through ctypes).
+
+    Attributes
+    ----------
+    name : str
+        The name of the method used to detect changes.
+    """
+    name = "inotify"
+
+    def __init__(self, roots, accept):
+        """Initialization.
+
+        Parameters
+        ----------
+        roots : list
+            A list of tuples containing the path to a directory to watch and whether its
+            sub-directories should also be watched.
+        accept : function
+            A function that receives a path and whether it's a directory. It should return
+            False for files that should not be reported and directories that should not be
+            watched.
+
+        Raises
+        ------
+        OSError
+            If inotify isn't available or a directory couldn't be watched (e.g. because the
+            limit of watches was reached).
+        """
+        self._accept = accept
+        self._watches = {}
+        self._fd = None
+        libc_name = ctypes.util.find_library("c")
+
+        if libc_name is None:
+            raise OSError("libc not found.")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+
+        try:
+            self._libc.inotify_init1
+        except AttributeError:
+            raise OSError("inotify not supported.")
+
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            self._fd = None
+            raise OSError(err, os.strerror(err))
+
+        try:
+            for path, recursive in roots:
+                self._add_watch(path, recursive)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path, recursive):
+        """Watch a directory and, if recursive, its accepted sub-directories.
+
+        Parameters
+        ----------
+        path : str
+            The path to the directory.
+        recursive : bool
+            Whether to also watch the sub-directories.
+
+        Raises
+        ------
+        OSError
+            If the directory couldn't be watched.
+        """
+        stack = [path]
+
+        while stack:
+            dir_path = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), _IN_WATCH_MASK)
+
+            if wd < 0:
+                err = ctypes.get_errno()
+
+                # NOTE: The directory was removed before it could be watched.
+                if err == errno.ENOENT and dir_path != path:
+                    continue
+
+                raise OSError(err, "%s: %s" % (os.strerror(err), dir_path))
+
+            self._watches[wd] = (dir_path, recursive)
+
+            if not recursive:
+                continue
+
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False) and \
+                                self._accept(entry.path, True):
+                            stack.append(entry.path)
+            except OSError:
+                pass
+
+    def _read_changes(self, timeout):
+        """Read the pending events.
+
+        Parameters
+        ----------
+        timeout : float|None
+            Seconds to wait for events. None to wait indefinitely.
+
+        Returns
+        -------
+        set
+            The paths of the changed files and directories. Empty if no event arrived in time.
+        """
+        changed = set()
+
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return changed
+
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return changed
+
+        pos = 0
+
+        while pos < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b"\0"))
+            pos += length
+
+            if mask & _IN_Q_OVERFLOW:
+                # NOTE: Events were lost. Report every watched directory and look for new
+                # sub-directories.
+                for dir_path, recursive in list(self._watches.values()):
+                    changed.add(dir_path)
+
+                    try:
+                        self._add_watch(dir_path, recursive)
+                    except OSError:
+                        pass
+
+                continue
+
+            watch = self._watches.get(wd)
+
+            if watch is None:
+                continue
+
+            dir_path, recursive = watch
+
+            if mask & _IN_IGNORED:
+                del self._watches[wd]
+                continue
+
+            if mask & _IN_MOVE_SELF:
+                # NOTE: The path of a moved directory is unknown. Stop watching it, it will be
+                # watched again if it was moved inside a watched directory.
+                self._libc.inotify_rm_watch(self._fd, wd)
+                continue
+
+            if not name:
+                continue
+
+            path = os.path.join(dir_path, name)
+            is_dir = bool(mask & _IN_ISDIR)
+
+            if not self._accept(path, is_dir):
+                continue
+
+            changed.add(path)
+
+            if is_dir and recursive and mask & (_IN_CREATE | _IN_MOVED_TO):
+                try:
+                    self._add_watch(path, True)
+                except OSError:
+                    pass
+
+        return changed
+
+    def wait(self, debounce=DEBOUNCE):
+        """Wait for changes.
+
+        Parameters
+        ----------
+        debounce : float, optional
+            Keep collecting changes until none is detected for this amount of seconds.
+
+        Returns
+        -------
+        set
+            The paths of the changed files and directories.
+        """
+        changed = set()
+
+        while not changed:
+            changed = self._read_changes(None)
+
+        while True:
+            more = self._read_changes(debounce)
+
+            if not more:
+                return changed
+
+            changed |= more
+
+    def close(self):
+        """Stop watching.
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._watches = {}
+
+
+class PollingWatcher():
+    """Watcher that periodically compares the modification times and sizes of the files.
+
+    Attributes
+    ----------
+    name : str
+        The name of the method used to detect changes.
+    """
+    name = "polling"
+
+    def __init__(self, roots, accept, interval=POLL_INTERVAL):
+        """Initialization.
+
+        Parameters
+        ----------
+        roots : list
+            See :any:`InotifyWatcher`.
+        accept : function
+            See :any:`InotifyWatcher`.
+        interval : float, optional
+            Seconds between two scans.
+        """
+        self._roots = roots
+        self._accept = accept
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        """Get the modification time and size of every accepted file.
+
+        Returns
+        -------
+        dict
+            The file paths as keys and tuples containing their modification time and size as
+            values.
+        """
+        snapshot = {}
+
+        for path, recursive in self._roots:
+            stack = [path]
+
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and self._accept(entry.path, True):
+                                stack.append(entry.path)
+                        elif self._accept(entry.path, False):
+                            st = entry.stat()
+                            snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        pass
+
+        return snapshot
+
+    def _read_changes(self):
+        """Scan the watched directories and compare the result with the previous scan.
+
+        Returns
+        -------
+        set
+            The paths of the added, removed and modified files.
+        """
+        snapshot = self._scan()
+        changed = set(self._snapshot.items()) ^ set(snapshot.items())
+        self._snapshot = snapshot
+
+        return set(path for path, _ in changed)
+
+    def wait(self, debounce=DEBOUNCE):
+        """Wait for changes.
+
+        Parameters
+        ----------
+        debounce : float, optional
+            See :any:`InotifyWatcher.wait`.
+
+        Returns
+        -------
+        set
+            The paths of the changed files.
+        """
+        changed = set()
+
+        while not changed:
+            time.sleep(self._interval)
+            changed = self._read_changes()
+
+        while True:
+            time.sleep(debounce)
+            more = self._read_changes()
+
+            if not more:
+                return changed
+
+            changed |= more
+
+    def close(self):
+        """Stop watching.
+        """
+        self._snapshot = {}
+
+
+def new_watcher(roots, accept):
+    """Create a watcher that uses inotify if available or polling otherwise.
+
+    Parameters
+    ----------
+    roots : list
+        See :any:`InotifyWatcher`.
+    accept : function
+        See :any:`InotifyWatcher`.
+
+    Returns
+    -------
+    InotifyWatcher|PollingWatcher
+        The watcher.
+    """
+    try:
+        return InotifyWatcher(roots, accept)
+    except OSError:
+        return PollingWatcher(roots, accept)
+
+
+if __name__ == "__main__":
+    pass
@@ -5,8 +5,6 @@ import os
 import sys
 
 from . import exceptions
-from . import file_utils
-from . import log_system
 from . import shell_utils
 from .docopt import docopt
 
@@ -42,6 +40,9 @@ class CommandLineInterfaceSuper():
         self.logger = None
 
         if not self._inhibit_logger_list or not any(self._inhibit_logger_list):
+            from . import file_utils
+            from . import log_system
+
             log_file = log_system.generate_log_path(storage_dir=logs_storage_dir,
                                                     prefix="CLI")
             file_utils.remove_surplus_files(logs_storage_dir, "CLI*")
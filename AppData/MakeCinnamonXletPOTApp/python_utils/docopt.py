@@ -18,6 +18,8 @@
     It will highlight in bold any text surrounded with double asterisks (e.g. **bold text**). \
     The parsing is done line by line. It should only be used to highlight words inside \
     options/commands descriptions.
+    - Made fixing the pattern linear in the number of its elements. It was quadratic because \
+    of ``list.count()`` and ``list.index()`` calls that compare patterns by their ``repr``.
 
 .. warning::
     Some warnings/workarounds to bypass some known issues with docopt.
@@ -57,6 +59,8 @@
 import re
 import sys
 
+from collections import Counter
+
 
 __all__ = ['docopt']
 __version__ = '0.6.2'
@@ -106,7 +110,11 @@ class Pattern(object):
         """Fix elements that should accumulate/increment values."""
         either = [list(c.children) for c in self.either.children]
         for case in either:
-            for e in [c for c in case if case.count(c) > 1]:
+            # Patterns are compared by their repr, count them once instead of
+            # calling case.count() (quadratic) for each one of them.
+            reprs = [repr(c) for c in case]
+            counts = Counter(reprs)
+            for e in [c for c, r in zip(case, reprs) if counts[r] > 1]:
                 if type(e) is Argument or type(e) is Option and e.argcount:
                     if e.value is None:
                         e.value = []
@@ -126,26 +134,23 @@ class Pattern(object):
         while groups:
             children = groups.pop(0)
             types = [type(c) for c in children]
+            # NOTE: The first child of a type is popped by position instead of
+            # with children.index(), which compares patterns by their repr.
             if Either in types:
-                either = [c for c in children if type(c) is Either][0]
-                children.pop(children.index(either))
+                either = children.pop(types.index(Either))
                 for c in either.children:
                     groups.append([c] + children)
             elif Required in types:
-                required = [c for c in children if type(c) is Required][0]
-                children.pop(children.index(required))
+                required = children.pop(types.index(Required))
                 groups.append(list(required.children) + children)
             elif Optional in types:
-                optional = [c for c in children if type(c) is Optional][0]
-                children.pop(children.index(optional))
+                optional = children.pop(types.index(Optional))
                 groups.append(list(optional.children) + children)
             elif AnyOptions in types:
-                optional = [c for c in children if type(c) is AnyOptions][0]
-                children.pop(children.index(optional))
+                optional = children.pop(types.index(AnyOptions))
                 groups.append(list(optional.children) + children)
             elif OneOrMore in types:
-                oneormore = [c for c in children if type(c) is OneOrMore][0]
-                children.pop(children.index(oneormore))
+                oneormore = children.pop(types.index(OneOrMore))
                 groups.append(list(oneormore.children) * 2 + children)
             else:
                 ret.append(children)
@@ -22,17 +22,22 @@ modify entries, comments or metadata, etc. or create new po files from scratch.
 
 import array
 import codecs
+import collections
 import io
+import itertools
+import mmap
 import os
 import re
 import struct
 import sys
+import tempfile
 import textwrap
 
 __author__ = 'David Jean Louis <izimobil@gmail.com>'
 __version__ = '1.1.0'
-__all__ = ['pofile', 'POFile', 'POEntry', 'mofile', 'MOFile', 'MOEntry',
-           'default_encoding', 'escape', 'unescape', 'detect_encoding', ]
+__all__ = ['pofile', 'iter_entries', 'POFile', 'POEntry', 'mofile', 'MOFile',
+           'MOEntry', 'mmap_mofile', 'MappedMOFile', 'default_encoding',
+           'escape', 'unescape', 'detect_encoding', ]
 
 
 # the default encoding to use when encoding cannot be detected
@@ -54,11 +59,15 @@ def _pofile_or_mofile(f, type, **kwargs):
         enc = detect_encoding(f, type == 'mofile')
 
     # parse the file
-    kls = type == 'pofile' and _POFileParser or _MOFileParser
+    if type == 'pofile':
+        kls = kwargs.get('fast_parser') and _FastPOFileParser or _POFileParser
+    else:
+        kls = _MOFileParser
     parser = kls(
         f,
         encoding=enc,
         check_for_duplicates=kwargs.get('check_for_duplicates', False),
+        indexed=kwargs.get('indexed', False),
         klass=kwargs.get('klass')
     )
     instance = parser.parse()
@@ -104,10 +113,19 @@ def pofile(pofile, **kwargs):
         whether to check for duplicate entries when adding entries to the
         file (optional, default: ``False``).
 
+    ``indexed``
+        whether to keep a msgid index of the entries so that lookups done
+        with :meth:`~polib._BaseFile.find` don't have to scan the whole
+        file (optional, default: ``False``).
+
     ``klass``
         class which is used to instantiate the return value (optional,
         default: ``None``, the return value with be a :class:`~polib.POFile`
         instance).
+
+    ``fast_parser``
+        whether to use a faster parser that produces the very same result
+        (optional, default: ``False``).
     """
     return _pofile_or_mofile(pofile, 'pofile', **kwargs)
 
@@ -135,6 +153,11 @@ def mofile(mofile, **kwargs):
         whether to check for duplicate entries when adding entries to the
         file (optional, default: ``False``).
 
+    ``indexed``
+        whether to keep a msgid index of the entries so that lookups done
+        with :meth:`~polib._BaseFile.find` don't have to scan the whole
+        file (optional, default: ``False``).
+
     ``klass``
         class which is used to instantiate the return value (optional,
         default: ``None``, the return value with be a :class:`~polib.POFile`
@@ -143,6 +166,80 @@ def mofile(mofile, **kwargs):
     return _pofile_or_mofile(mofile, 'mofile', **kwargs)
 
 
+def mmap_mofile(mofile, **kwargs):
+    """
+    Convenience function that maps the mo file ``mofile`` in memory and
+    returns a :class:`~polib.MappedMOFile` instance. Unlike :func:`mofile`,
+    the entries are only read and decoded when they are accessed.
+
+    Arguments:
+
+    ``mofile``
+        string, full or relative path to the mo file.
+
+    ``encoding``
+        string, the encoding to use (e.g. "utf-8") (default: ``None``, the
+        encoding will be read from the file metadata).
+    """
+    return MappedMOFile(mofile, **kwargs)
+
+
+def iter_entries(pofile, **kwargs):
+    """
+    Convenience function that parses the po or pot file ``pofile`` and yields
+    its entries one at a time, as :class:`~polib.POEntry` instances, without
+    building a :class:`~polib.POFile` instance. The file is read in chunks,
+    so the memory used doesn't depend on the size of the file.
+
+    Arguments:
+
+    ``pofile``
+        string, full or relative path to the po/pot file or its content (data).
+
+    ``encoding``
+        string, the encoding to use (e.g. "utf-8") (default: ``None``, the
+        encoding will be auto-detected).
+
+    ``with_metadata``
+        whether to also yield the metadata entry (the entry with an empty
+        msgid), which is skipped by default (optional, default: ``False``).
+
+    ``chunk_size``
+        integer, the number of lines read at once (optional, default:
+        ``1000``).
+    """
+    enc = kwargs.get('encoding')
+    if enc is None:
+        enc = detect_encoding(pofile)
+    parser = _FastPOFileParser(pofile, encoding=enc, klass=_EntryStream)
+    pending = parser.instance.pending
+    with_metadata = kwargs.get('with_metadata', False)
+    chunk_size = kwargs.get('chunk_size', 1000)
+    metadata_found = False
+    lines = iter(parser.fhandle)
+    tokens = []
+    try:
+        while True:
+            chunk = list(itertools.islice(lines, chunk_size))
+            if chunk:
+                tokens = parser._run(chunk, tokens)
+            else:
+                parser._add_last_entry(tokens)
+            while pending:
+                entry = pending.popleft()
+                if not metadata_found and entry.msgid == '' and \
+                        not entry.msgctxt and not entry.obsolete:
+                    metadata_found = True
+                    if not with_metadata:
+                        continue
+                yield entry
+            if not chunk:
+                break
+    finally:
+        if not isinstance(parser.fhandle, list):  # must be file
+            parser.fhandle.close()
+
+
 def detect_encoding(file, binary_mode=False):
     """
     Try to detect the encoding used by the ``file``. The ``file`` argument can
@@ -180,7 +277,7 @@ def detect_encoding(file, binary_mode=False):
         mode = 'rb'
         rx = rxb
         f = open(file, mode)
-        for l in f.readlines():
+        for l in f:
             match = rx.search(l)
             if match:
                 f.close()
@@ -205,23 +302,105 @@ def escape(st):
              .replace('\"', r'\"')
 
 
+_unescaped_quote_re = re.compile(r'([^\\]|^)"')
+_po_keywords = {
+    'msgctxt': 'ct',
+    'msgid': 'mi',
+    'msgstr': 'ms',
+    'msgid_plural': 'mp',
+}
+_po_prev_keywords = {
+    'msgid_plural': 'pp',
+    'msgid': 'pm',
+    'msgctxt': 'pc',
+}
+_po_keyword_re = re.compile(r'(msgctxt|msgid_plural|msgid|msgstr)\s')
+_po_comment_symbols = {':': 'oc', ',': 'fl', '.': 'gc'}
+_unescape_re = re.compile(r'\\(\\|n|t|r|")')
+_unescape_map = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '"': '"'}
+
+
 def unescape(st):
     """
     Unescapes the characters ``\\\\``, ``\\t``, ``\\n``, ``\\r`` and ``"`` in
     the given string ``st`` and returns it.
     """
-    def unescape_repl(m):
-        m = m.group(1)
-        if m == 'n':
-            return '\n'
-        if m == 't':
-            return '\t'
-        if m == 'r':
-            return '\r'
-        if m == '\\':
-            return '\\'
-        return m  # handles escaped double quote
-    return re.sub(r'\\(\\|n|t|r|")', unescape_repl, st)
+    if '\\' not in st:
+        return st
+    return _unescape_re.sub(lambda m: _unescape_map[m.group(1)], st)
+
+
+def _mo_hash_string(st):
+    """
+    Returns the hash of the bytes ``st`` computed as gettext does (the
+    hashpjw function, truncated to 32 bits).
+    """
+    hval = 0
+    for c in bytearray(st):
+        hval = ((hval << 4) + c) & 0xffffffff
+        g = hval & 0xf0000000
+        if g:
+            hval ^= g >> 24
+            hval ^= g
+    return hval
+
+
+def _next_prime(n):
+    """
+    Returns the next prime number starting at ``n`` the way gettext finds
+    it: only odd numbers are tried and 3 is never considered prime.
+    """
+    n |= 1
+    while True:
+        divn, sq = 3, 9
+        while sq < n and n % divn != 0:
+            divn += 1
+            sq += 4 * divn
+            divn += 1
+        if n % divn != 0:
+            return n
+        n += 2
+
+
+def _mo_hash_table(keys):
+    """
+    Returns the hash table of a mo file with the given ``keys`` (the
+    original strings, in the order they are stored in the file) as a list of
+    integers, the same way msgfmt builds it. Each slot holds the index of a
+    key plus one, or 0 if the slot is empty.
+    """
+    size = _next_prime(len(keys) * 4 // 3)
+    if size <= 2:
+        size = 3
+    table = [0] * size
+    for index, key in enumerate(keys):
+        hval = _mo_hash_string(key)
+        idx = hval % size
+        incr = 1 + (hval % (size - 2))
+        while table[idx]:
+            if idx >= size - incr:
+                idx -= size - incr
+            else:
+                idx += incr
+        table[idx] = index + 1
+    return table
+
+
+def _get_umask():
+    """
+    Returns the file mode creation mask of the process.
+    """
+    # Linux exposes it, elsewhere it can only be read by replacing it
+    try:
+        with open('/proc/self/status') as fhandle:
+            for line in fhandle:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (IOError, OSError, ValueError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
 
 
 def natural_sort(lst):
@@ -261,7 +440,16 @@ class _BaseFile(list):
 
         ``check_for_duplicates``
             whether to check for duplicate entries when adding entries to the
-            file, (optional, default: ``False``).
+            file, (optional, default: ``False``). Implies ``indexed``.
+
+        ``indexed``
+            whether to keep a msgid index of the entries to speed up lookups
+            (optional, default: ``False``). The index is kept in sync by all
+            the methods that add or remove entries (:meth:`append`,
+            :meth:`insert`, :meth:`remove`, :meth:`pop`, item and slice
+            assignment and deletion, etc.). If the msgid of an entry is
+            modified after it was added to the file, :meth:`reindex` has to be
+            called.
         """
         list.__init__(self)
         # the opened file handle
@@ -276,6 +464,11 @@ class _BaseFile(list):
         self.encoding = kwargs.get('encoding', default_encoding)
         # whether to check for duplicate entries or not
         self.check_for_duplicates = kwargs.get('check_for_duplicates', False)
+        # whether to keep a msgid -> entries index or not, checking for
+        # duplicates relies on it to not scan the whole file on every addition
+        self.indexed = kwargs.get('indexed', False) or \
+            self.check_for_duplicates
+        self._index = {}
         # header
         self.header = ''
         # both po and mo files have metadata
@@ -286,15 +479,23 @@ class _BaseFile(list):
         """
         Returns the unicode representation of the file.
         """
-        ret = []
-        entries = [self.metadata_as_entry()] + \
-                  [e for e in self if not e.obsolete]
-        for entry in entries:
-            ret.append(entry.__unicode__(self.wrapwidth))
-        for entry in self.obsolete_entries():
-            ret.append(entry.__unicode__(self.wrapwidth))
-        ret = '\n'.join(ret)
-        return ret
+        return ''.join(self.iter_unicode())
+
+    def iter_unicode(self):
+        """
+        Generator that yields the unicode representation of the file in
+        chunks (the metadata and then one chunk per entry, obsolete entries
+        last), so it can be written to a file without building the whole
+        string in memory. Joining the chunks gives :meth:`__unicode__`.
+        """
+        wrapwidth = self.wrapwidth
+        yield self.metadata_as_entry().__unicode__(wrapwidth)
+        for entry in self:
+            if not entry.obsolete:
+                yield '\n' + entry.__unicode__(wrapwidth)
+        for entry in self:
+            if entry.obsolete:
+                yield '\n' + entry.__unicode__(wrapwidth)
 
     def __str__(self):
         return self.__unicode__()
@@ -334,6 +535,25 @@ class _BaseFile(list):
         if getattr(self, 'check_for_duplicates', False) and entry in self:
             raise ValueError('Entry "%s" already exists' % entry.msgid)
         super(_BaseFile, self).append(entry)
+        if getattr(self, 'indexed', False):
+            self._index_add(entry)
+
+    def extend(self, entries):
+        """
+        Overridden method to check for duplicates entries, see
+        :meth:`append`.
+
+        Argument:
+
+        ``entries``
+            an iterable of :class:`~polib._BaseEntry` instances.
+        """
+        for entry in entries:
+            self.append(entry)
+
+    def __iadd__(self, entries):
+        self.extend(entries)
+        return self
 
     def insert(self, index, entry):
         """
@@ -352,6 +572,181 @@ class _BaseFile(list):
         if self.check_for_duplicates and entry in self:
             raise ValueError('Entry "%s" already exists' % entry.msgid)
         super(_BaseFile, self).insert(index, entry)
+        if self.indexed:
+            self._index_add(entry)
+            self._index_sort([entry.msgid])
+
+    def __setitem__(self, index, value):
+        """
+        Overridden method to check for duplicates entries and to keep the
+        msgid index in sync. Entries being replaced are not considered
+        duplicates of the new ones.
+
+        Arguments:
+
+        ``index``
+            an integer or a slice.
+
+        ``value``
+            an instance of :class:`~polib._BaseEntry` or, if ``index`` is a
+            slice, an iterable of them.
+        """
+        if isinstance(index, slice):
+            value = list(value)
+            new_entries, old_entries = value, self[index]
+        else:
+            new_entries, old_entries = [value], [self[index]]
+        if self.indexed:
+            for entry in old_entries:
+                self._index_discard(entry)
+        try:
+            if self.check_for_duplicates:
+                self._check_new_entries(new_entries, old_entries)
+            super(_BaseFile, self).__setitem__(index, value)
+        except Exception:
+            if self.indexed:
+                for entry in old_entries:
+                    self._index_add(entry)
+            raise
+        if self.indexed:
+            for entry in new_entries:
+                self._index_add(entry)
+            self._index_sort([entry.msgid for entry in new_entries])
+
+    def _check_new_entries(self, new_entries, old_entries):
+        """
+        Raises a ``ValueError`` exception if any of ``new_entries`` is a
+        duplicate of an entry of the file (other than the ``old_entries``
+        being replaced) or of another entry of ``new_entries``.
+        """
+        keys = set()
+        for entry in new_entries:
+            found = self.find(entry.msgid, msgctxt=entry.msgctxt)
+            key = (entry.msgctxt, entry.msgid)
+            if (found is not None and
+                    not any(found is e for e in old_entries)) or key in keys:
+                raise ValueError('Entry "%s" already exists' % entry.msgid)
+            if not entry.obsolete:
+                keys.add(key)
+
+    def __delitem__(self, index):
+        """
+        Overridden method to keep the msgid index in sync when the file is
+        indexed.
+
+        Argument:
+
+        ``index``
+            an integer or a slice.
+        """
+        if self.indexed:
+            entries = self[index] if isinstance(index, slice) \
+                else [self[index]]
+            for entry in entries:
+                self._index_discard(entry)
+        super(_BaseFile, self).__delitem__(index)
+
+    def remove(self, entry):
+        """
+        Overridden method to keep the msgid index in sync when the file is
+        indexed.
+
+        Argument:
+
+        ``entry``
+            an instance of :class:`~polib._BaseEntry`.
+        """
+        del self[self.index(entry)]
+
+    def pop(self, index=-1):
+        """
+        Overridden method to keep the msgid index in sync when the file is
+        indexed.
+
+        Argument:
+
+        ``index``
+            index of the entry to remove and return (default: the last one).
+        """
+        entry = super(_BaseFile, self).pop(index)
+        if self.indexed:
+            self._index_discard(entry)
+        return entry
+
+    def clear(self):
+        """
+        Overridden method to also clear the msgid index.
+        """
+        super(_BaseFile, self).clear()
+        self._index = {}
+
+    def __imul__(self, n):
+        super(_BaseFile, self).__imul__(n)
+        self.reindex()
+        return self
+
+    def sort(self, *args, **kwargs):
+        """
+        Overridden method to keep the msgid index in file order.
+        """
+        super(_BaseFile, self).sort(*args, **kwargs)
+        self.reindex()
+
+    def reverse(self):
+        """
+        Overridden method to keep the msgid index in file order.
+        """
+        super(_BaseFile, self).reverse()
+        self.reindex()
+
+    def reindex(self):
+        """
+        Rebuilds the msgid index from scratch. Only needed if the file is
+        indexed and the msgid of an entry was modified after the entry was
+        added to the file.
+        """
+        self._index = {}
+        if self.indexed:
+            for entry in self:
+                self._index_add(entry)
+
+    def _index_add(self, entry):
+        """
+        Adds ``entry`` to the msgid index.
+        """
+        bucket = self._index.get(entry.msgid)
+        if bucket is None:
+            self._index[entry.msgid] = [entry]
+        else:
+            bucket.append(entry)
+
+    def _index_sort(self, msgids):
+        """
+        Puts the entries of the msgid index buckets of ``msgids`` back in
+        file order, so that lookups pick the same entry as a linear scan
+        after entries were added anywhere but at the end of the file.
+        """
+        msgids = set(m for m in msgids if len(self._index.get(m, ())) > 1)
+        if not msgids:
+            return
+        positions = {}
+        for i, e in enumerate(self):
+            if e.msgid in msgids:
+                positions.setdefault(id(e), i)
+        for msgid in msgids:
+            self._index[msgid].sort(key=lambda e: positions[id(e)])
+
+    def _index_discard(self, entry):
+        """
+        Removes ``entry`` (the very same object) from the msgid index.
+        """
+        bucket = self._index.get(entry.msgid, [])
+        for i, e in enumerate(bucket):
+            if e is entry:
+                del bucket[i]
+                break
+        if not bucket:
+            self._index.pop(entry.msgid, None)
 
     def metadata_as_entry(self):
         """
@@ -369,12 +764,18 @@ class _BaseFile(list):
             e.flags.append('fuzzy')
         return e
 
-    def save(self, fpath=None, repr_method='__unicode__'):
+    def save(self, fpath=None, repr_method='__unicode__', fsync=False,
+             hash_table=False):
         """
         Saves the po file to ``fpath``.
         If it is an existing file and no ``fpath`` is provided, then the
         existing file is rewritten with the modified data.
 
+        The entries are written as they are serialized into a temporary file
+        next to ``fpath`` that then replaces it, so the file is never left
+        half written. The mode of an existing file is kept and symbolic links
+        are followed.
+
         Keyword arguments:
 
         ``fpath``
@@ -382,20 +783,70 @@ class _BaseFile(list):
 
         ``repr_method``
             string, the method to use for output.
+
+        ``fsync``
+            whether to flush the file (and its directory) to disk before
+            returning (optional, default: ``False``).
+
+        ``hash_table``
+            whether to include a hash table when saving a mo file, see
+            :meth:`to_binary` (optional, default: ``False``).
         """
         if self.fpath is None and fpath is None:
             raise IOError('You must provide a file path to save() method')
-        contents = getattr(self, repr_method)()
         if fpath is None:
             fpath = self.fpath
         if repr_method == 'to_binary':
-            fhandle = open(fpath, 'wb')
+            chunks = [self.to_binary(hash_table=hash_table)]
+        elif repr_method == '__unicode__':
+            # write the entries as they are serialized
+            chunks = self.iter_unicode()
         else:
-            fhandle = io.open(fpath, 'w', encoding=self.encoding)
+            contents = getattr(self, repr_method)()
             if not isinstance(contents, str):
                 contents = contents.decode(self.encoding)
-        fhandle.write(contents)
-        fhandle.close()
+            chunks = [contents]
+        target = os.path.realpath(fpath)
+        # a unique temporary file, so that concurrent saves of the same file
+        # never write to the same temporary file
+        fd, tmp_fpath = tempfile.mkstemp(
+            dir=os.path.dirname(target), prefix=os.path.basename(target) + '.'
+        )
+        try:
+            try:
+                if repr_method == 'to_binary':
+                    fhandle = io.open(fd, 'wb')
+                else:
+                    fhandle = io.open(fd, 'w', encoding=self.encoding)
+            except Exception:
+                os.close(fd)
+                raise
+            with fhandle:
+                for chunk in chunks:
+                    fhandle.write(chunk)
+                if fsync:
+                    fhandle.flush()
+                    os.fsync(fhandle.fileno())
+            if os.path.exists(target):
+                mode = os.stat(target).st_mode & 0o7777
+            else:
+                # mkstemp() creates files that only their owner can read
+                mode = 0o666 & ~_get_umask()
+            os.chmod(tmp_fpath, mode)
+            os.replace(tmp_fpath, target)
+        except BaseException:
+            try:
+                os.remove(tmp_fpath)
+            except OSError:
+                pass
+            raise
+        if fsync and hasattr(os, 'O_DIRECTORY'):
+            # make the rename itself durable
+            dirfd = os.open(os.path.dirname(target), os.O_RDONLY)
+            try:
+                os.fsync(dirfd)
+            finally:
+                os.close(dirfd)
         # set the file path if not set
         if self.fpath is None and fpath:
             self.fpath = fpath
@@ -421,16 +872,83 @@ class _BaseFile(list):
             string, allows specifying a specific message context for the
             search.
         """
-        if include_obsolete_entries:
-            entries = self[:]
+        if by == 'msgid' and getattr(self, 'indexed', False):
+            entries = self._index.get(st, [])
         else:
-            entries = [e for e in self if not e.obsolete]
+            entries = self
         matches = []
         for e in entries:
+            if e.obsolete and not include_obsolete_entries:
+                continue
             if getattr(e, by) == st:
                 if msgctxt is not False and e.msgctxt != msgctxt:
                     continue
                 matches.append(e)
+        return self._pick_match(matches, msgctxt)
+
+    def find_many(self, sts, by='msgid', include_obsolete_entries=False,
+                  msgctxt=False):
+        """
+        Batch version of :meth:`find`, looks up all the strings of ``sts``
+        with a single walk over the entries (or with the msgid index, if the
+        file is indexed and ``by`` is ``msgid``).
+
+        Returns a dict that maps each string of ``sts`` to the entry that
+        :meth:`find` would have returned for it (``None`` when not found).
+        When ``by`` is ``occurrences`` the strings are file paths and each
+        one is mapped to the list of entries that reference that file, in
+        file order (an empty list when none does).
+
+        Keyword arguments:
+
+        ``sts``
+            iterable of strings, the strings to search for.
+
+        ``by``
+            string, the property to use for comparison, one of ``msgid``,
+            ``msgstr``, ``msgctxt`` or ``occurrences`` (default: ``msgid``).
+
+        ``include_obsolete_entries``
+            boolean, whether to also search in entries that are obsolete.
+
+        ``msgctxt``
+            string, allows specifying a specific message context for the
+            search.
+        """
+        if by not in ('msgid', 'msgstr', 'msgctxt', 'occurrences'):
+            raise ValueError('cannot look up entries by %r' % (by,))
+        matches = dict((st, []) for st in sts)
+        if by == 'msgid' and getattr(self, 'indexed', False):
+            index = self._index
+            candidates = (e for st in matches for e in index.get(st, ()))
+        else:
+            candidates = self
+        for e in candidates:
+            if e.obsolete and not include_obsolete_entries:
+                continue
+            if msgctxt is not False and e.msgctxt != msgctxt:
+                continue
+            if by == 'occurrences':
+                # an entry can reference the same file more than once
+                seen = set()
+                for fpath, _ in e._occurrences or ():
+                    if fpath in matches and fpath not in seen:
+                        seen.add(fpath)
+                        matches[fpath].append(e)
+            else:
+                bucket = matches.get(getattr(e, by))
+                if bucket is not None:
+                    bucket.append(e)
+        if by == 'occurrences':
+            return matches
+        return dict((st, self._pick_match(m, msgctxt))
+                    for st, m in matches.items())
+
+    @staticmethod
+    def _pick_match(matches, msgctxt):
+        """
+        Returns the entry of ``matches`` that :meth:`find` should return.
+        """
         if len(matches) == 1:
             return matches[0]
         elif len(matches) > 1:
@@ -481,53 +999,64 @@ class _BaseFile(list):
             ordered_data.append((data, value))
         return ordered_data
 
-    def to_binary(self):
+    def to_binary(self, hash_table=False):
         """
         Return the binary representation of the file.
+
+        Keyword argument:
+
+        ``hash_table``
+            whether to include the hash table that gettext uses to look up
+            messages, like msgfmt does, instead of doing a binary search
+            (optional, default: ``False``).
         """
-        offsets = []
         entries = self.translated_entries()
-
         # the keys are sorted in the .mo file
-        def cmp(_self, other):
-            # msgfmt compares entries with msgctxt if it exists
-            self_msgid = _self.msgctxt and _self.msgctxt or _self.msgid
-            other_msgid = other.msgctxt and other.msgctxt or other.msgid
-            if self_msgid > other_msgid:
-                return 1
-            elif self_msgid < other_msgid:
-                return -1
-            else:
-                return 0
-        # add metadata entry
         entries.sort(key=lambda o: o.msgid_with_context.encode('utf-8'))
+        # add metadata entry
         mentry = self.metadata_as_entry()
         entries = [mentry] + entries
         entries_len = len(entries)
-        ids, strs = b(''), b('')
+        ids, strs = [], []
+        offsets = []
+        ids_len = strs_len = 0
         for e in entries:
             # For each string, we need size and file offset.  Each string is
             # NUL terminated; the NUL does not count into the size.
-            msgid = b('')
             if e.msgctxt:
                 # Contexts are stored by storing the concatenation of the
                 # context, a <EOT> byte, and the original string
-                msgid = self._encode(e.msgctxt + '\4')
+                msgid = e.msgctxt + '\4' + e.msgid
+            else:
+                msgid = e.msgid
             if e.msgid_plural:
                 msgstr = []
                 for index in sorted(e.msgstr_plural.keys()):
                     msgstr.append(e.msgstr_plural[index])
-                msgid += self._encode(e.msgid + '\0' + e.msgid_plural)
+                msgid = self._encode(msgid + '\0' + e.msgid_plural)
                 msgstr = self._encode('\0'.join(msgstr))
             else:
-                msgid += self._encode(e.msgid)
+                msgid = self._encode(msgid)
                 msgstr = self._encode(e.msgstr)
-            offsets.append((len(ids), len(msgid), len(strs), len(msgstr)))
-            ids += msgid + b('\0')
-            strs += msgstr + b('\0')
-
-        # The header is 7 32-bit unsigned integers.
-        keystart = 7 * 4 + 16 * entries_len
+            offsets.append((ids_len, len(msgid), strs_len, len(msgstr)))
+            ids.append(msgid)
+            strs.append(msgstr)
+            ids_len += len(msgid) + 1
+            strs_len += len(msgstr) + 1
+        if hash_table:
+            # only the msgid (with its context) is hashed, not msgid_plural
+            hash_tab = _mo_hash_table([i.split(b('\0'), 1)[0] for i in ids])
+        else:
+            hash_tab = []
+        # the strings are joined once, the NUL terminators included
+        ids.append(b(''))
+        strs.append(b(''))
+        ids = b('\0').join(ids)
+        strs = b('\0').join(strs)
+        # The header is 7 32-bit unsigned integers, followed by the tables of
+        # keys and values (8 bytes per entry each) and the hash table.
+        hashstart = 7 * 4 + 16 * entries_len
+        keystart = hashstart + 4 * len(hash_tab)
         # and the values start after the keys
         valuestart = keystart + len(ids)
         koffsets = []
@@ -551,14 +1080,11 @@ class _BaseFile(list):
             7 * 4,
             # start of value index
             7 * 4 + entries_len * 8,
-            # size and offset of hash table, we don't use hash tables
-            0, keystart
-
+            # size and offset of hash table
+            len(hash_tab), hashstart
         )
-        output += array.array("i", offsets).tobytes()
-        output += ids
-        output += strs
-        return output
+        return b('').join([output, array.array("i", offsets).tobytes(),
+                           array.array("I", hash_tab).tobytes(), ids, strs])
 
     def _encode(self, mixed):
         """
@@ -577,9 +1103,10 @@ class POFile(_BaseFile):
     the python ``list`` type.
     """
 
-    def __unicode__(self):
+    def iter_unicode(self):
         """
-        Returns the unicode representation of the po file.
+        Generator that yields the unicode representation of the po file in
+        chunks, see :meth:`~polib._BaseFile.iter_unicode`.
         """
         ret, headers = '', self.header.split('\n')
         for header in headers:
@@ -593,18 +1120,29 @@ class POFile(_BaseFile):
         if not isinstance(ret, str):
             ret = ret.decode(self.encoding)
 
-        return ret + _BaseFile.__unicode__(self)
+        yield ret
+        for chunk in _BaseFile.iter_unicode(self):
+            yield chunk
 
-    def save_as_mofile(self, fpath):
+    def save_as_mofile(self, fpath, fsync=False, hash_table=False):
         """
         Saves the binary representation of the file to given ``fpath``.
 
-        Keyword argument:
+        Keyword arguments:
 
         ``fpath``
             string, full or relative path to the mo file.
+
+        ``fsync``
+            whether to flush the file to disk before returning, see
+            :meth:`~polib._BaseFile.save` (optional, default: ``False``).
+
+        ``hash_table``
+            whether to include the hash table gettext uses to look up
+            messages, see :meth:`~polib._BaseFile.to_binary` (optional,
+            default: ``False``).
         """
-        _BaseFile.save(self, fpath, 'to_binary')
+        _BaseFile.save(self, fpath, 'to_binary', fsync, hash_table)
 
     def percent_translated(self):
         """
@@ -653,27 +1191,54 @@ class POFile(_BaseFile):
           dot comments and file positions will be preserved;
         * the fuzzy flags are preserved.
 
+        Each catalog is only walked once, entries of this file that are not
+        in the pot file anymore are found by elimination.
+
         Keyword argument:
 
         ``refpot``
             object POFile, the reference catalog.
+
+        Returns a dict with the number of entries that were ``added`` (new in
+        the pot file), ``updated`` (already in this file) and ``obsoleted``
+        (not in the pot file anymore).
         """
-        # Store entries in dict/set for faster access
-        self_entries = dict(
-            (entry.msgid_with_context, entry) for entry in self
-        )
-        refpot_msgids = set(entry.msgid_with_context for entry in refpot)
+        # Store entries in a dict for faster access, the entries that share
+        # a msgid with a later entry are only obsoleted if needed
+        self_entries = {}
+        shadowed = []
+        for entry in self:
+            key = entry.msgid_with_context
+            if key in self_entries:
+                shadowed.append(self_entries[key])
+            self_entries[key] = entry
+        # the entries that aren't found in the refpot are left in here
+        pending = dict(self_entries)
+        added = []
+        updated = 0
         # Merge entries that are in the refpot
         for entry in refpot:
-            e = self_entries.get(entry.msgid_with_context)
+            key = entry.msgid_with_context
+            e = self_entries.get(key)
             if e is None:
+                # merge before adding so that the entry is added (and
+                # indexed) with its final msgid
                 e = POEntry()
-                self.append(e)
-            e.merge(entry)
+                e.merge(entry)
+                added.append(e)
+            else:
+                e.merge(entry)
+                if pending.pop(key, None) is not None:
+                    updated += 1
+        self.extend(added)
         # ok, now we must "obsolete" entries that are not in the refpot anymore
-        for entry in self:
-            if entry.msgid_with_context not in refpot_msgids:
+        obsoleted = 0
+        for entry in itertools.chain(pending.values(), shadowed):
+            if entry.msgid_with_context in pending and not entry.obsolete:
                 entry.obsolete = True
+                obsoleted += 1
+        return {'added': len(added), 'updated': updated,
+                'obsoleted': obsoleted}
 
 
 class MOFile(_BaseFile):
@@ -694,27 +1259,40 @@ class MOFile(_BaseFile):
         self.magic_number = None
         self.version = 0
 
-    def save_as_pofile(self, fpath):
+    def save_as_pofile(self, fpath, fsync=False):
         """
         Saves the mofile as a pofile to ``fpath``.
 
-        Keyword argument:
+        Keyword arguments:
 
         ``fpath``
             string, full or relative path to the file.
+
+        ``fsync``
+            whether to flush the file to disk before returning, see
+            :meth:`~polib._BaseFile.save` (optional, default: ``False``).
         """
-        _BaseFile.save(self, fpath)
+        _BaseFile.save(self, fpath, fsync=fsync)
 
-    def save(self, fpath=None):
+    def save(self, fpath=None, fsync=False, hash_table=False):
         """
         Saves the mofile to ``fpath``.
 
-        Keyword argument:
+        Keyword arguments:
 
         ``fpath``
             string, full or relative path to the file.
+
+        ``fsync``
+            whether to flush the file to disk before returning, see
+            :meth:`~polib._BaseFile.save` (optional, default: ``False``).
+
+        ``hash_table``
+            whether to include the hash table gettext uses to look up
+            messages, see :meth:`~polib._BaseFile.to_binary` (optional,
+            default: ``False``).
         """
-        _BaseFile.save(self, fpath, 'to_binary')
+        _BaseFile.save(self, fpath, 'to_binary', fsync, hash_table)
 
     def percent_translated(self):
         """
@@ -747,12 +1325,268 @@ class MOFile(_BaseFile):
         return []
 
 
+def _lazy_container(slot, factory):
+    """
+    Returns a property that stores its value in the ``slot`` attribute and
+    creates it with ``factory`` the first time it is accessed, so entries
+    that never use the container don't pay for it.
+    """
+    def getter(self):
+        value = getattr(self, slot)
+        if value is None:
+            value = factory()
+            setattr(self, slot, value)
+        return value
+
+    def setter(self, value):
+        setattr(self, slot, value)
+
+    return property(getter, setter)
+
+
+class MappedMOFile(object):
+    """
+    Read-only mo file backed by a memory map of the file. Entries are decoded
+    on access and messages are looked up with the hash table of the file if
+    it has one (or with a binary search otherwise), so checking a few
+    messages doesn't require loading the whole file.
+    """
+
+    def __init__(self, mofile, encoding=None):
+        """
+        Constructor, see :func:`~polib.mmap_mofile`.
+        """
+        self.fpath = mofile
+        self._mmap = None
+        with open(mofile, 'rb') as fhandle:
+            try:
+                self._mmap = mmap.mmap(fhandle.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise IOError('Invalid mo file, magic number is incorrect !')
+        mm = self._mmap
+        try:
+            magic_number = struct.unpack_from('<I', mm)[0]
+            if magic_number == MOFile.MAGIC:
+                order = '<'
+            elif magic_number == MOFile.MAGIC_SWAPPED:
+                order = '>'
+            else:
+                raise IOError('Invalid mo file, magic number is incorrect !')
+            (self.version, self._len, self._ids_offset, self._strs_offset,
+             self._hash_size, self._hash_offset) = \
+                struct.unpack_from(order + '6I', mm, 4)
+        except struct.error:
+            self.close()
+            raise IOError('Invalid mo file, the file is truncated')
+        if self.version >> 16 not in (0, 1):
+            self.close()
+            raise IOError('Invalid mo file, unexpected major revision number')
+        if max(self._ids_offset, self._strs_offset) + 8 * self._len > \
+                len(mm) or self._hash_offset + 4 * self._hash_size > len(mm):
+            self.close()
+            raise IOError('Invalid mo file, the file is truncated')
+        self.magic_number = magic_number
+        self._ii = order + 'II'
+        self._hash_fmt = order + 'I'
+        self._has_metadata = self._len > 0 and self._string(0) == b('')
+        self._metadata = None
+        self.encoding = encoding
+        if self.encoding is None:
+            self.encoding = default_encoding
+            if self._has_metadata:
+                match = re.search(b(r'charset=([\w_\-:\.]+)'),
+                                  self._string(0, self._strs_offset))
+                if match:
+                    charset = match.group(1).decode('ascii')
+                    try:
+                        codecs.lookup(charset)
+                        self.encoding = charset
+                    except LookupError:
+                        pass
+
+    def __del__(self):
+        """
+        Make sure the file is unmapped.
+        """
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Unmaps the file, the instance can't be used anymore.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _string(self, index, table=None):
+        """
+        Returns the key (or the value if ``table`` is the offset of the values
+        table) at ``index`` as bytes.
+        """
+        if table is None:
+            table = self._ids_offset
+        length, offset = self._string_location(index, table)
+        return self._mmap[offset:offset + length]
+
+    def _string_location(self, index, table):
+        """
+        Returns the length and the offset of the string at ``index`` in the
+        given table, checking that the string is inside the file.
+        """
+        length, offset = struct.unpack_from(self._ii, self._mmap,
+                                            table + 8 * index)
+        if offset + length > len(self._mmap):
+            raise IOError('Invalid mo file, the file is truncated')
+        return length, offset
+
+    def _key_matches(self, index, key):
+        """
+        Whether the key at ``index`` (up to its msgid_plural) is ``key``.
+        """
+        length, offset = self._string_location(index, self._ids_offset)
+        if length < len(key) or \
+                self._mmap[offset:offset + len(key)] != key:
+            return False
+        return length == len(key) or self._mmap[offset + len(key)] == 0
+
+    def _lookup(self, key):
+        """
+        Returns the index of the entry whose key is the bytes ``key`` or
+        ``None`` if there's no such entry.
+        """
+        if self._hash_size > 2:
+            # same lookup done by gettext
+            hval = _mo_hash_string(key)
+            size = self._hash_size
+            idx = hval % size
+            incr = 1 + (hval % (size - 2))
+            # a valid table always has an empty slot, a corrupt one could
+            # make the probing loop forever
+            for _ in range(size):
+                index = struct.unpack_from(self._hash_fmt, self._mmap,
+                                           self._hash_offset + 4 * idx)[0]
+                if index == 0:
+                    return None
+                index -= 1
+                # indexes beyond the table are system dependent strings
+                if index < self._len and self._key_matches(index, key):
+                    return index
+                if idx >= size - incr:
+                    idx -= size - incr
+                else:
+                    idx += incr
+            raise IOError('Invalid mo file, the hash table is corrupt')
+        # no hash table, the keys are sorted
+        low, high = 0, self._len
+        while low < high:
+            middle = (low + high) // 2
+            current = self._string(middle).split(b('\0'), 1)[0]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _entry(self, index):
+        return _build_mo_entry(self._string(index),
+                               self._string(index, self._strs_offset),
+                               self.encoding)
+
+    def __len__(self):
+        """
+        Returns the number of entries, the metadata excluded.
+        """
+        return self._len - self._has_metadata
+
+    def __iter__(self):
+        """
+        Yields the entries of the file as :class:`~polib.MOEntry` instances,
+        the metadata excluded.
+        """
+        for index in range(int(self._has_metadata), self._len):
+            yield self._entry(index)
+
+    @property
+    def metadata(self):
+        """
+        The metadata of the file as a dict.
+        """
+        if self._metadata is None:
+            self._metadata = {}
+            if self._has_metadata:
+                self._metadata = _parse_mo_metadata(
+                    self._string(0, self._strs_offset), self.encoding)
+        return self._metadata
+
+    def _find_index(self, msgid, msgctxt):
+        """
+        Returns the index of the entry with the given ``msgid`` and
+        ``msgctxt``, ``None`` if there's no such entry.
+        """
+        if msgctxt:
+            msgid = msgctxt + '\x04' + msgid
+        try:
+            key = msgid.encode(self.encoding)
+        except UnicodeEncodeError:
+            # can't be in the file
+            return None
+        index = self._lookup(key)
+        if index == 0 and self._has_metadata:
+            return None
+        return index
+
+    def find(self, msgid, msgctxt=None):
+        """
+        Returns the :class:`~polib.MOEntry` with the given ``msgid`` (and
+        ``msgctxt``) or ``None`` if there's no such entry.
+        """
+        index = self._find_index(msgid, msgctxt)
+        if index is None:
+            return None
+        return self._entry(index)
+
+    def gettext(self, msgid, msgctxt=None):
+        """
+        Returns the translation of ``msgid`` (with context ``msgctxt`` if
+        given), or ``msgid`` itself if it isn't translated, like gettext.
+        Only the translated string is decoded. For plural entries, the first
+        plural form is returned.
+        """
+        index = self._find_index(msgid, msgctxt)
+        if index is None:
+            return msgid
+        msgstr = self._string(index, self._strs_offset)
+        return msgstr.split(b('\0'), 1)[0].decode(self.encoding)
+
+
 class _BaseEntry(object):
     """
     Base class for :class:`~polib.POEntry` and :class:`~polib.MOEntry` classes.
     This class should **not** be instantiated directly.
+
+    Entries use ``__slots__`` to keep memory low when loading big catalogs,
+    and the ``msgstr_plural``, ``occurrences`` and ``flags`` containers are
+    only created when they are first accessed.
     """
 
+    __slots__ = ('msgid', 'msgstr', 'msgid_plural', '_msgstr_plural',
+                 'msgctxt', 'obsolete', 'encoding', 'comment', 'tcomment',
+                 '_occurrences', '_flags', 'previous_msgctxt',
+                 'previous_msgid', 'previous_msgid_plural')
+
+    msgstr_plural = _lazy_container('_msgstr_plural', dict)
+    occurrences = _lazy_container('_occurrences', list)
+    flags = _lazy_container('_flags', list)
+
     def __init__(self, *args, **kwargs):
         """
         Constructor, accepts the following keyword arguments:
@@ -782,11 +1616,34 @@ class _BaseEntry(object):
         self.msgid = kwargs.get('msgid', '')
         self.msgstr = kwargs.get('msgstr', '')
         self.msgid_plural = kwargs.get('msgid_plural', '')
-        self.msgstr_plural = kwargs.get('msgstr_plural', {})
+        self._msgstr_plural = kwargs.get('msgstr_plural')
         self.msgctxt = kwargs.get('msgctxt', None)
         self.obsolete = kwargs.get('obsolete', False)
         self.encoding = kwargs.get('encoding', default_encoding)
 
+    def __getstate__(self):
+        """
+        Returns the entry attributes, used by pickle and copy since the
+        entry has no ``__dict__`` (unless it's a subclass without
+        ``__slots__``).
+        """
+        state = dict(getattr(self, '__dict__', {}))
+        for klass in type(self).__mro__:
+            for slot in getattr(klass, '__slots__', ()):
+                try:
+                    state[slot] = getattr(self, slot)
+                except AttributeError:
+                    pass
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the attributes returned by :meth:`__getstate__`. Entries
+        pickled before ``__slots__`` were used are also supported.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __unicode__(self, wrapwidth=78):
         """
         Returns the unicode representation of the entry.
@@ -806,9 +1663,9 @@ class _BaseEntry(object):
         if self.msgid_plural:
             ret += self._str_field("msgid_plural", delflag, "",
                                    self.msgid_plural, wrapwidth)
-        if self.msgstr_plural:
+        if self._msgstr_plural:
             # write the msgstr_plural if any
-            msgstrs = self.msgstr_plural
+            msgstrs = self._msgstr_plural
             keys = sorted(msgstrs)
             for index in keys:
                 msgstr = msgstrs[index]
@@ -829,40 +1686,46 @@ class _BaseEntry(object):
     def __eq__(self, other):
         return str(self) == str(other)
 
+    @property
+    def msgid_with_context(self):
+        if self.msgctxt:
+            return '%s%s%s' % (self.msgctxt, "\x04", self.msgid)
+        return self.msgid
+
     def _str_field(self, fieldname, delflag, plural_index, field,
                    wrapwidth=78):
+        # every line is escaped once, the lines below are already escaped
         lines = field.splitlines(True)
         if len(lines) > 1:
-            lines = [''] + lines  # start with initial empty line
+            # start with initial empty line
+            lines = [''] + [escape(line) for line in lines]
         else:
             escaped_field = escape(field)
-            specialchars_count = 0
-            for c in ['\\', '\n', '\r', '\t', '"']:
-                specialchars_count += field.count(c)
+            # every escaped special char takes one more char
+            specialchars_count = len(escaped_field) - len(field)
             # comparison must take into account fieldname length + one space
             # + 2 quotes (eg. msgid "<string>")
-            flength = len(fieldname) + 3
-            if plural_index:
-                flength += len(plural_index)
+            flength = len(fieldname) + 3 + len(plural_index)
             real_wrapwidth = wrapwidth - flength + specialchars_count
             if wrapwidth > 0 and len(field) > real_wrapwidth:
-                # Wrap the line but take field name into account
-                lines = [''] + [unescape(item) for item in wrap(
+                # Wrap the line but take field name into account. Lines are
+                # only broken at whitespace and hyphens, never inside an
+                # escape sequence
+                lines = [''] + wrap(
                     escaped_field,
                     wrapwidth - 2,  # 2 for quotes ""
                     drop_whitespace=False,
                     break_long_words=False
-                )]
+                )
             else:
-                lines = [field]
+                lines = [escaped_field]
         if fieldname.startswith('previous_'):
             # quick and dirty trick to get the real field name
             fieldname = fieldname[9:]
 
-        ret = ['%s%s%s "%s"' % (delflag, fieldname, plural_index,
-                                escape(lines.pop(0)))]
-        for line in lines:
-            ret.append('%s"%s"' % (delflag, escape(line)))
+        ret = ['%s%s%s "%s"' % (delflag, fieldname, plural_index, lines[0])]
+        for line in lines[1:]:
+            ret.append('%s"%s"' % (delflag, line))
         return ret
 
 
@@ -871,6 +1734,8 @@ class POEntry(_BaseEntry):
     Represents a po file entry.
     """
 
+    __slots__ = ('linenum',)
+
     def __init__(self, *args, **kwargs):
         """
         Constructor, accepts the following keyword arguments:
@@ -902,8 +1767,8 @@ class POEntry(_BaseEntry):
         _BaseEntry.__init__(self, *args, **kwargs)
         self.comment = kwargs.get('comment', '')
         self.tcomment = kwargs.get('tcomment', '')
-        self.occurrences = kwargs.get('occurrences', [])
-        self.flags = kwargs.get('flags', [])
+        self._occurrences = kwargs.get('occurrences')
+        self._flags = kwargs.get('flags')
         self.previous_msgctxt = kwargs.get('previous_msgctxt', None)
         self.previous_msgid = kwargs.get('previous_msgid', None)
         self.previous_msgid_plural = kwargs.get('previous_msgid_plural', None)
@@ -935,9 +1800,9 @@ class POEntry(_BaseEntry):
                         ret.append('%s%s' % (c[1], comment))
 
         # occurrences (with text wrapping as xgettext does)
-        if not self.obsolete and self.occurrences:
+        if not self.obsolete and self._occurrences:
             filelist = []
-            for fpath, lineno in self.occurrences:
+            for fpath, lineno in self._occurrences:
                 if lineno:
                     filelist.append('%s:%s' % (fpath, lineno))
                 else:
@@ -959,8 +1824,8 @@ class POEntry(_BaseEntry):
                 ret.append('#: ' + filestr)
 
         # flags (TODO: wrapping ?)
-        if self.flags:
-            ret.append('#, %s' % ', '.join(self.flags))
+        if self._flags:
+            ret.append('#, %s' % ', '.join(self._flags))
 
         # previous context and previous msgid/msgid_plural
         fields = ['previous_msgctxt', 'previous_msgid',
@@ -989,8 +1854,8 @@ class POEntry(_BaseEntry):
             else:
                 return 1
         # Work on a copy to protect original
-        occ1 = sorted(self.occurrences[:])
-        occ2 = sorted(other.occurrences[:])
+        occ1 = sorted(self._occurrences or [])
+        occ2 = sorted(other._occurrences or [])
 
         if occ1 > occ2:
             return 1
@@ -1018,8 +1883,8 @@ class POEntry(_BaseEntry):
         # FIXME 2:
         # Same situation as in FIXME 1.
         # Compare msgstr_plural
-        msgstr_plural = self.msgstr_plural or 0
-        othermsgstr_plural = other.msgstr_plural or 0
+        msgstr_plural = self._msgstr_plural or 0
+        othermsgstr_plural = other._msgstr_plural or 0
         if msgstr_plural > othermsgstr_plural:
             return 1
         elif msgstr_plural < othermsgstr_plural:
@@ -1064,9 +1929,9 @@ class POEntry(_BaseEntry):
             return False
         if self.msgstr != '':
             return True
-        if self.msgstr_plural:
-            for pos in self.msgstr_plural:
-                if self.msgstr_plural[pos] == '':
+        if self._msgstr_plural:
+            for pos in self._msgstr_plural:
+                if self._msgstr_plural[pos] == '':
                     return False
             return True
         return False
@@ -1077,34 +1942,27 @@ class POEntry(_BaseEntry):
         """
         self.msgid = other.msgid
         self.msgctxt = other.msgctxt
-        self.occurrences = other.occurrences
+        self._occurrences = other.occurrences
         self.comment = other.comment
         fuzzy = self.fuzzy
-        self.flags = other.flags[:]  # clone flags
+        flags = other._flags[:] if other._flags else []  # clone flags
         if fuzzy:
-            self.flags.append('fuzzy')
+            flags.append('fuzzy')
+        self._flags = flags or None
         self.msgid_plural = other.msgid_plural
         self.obsolete = other.obsolete
         self.previous_msgctxt = other.previous_msgctxt
         self.previous_msgid = other.previous_msgid
         self.previous_msgid_plural = other.previous_msgid_plural
-        if other.msgstr_plural:
-            for pos in other.msgstr_plural:
-                try:
-                    # keep existing translation at pos if any
-                    self.msgstr_plural[pos]
-                except KeyError:
-                    self.msgstr_plural[pos] = ''
+        if other._msgstr_plural:
+            msgstr_plural = self.msgstr_plural
+            for pos in other._msgstr_plural:
+                # keep existing translation at pos if any
+                msgstr_plural.setdefault(pos, '')
 
     @property
     def fuzzy(self):
-        return 'fuzzy' in self.flags
-
-    @property
-    def msgid_with_context(self):
-        if self.msgctxt:
-            return '%s%s%s' % (self.msgctxt, "\x04", self.msgid)
-        return self.msgid
+        return self._flags is not None and 'fuzzy' in self._flags
 
     def __hash__(self):
         return hash((self.msgid, self.msgstr))
@@ -1115,6 +1973,8 @@ class MOEntry(_BaseEntry):
     Represents a mo file entry.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         """
         Constructor, accepts the following keyword arguments,
@@ -1135,8 +1995,8 @@ class MOEntry(_BaseEntry):
         _BaseEntry.__init__(self, *args, **kwargs)
         self.comment = ''
         self.tcomment = ''
-        self.occurrences = []
-        self.flags = []
+        self._occurrences = None
+        self._flags = None
         self.previous_msgctxt = None
         self.previous_msgid = None
         self.previous_msgid_plural = None
@@ -1145,6 +2005,29 @@ class MOEntry(_BaseEntry):
         return hash((self.msgid, self.msgstr))
 
 
+class _EntryStream(object):
+    """
+    Minimal stand-in for :class:`~polib.POFile` used by :func:`iter_entries`.
+    The parser appends the entries to a queue from which they are yielded.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Constructor, accepts the same keyword arguments as
+        :class:`~polib._BaseFile` (only ``pofile`` is used).
+        """
+        pofile = kwargs.get('pofile', None)
+        self.fpath = pofile if pofile and _is_file(pofile) else None
+        self.header = ''
+        self.pending = collections.deque()
+
+    def append(self, entry):
+        """
+        Queue ``entry`` to be yielded.
+        """
+        self.pending.append(entry)
+
+
 class _POFileParser(object):
     """
     A finite state machine to parse efficiently and correctly po
@@ -1167,6 +2050,10 @@ class _POFileParser(object):
         ``check_for_duplicates``
             whether to check for duplicate entries when adding entries to the
             file (optional, default: ``False``).
+
+        ``indexed``
+            whether the returned instance should keep a msgid index of its
+            entries (optional, default: ``False``).
         """
         enc = kwargs.get('encoding', default_encoding)
         if _is_file(pofile):
@@ -1184,7 +2071,8 @@ class _POFileParser(object):
         self.instance = klass(
             pofile=pofile,
             encoding=enc,
-            check_for_duplicates=kwargs.get('check_for_duplicates', False)
+            check_for_duplicates=kwargs.get('check_for_duplicates', False),
+            indexed=kwargs.get('indexed', False)
         )
         self.transitions = {}
         self.current_line = 0
@@ -1237,18 +2125,6 @@ class _POFileParser(object):
         Run the state machine, parse the file line by line and call process()
         with the current matched symbol.
         """
-
-        keywords = {
-            'msgctxt': 'ct',
-            'msgid': 'mi',
-            'msgstr': 'ms',
-            'msgid_plural': 'mp',
-        }
-        prev_keywords = {
-            'msgid_plural': 'pp',
-            'msgid': 'pm',
-            'msgctxt': 'pc',
-        }
         tokens = []
         fpath = '%s ' % self.instance.fpath if self.instance.fpath else ''
         for line in self.fhandle:
@@ -1256,109 +2132,124 @@ class _POFileParser(object):
             line = line.strip()
             if line == '':
                 continue
+            tokens = self._parse_line(line, fpath)
 
-            tokens = line.split(None, 2)
-            nb_tokens = len(tokens)
+        return self._finish(tokens)
 
-            if tokens[0] == '#~|':
-                continue
+    def _parse_line(self, line, fpath):
+        """
+        Parse a single (stripped and non empty) line and call process() with
+        the matched symbol. Returns the tokens of the line.
+        """
+        tokens = line.split(None, 2)
+        nb_tokens = len(tokens)
 
-            if tokens[0] == '#~' and nb_tokens > 1:
-                line = line[3:].strip()
-                tokens = tokens[1:]
-                nb_tokens -= 1
-                self.entry_obsolete = 1
-            else:
-                self.entry_obsolete = 0
+        if tokens[0] == '#~|':
+            return tokens
 
-            # Take care of keywords like
-            # msgid, msgid_plural, msgctxt & msgstr.
-            if tokens[0] in keywords and nb_tokens > 1:
-                line = line[len(tokens[0]):].lstrip()
-                if re.search(r'([^\\]|^)"', line[1:-1]):
-                    raise IOError('Syntax error in po file %s(line %s): '
-                                  'unescaped double quote found' %
-                                  (fpath, self.current_line))
-                self.current_token = line
-                self.process(keywords[tokens[0]])
-                continue
+        if tokens[0] == '#~' and nb_tokens > 1:
+            line = line[3:].strip()
+            tokens = tokens[1:]
+            nb_tokens -= 1
+            self.entry_obsolete = 1
+        else:
+            self.entry_obsolete = 0
+
+        # Take care of keywords like
+        # msgid, msgid_plural, msgctxt & msgstr.
+        if tokens[0] in _po_keywords and nb_tokens > 1:
+            line = line[len(tokens[0]):].lstrip()
+            if _unescaped_quote_re.search(line[1:-1]):
+                raise IOError('Syntax error in po file %s(line %s): '
+                              'unescaped double quote found' %
+                              (fpath, self.current_line))
+            self.current_token = line
+            self.process(_po_keywords[tokens[0]])
+            return tokens
+
+        self.current_token = line
+
+        if tokens[0] == '#:':
+            if nb_tokens <= 1:
+                return tokens
+            # we are on a occurrences line
+            self.process('oc')
+
+        elif line[:1] == '"':
+            # we are on a continuation line
+            if _unescaped_quote_re.search(line[1:-1]):
+                raise IOError('Syntax error in po file %s(line %s): '
+                              'unescaped double quote found' %
+                              (fpath, self.current_line))
+            self.process('mc')
+
+        elif line[:7] == 'msgstr[':
+            # we are on a msgstr plural
+            self.process('mx')
+
+        elif tokens[0] == '#,':
+            if nb_tokens <= 1:
+                return tokens
+            # we are on a flags line
+            self.process('fl')
+
+        elif tokens[0] == '#' or tokens[0].startswith('##'):
+            if line == '#':
+                line += ' '
+            # we are on a translator comment line
+            self.process('tc')
+
+        elif tokens[0] == '#.':
+            if nb_tokens <= 1:
+                return tokens
+            # we are on a generated comment line
+            self.process('gc')
+
+        elif tokens[0] == '#|':
+            if nb_tokens <= 1:
+                raise IOError('Syntax error in po file %s(line %s)' %
+                              (fpath, self.current_line))
 
+            # Remove the marker and any whitespace right after that.
+            line = line[2:].lstrip()
             self.current_token = line
 
-            if tokens[0] == '#:':
-                if nb_tokens <= 1:
-                    continue
-                # we are on a occurrences line
-                self.process('oc')
-
-            elif line[:1] == '"':
-                # we are on a continuation line
-                if re.search(r'([^\\]|^)"', line[1:-1]):
-                    raise IOError('Syntax error in po file %s(line %s): '
-                                  'unescaped double quote found' %
-                                  (fpath, self.current_line))
+            if tokens[1].startswith('"'):
+                # Continuation of previous metadata.
                 self.process('mc')
+                return tokens
 
-            elif line[:7] == 'msgstr[':
-                # we are on a msgstr plural
-                self.process('mx')
-
-            elif tokens[0] == '#,':
-                if nb_tokens <= 1:
-                    continue
-                # we are on a flags line
-                self.process('fl')
-
-            elif tokens[0] == '#' or tokens[0].startswith('##'):
-                if line == '#':
-                    line += ' '
-                # we are on a translator comment line
-                self.process('tc')
-
-            elif tokens[0] == '#.':
-                if nb_tokens <= 1:
-                    continue
-                # we are on a generated comment line
-                self.process('gc')
-
-            elif tokens[0] == '#|':
-                if nb_tokens <= 1:
-                    raise IOError('Syntax error in po file %s(line %s)' %
-                                  (fpath, self.current_line))
-
-                # Remove the marker and any whitespace right after that.
-                line = line[2:].lstrip()
-                self.current_token = line
+            if nb_tokens == 2:
+                # Invalid continuation line.
+                raise IOError('Syntax error in po file %s(line %s): '
+                              'invalid continuation line' %
+                              (fpath, self.current_line))
 
-                if tokens[1].startswith('"'):
-                    # Continuation of previous metadata.
-                    self.process('mc')
-                    continue
+            # we are on a "previous translation" comment line,
+            if tokens[1] not in _po_prev_keywords:
+                # Unknown keyword in previous translation comment.
+                raise IOError('Syntax error in po file %s(line %s): '
+                              'unknown keyword %s' %
+                              (fpath, self.current_line,
+                               tokens[1]))
+
+            # Remove the keyword and any whitespace
+            # between it and the starting quote.
+            line = line[len(tokens[1]):].lstrip()
+            self.current_token = line
+            self.process(_po_prev_keywords[tokens[1]])
 
-                if nb_tokens == 2:
-                    # Invalid continuation line.
-                    raise IOError('Syntax error in po file %s(line %s): '
-                                  'invalid continuation line' %
-                                  (fpath, self.current_line))
-
-                # we are on a "previous translation" comment line,
-                if tokens[1] not in prev_keywords:
-                    # Unknown keyword in previous translation comment.
-                    raise IOError('Syntax error in po file %s(line %s): '
-                                  'unknown keyword %s' %
-                                  (fpath, self.current_line,
-                                   tokens[1]))
-
-                # Remove the keyword and any whitespace
-                # between it and the starting quote.
-                line = line[len(tokens[1]):].lstrip()
-                self.current_token = line
-                self.process(prev_keywords[tokens[1]])
+        else:
+            raise IOError('Syntax error in po file %s(line %s)' %
+                          (fpath, self.current_line))
 
-            else:
-                raise IOError('Syntax error in po file %s(line %s)' %
-                              (fpath, self.current_line))
+        return tokens
 
+    def _add_last_entry(self, tokens):
+        """
+        Add the entry being parsed when the end of the file is reached.
+        ``tokens`` are the tokens of the last non empty line.
+        """
         if self.current_entry and len(tokens) > 0 and \
            not tokens[0].startswith('#'):
             # since entries are added when another entry is found, we must add
@@ -1366,6 +2257,14 @@ class _POFileParser(object):
             # are ignored
             self.instance.append(self.current_entry)
 
+    def _finish(self, tokens):
+        """
+        Add the last entry, extract the metadata, close the file and return
+        the parsed instance. ``tokens`` are the tokens of the last non empty
+        line.
+        """
+        self._add_last_entry(tokens)
+
         # before returning the instance, check if there's metadata and if
         # so extract it in a dict
         metadataentry = self.instance.find('')
@@ -1570,6 +2469,140 @@ class _POFileParser(object):
         return False
 
 
+class _FastPOFileParser(_POFileParser):
+    """
+    A faster version of :class:`~polib._POFileParser` that produces the very
+    same result. The most common lines are dispatched by their first
+    characters and the state transitions are looked up directly instead of
+    going through process(). Other lines are handled by the regular parser.
+    """
+
+    def parse(self):
+        """
+        Run the state machine, parse the file line by line and call the
+        handler of each transition.
+        """
+        return self._finish(self._run(self.fhandle, []))
+
+    def _run(self, lines, tokens):
+        """
+        Parse the given lines, which can be just a part of the file. Returns
+        the tokens of the last non empty line (``tokens`` if there isn't
+        any).
+        """
+        transitions = self.transitions
+        keyword_match = _po_keyword_re.match
+        quote_search = _unescaped_quote_re.search
+        fpath = '%s ' % self.instance.fpath if self.instance.fpath else ''
+        try:
+            for line in lines:
+                self.current_line += 1
+                line = line.strip()
+                if not line:
+                    continue
+                first = line[0]
+                symbol = None
+                if first == '"':
+                    # we are on a continuation line
+                    symbol = 'mc'
+                    if '"' in line[1:-1] and quote_search(line[1:-1]):
+                        raise IOError('Syntax error in po file %s(line %s): '
+                                      'unescaped double quote found' %
+                                      (fpath, self.current_line))
+                elif first == 'm':
+                    match = keyword_match(line)
+                    if match is not None:
+                        keyword = match.group(1)
+                        symbol = _po_keywords[keyword]
+                        line = line[len(keyword):].lstrip()
+                        if '"' in line[1:-1] and quote_search(line[1:-1]):
+                            raise IOError('Syntax error in po file %s(line '
+                                          '%s): unescaped double quote '
+                                          'found' % (fpath, self.current_line))
+                    elif line[:7] == 'msgstr[':
+                        symbol = 'mx'
+                elif first == '#':
+                    second = line[1:2]
+                    if second == '' or second == '#' or second.isspace():
+                        # we are on a translator comment line
+                        symbol = 'tc'
+                        if line == '#':
+                            line = '# '
+                    elif second in _po_comment_symbols:
+                        third = line[2:3]
+                        if third == '':
+                            # empty comment lines are ignored
+                            tokens = [line]
+                            continue
+                        if third.isspace():
+                            symbol = _po_comment_symbols[second]
+                if symbol is None:
+                    # obsolete entries, previous translations, errors, etc.
+                    tokens = self._parse_line(line, fpath)
+                    continue
+                tokens = [first]
+                self.entry_obsolete = 0
+                self.current_token = line
+                transition = transitions.get((symbol, self.current_state))
+                if transition is None:
+                    raise IOError('Syntax error in po file (line %s)' %
+                                  self.current_line)
+                if transition[0]():
+                    self.current_state = transition[1]
+        except IOError:
+            raise
+        except Exception:
+            raise IOError('Syntax error in po file (line %s)' %
+                          self.current_line)
+
+        return tokens
+
+
+def _parse_mo_metadata(msgstr, encoding):
+    """
+    Returns the metadata dict stored in the ``msgstr`` bytes of the metadata
+    entry of a mo file.
+    """
+    metadata = {}
+    for line in msgstr.split(b('\n')):
+        tokens = line.split(b(':'), 1)
+        if tokens[0] != b(''):
+            try:
+                k = tokens[0].decode(encoding)
+                v = tokens[1].decode(encoding)
+                metadata[k] = v.strip()
+            except IndexError:
+                metadata[k] = ''
+    return metadata
+
+
+def _build_mo_entry(msgid, msgstr, encoding):
+    """
+    Returns a :class:`~polib.MOEntry` from the ``msgid`` and ``msgstr`` bytes
+    as they are stored in a mo file.
+    """
+    kwargs = {}
+    # test if we have a plural entry
+    msgid_tokens = msgid.split(b('\0'))
+    if len(msgid_tokens) > 1:
+        msgid, msgid_plural = msgid_tokens[0], msgid_tokens[1]
+        if msgid_plural:
+            kwargs['msgid_plural'] = msgid_plural.decode(encoding)
+        kwargs['msgstr_plural'] = dict(
+            (k, v.decode(encoding))
+            for k, v in enumerate(msgstr.split(b('\0')))
+        )
+    elif msgstr:
+        kwargs['msgstr'] = msgstr.decode(encoding)
+    msgctxt_msgid = msgid.split(b('\x04'))
+    if len(msgctxt_msgid) > 1:
+        kwargs['msgctxt'] = msgctxt_msgid[0].decode(encoding)
+        kwargs['msgid'] = msgctxt_msgid[1].decode(encoding)
+    else:
+        kwargs['msgid'] = msgid.decode(encoding)
+    return MOEntry(**kwargs)
+
+
 class _MOFileParser(object):
     """
     A class to parse binary mo files.
@@ -1591,6 +2624,10 @@ class _MOFileParser(object):
         ``check_for_duplicates``
             whether to check for duplicate entries when adding entries to the
             file (optional, default: ``False``).
+
+        ``indexed``
+            whether the returned instance should keep a msgid index of its
+            entries (optional, default: ``False``).
         """
         self.fhandle = open(mofile, 'rb')
 
@@ -1600,7 +2637,8 @@ class _MOFileParser(object):
         self.instance = klass(
             fpath=mofile,
             encoding=kwargs.get('encoding', default_encoding),
-            check_for_duplicates=kwargs.get('check_for_duplicates', False)
+            check_for_duplicates=kwargs.get('check_for_duplicates', False),
+            indexed=kwargs.get('indexed', False)
         )
 
     def __del__(self):
@@ -1653,55 +2691,13 @@ class _MOFileParser(object):
             self.fhandle.seek(msgstrs_index[i][1])
             msgstr = self.fhandle.read(msgstrs_index[i][0])
             if i == 0 and not msgid:  # metadata
-                raw_metadata, metadata = msgstr.split(b('\n')), {}
-                for line in raw_metadata:
-                    tokens = line.split(b(':'), 1)
-                    if tokens[0] != b(''):
-                        try:
-                            k = tokens[0].decode(encoding)
-                            v = tokens[1].decode(encoding)
-                            metadata[k] = v.strip()
-                        except IndexError:
-                            metadata[k] = ''
-                self.instance.metadata = metadata
+                self.instance.metadata = _parse_mo_metadata(msgstr, encoding)
                 continue
-            # test if we have a plural entry
-            msgid_tokens = msgid.split(b('\0'))
-            if len(msgid_tokens) > 1:
-                entry = self._build_entry(
-                    msgid=msgid_tokens[0],
-                    msgid_plural=msgid_tokens[1],
-                    msgstr_plural=dict((k, v) for k, v in
-                                       enumerate(msgstr.split(b('\0'))))
-                )
-            else:
-                entry = self._build_entry(msgid=msgid, msgstr=msgstr)
-            self.instance.append(entry)
+            self.instance.append(_build_mo_entry(msgid, msgstr, encoding))
         # close opened file
         self.fhandle.close()
         return self.instance
 
-    def _build_entry(self, msgid, msgstr=None, msgid_plural=None,
-                     msgstr_plural=None):
-        msgctxt_msgid = msgid.split(b('\x04'))
-        encoding = self.instance.encoding
-        if len(msgctxt_msgid) > 1:
-            kwargs = {
-                'msgctxt': msgctxt_msgid[0].decode(encoding),
-                'msgid': msgctxt_msgid[1].decode(encoding),
-            }
-        else:
-            kwargs = {'msgid': msgid.decode(encoding)}
-        if msgstr:
-            kwargs['msgstr'] = msgstr.decode(encoding)
-        if msgid_plural:
-            kwargs['msgid_plural'] = msgid_plural.decode(encoding)
-        if msgstr_plural:
-            for k in msgstr_plural:
-                msgstr_plural[k] = msgstr_plural[k].decode(encoding)
-            kwargs['msgstr_plural'] = msgstr_plural
-        return MOEntry(**kwargs)
-
     def _readbinary(self, fmt, numbytes):
         """
         Private method that unpack n bytes of data using format <fmt>.
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Catalog of the strings extracted from source files.
+"""
+from .python_utils import polib
+
+
+def occurrence_sort_key(occurrence):
+    """Sort key for occurrences.
+
+    Parameters
+    ----------
+    occurrence : tuple
+        A file path and a line number.
+
+    Returns
+    -------
+    tuple
+        The sort key.
+    """
+    return (occurrence[0], int(occurrence[1]) if str(occurrence[1]).isdigit() else 0)
+
+
+class SourceCatalog():
+    """Merge the entries extracted from each source file into a single catalog.
+
+    Strings found in more than one file get all their occurrences, comments and flags merged.
+    The merged entries are kept between updates and only the strings found in added, removed or
+    modified files are merged again. This way, the watch mode and the daemon don't merge the
+    strings of every file of an xlet after each change.
+
+    Attributes
+    ----------
+    entries : dict
+        The merged entries. The keys are tuples containing the msgctxt and the msgid of each
+        entry.
+    """
+
+    def __init__(self):
+        """Initialization.
+        """
+        self.entries = {}
+        self._files = []
+        self._fragments = {}
+        # NOTE: The extracted entries of each file by key and the files each key is found in.
+        self._file_entries = {}
+        self._key_files = {}
+
+    def update(self, files, fragments):
+        """Update the catalog with the entries extracted from each source file.
+
+        Parameters
+        ----------
+        files : list
+            The paths of the scanned files. The entries of the files are merged in this order.
+        fragments : list
+            A list with the extracted entries of each file, in the same order as ``files``. See
+            :any:`app_utils._extract_source_strings`.
+        """
+        # NOTE: A file passed more than once (e.g. an additional file that is also inside the
+        # xlet) is merged once per time it's passed, like in a single run over all the files.
+        counts = {}
+        files = list(files)
+
+        for i, file in enumerate(files):
+            counts[file] = counts.get(file, 0) + 1
+            files[i] = file if counts[file] == 1 else (file, counts[file])
+
+        fragments = dict(zip(files, fragments))
+        touched = set()
+
+        for file, fragment in self._fragments.items():
+            new_fragment = fragments.get(file)
+
+            if new_fragment is not fragment and new_fragment != fragment:
+                for key in self._file_entries.pop(file):
+                    touched.add(key)
+                    self._key_files[key].discard(file)
+
+        for file, fragment in fragments.items():
+            if file in self._file_entries:
+                continue
+
+            file_entries = self._file_entries[file] = {}
+
+            for data in fragment:
+                key = (data["msgctxt"], data["msgid"])
+                file_entries.setdefault(key, []).append(data)
+                touched.add(key)
+                self._key_files.setdefault(key, set()).add(file)
+
+        # NOTE: The entries of the files that were kept are merged in a different order only
+        # if the files were reordered, which doesn't happen with sorted files.
+        if [file for file in self._files if file in fragments] != \
+                [file for file in files if file in self._fragments]:
+            touched = set(self._key_files)
+
+        self._files = files
+        self._fragments = fragments
+        file_indexes = {file: i for i, file in enumerate(files)}
+
+        for key in touched:
+            key_files = self._key_files[key]
+
+            if key_files:
+                self.entries[key] = self._merge(key, sorted(key_files, key=file_indexes.get))
+            else:
+                del self._key_files[key]
+                self.entries.pop(key, None)
+
+    def _merge(self, key, files):
+        """Merge the entries with the same key extracted from several files.
+
+        Parameters
+        ----------
+        key : tuple
+            The msgctxt and the msgid of the entries.
+        files : list
+            The files containing the entries, in the order their entries are merged.
+
+        Returns
+        -------
+        polib.POEntry
+            The merged entry.
+        """
+        entry = None
+
+        for file in files:
+            for data in self._file_entries[file][key]:
+                if entry is None:
+                    entry = polib.POEntry(
+                        msgid=data["msgid"],
+                        msgctxt=data["msgctxt"],
+                        msgid_plural=data["msgid_plural"],
+                        msgstr_plural={0: "", 1: ""} if data["msgid_plural"] else {},
+                        comment=data["comment"],
+                        flags=list(data["flags"]),
+                        occurrences=[tuple(occurrence) for occurrence in data["occurrences"]]
+                    )
+                    continue
+
+                entry.occurrences.extend([tuple(occurrence)
+                                          for occurrence in data["occurrences"]])
+
+                if data["comment"]:
+                    comments = entry.comment.split("\n") if entry.comment else []
+
+                    for comment in data["comment"].split("\n"):
+                        if comment not in comments:
+                            comments.append(comment)
+
+                    entry.comment = "\n".join(comments)
+
+                for flag in data["flags"]:
+                    if flag not in entry.flags:
+                        entry.flags.append(flag)
+
+                if data["msgid_plural"] and not entry.msgid_plural:
+                    entry.msgid_plural = data["msgid_plural"]
+                    entry.msgstr_plural = {0: "", 1: ""}
+
+        entry.occurrences.sort(key=occurrence_sort_key)
+
+        return entry
+
+
+if __name__ == "__main__":
+    pass
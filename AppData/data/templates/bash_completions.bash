@@ -14,9 +14,10 @@ __make_cinnamon_xlet_pot_cli_{current_date}(){
     COMPREPLY=()
     cur="${COMP_WORDS[COMP_CWORD]}"
     prev="${COMP_WORDS[COMP_CWORD-1]}"
-    main_options="-j --skip-js -p --skip-python -o --output= -c --custom-header \
--a --scan-additional-file= -s --skip-key= -k --keyword= -g --ignored-pattern= -x --xlet-dir= \
--i --install -r --remove -t --gen-stats generate -h --help --manual --version"
+    main_options="-j --skip-js -p --skip-python -o --output= -c --custom-header --use-cache \
+--skip-unchanged -a --scan-additional-file= -s --skip-key= -k --keyword= -g --ignored-pattern= \
+-x --xlet-dir= --jobs= --extractor= --watch -i --install -r --remove -t --gen-stats --full-stats \
+daemon client generate -h --help --manual --version"
 
     # Handle --xxxxxx=
     if [[ ${prev} == "--"* && ${cur} == "=" ]] ; then
@@ -51,11 +52,15 @@ __make_cinnamon_xlet_pot_cli_{current_date}(){
 
     case $cmd in
     "-i"|"--install"|"-r"|"--remove")
-        COMPREPLY=( $(compgen -W "-x --xlet-dir=" -- "${cur}") )
+        COMPREPLY=( $(compgen -W "-x --xlet-dir= --jobs=" -- "${cur}") )
         _decide_nospace_{current_date} ${COMPREPLY[0]}
         ;;
     "-t"|"--gen-stats")
-        COMPREPLY=( $(compgen -W "-x --xlet-dir= -f --pot-file=" -- "${cur}") )
+        COMPREPLY=( $(compgen -W "-x --xlet-dir= -f --pot-file= --jobs= --full-stats" -- "${cur}") )
+        _decide_nospace_{current_date} ${COMPREPLY[0]}
+        ;;
+    "daemon")
+        COMPREPLY=( $(compgen -W "--socket=" -- "${cur}") )
         _decide_nospace_{current_date} ${COMPREPLY[0]}
         ;;
     "generate")
@@ -2,7 +2,14 @@
 # -*- coding: utf-8 -*-
 import sys
 
-from AppData.MakeCinnamonXletPOTApp.cli import main
-
 if __name__ == "__main__":
+    # NOTE: The client only forwards its arguments to the daemon. Don't import the rest of the
+    # application nor parse the arguments unless it has to run the command by itself.
+    if sys.argv[1:2] == ["client"]:
+        from AppData.MakeCinnamonXletPOTApp.daemon_client import main as client_main
+
+        sys.exit(client_main(sys.argv[2:]))
+
+    from AppData.MakeCinnamonXletPOTApp.cli import main
+
     sys.exit(main())
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the benchmark scripts.
+
+The scripts are meant to be run from the repository root, e.g.::
+
+    python3 benchmarks/bench_polib_index.py
+    python3 benchmarks/bench_polib_index.py --against <git revision>
+
+With ``--against``, the polib module found at the given git revision is measured next to the
+current one, which gives a reproducible before/after comparison.
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+
+root_folder = os.path.realpath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+if root_folder not in sys.path:
+    sys.path.insert(0, root_folder)
+
+POLIB_PATH = "AppData/MakeCinnamonXletPOTApp/python_utils/polib.py"
+
+
+def get_parser(description):
+    """Create the command line parser common to all benchmarks.
+
+    Parameters
+    ----------
+    description : str
+        The benchmark description.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        The parser.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--against", metavar="REV",
+                        help="also measure the polib module found at this git revision")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of runs of each measurement, the best one is kept")
+
+    return parser
+
+
+def load_polib(rev=None):
+    """Load the polib module.
+
+    Parameters
+    ----------
+    rev : str, optional
+        A git revision. If not given, the current polib module is returned.
+
+    Returns
+    -------
+    module
+        The polib module.
+    """
+    if rev is None:
+        from AppData.MakeCinnamonXletPOTApp.python_utils import polib
+
+        return polib
+
+    source = subprocess.check_output(["git", "show", "%s:%s" % (rev, POLIB_PATH)],
+                                     cwd=root_folder)
+    module = types.ModuleType("polib_%s" % rev)
+    module.__file__ = "%s:%s" % (rev, POLIB_PATH)
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+
+    return module
+
+
+def get_modules(args):
+    """Get the polib modules to measure.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed arguments.
+
+    Returns
+    -------
+    list
+        Tuples with a label and a polib module.
+    """
+    modules = [("current", load_polib())]
+
+    if args.against:
+        modules.insert(0, (args.against, load_polib(args.against)))
+
+    return modules
+
+
+def best_of(repeat, func, *args, **kwargs):
+    """Run a function several times.
+
+    Parameters
+    ----------
+    repeat : int
+        Number of runs.
+    func : function
+        The function to run.
+    *args
+        Arguments passed to the function.
+    **kwargs
+        Keyword arguments passed to the function.
+
+    Returns
+    -------
+    float
+        The duration of the fastest run, in seconds.
+    """
+    best = None
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+
+    return best
+
+
+def make_catalog(polib, size, seed=0):
+    """Create a catalog that looks like a translated xlet catalog.
+
+    Parameters
+    ----------
+    polib : module
+        The polib module to use.
+    size : int
+        Number of entries.
+    seed : int, optional
+        The seed of the random generator.
+
+    Returns
+    -------
+    polib.POFile
+        The catalog.
+    """
+    rand = random.Random(seed)
+    po_file = polib.POFile()
+    po_file.metadata = {
+        "Project-Id-Version": "bench",
+        "MIME-Version": "1.0",
+        "Content-Type": "text/plain; charset=UTF-8",
+        "Content-Transfer-Encoding": "8bit",
+        "Plural-Forms": "nplurals=2; plural=(n != 1);",
+    }
+
+    for i in range(size):
+        words = " ".join(rand.choice(("enable", "the", "applet", "show", "window", "panel",
+                                      "icon", "size", "\"quoted\"", "tab\there"))
+                         for j in range(rand.randint(2, 30)))
+        entry = polib.POEntry(msgid="%s %i" % (words, i),
+                              msgstr="%s %i" % (words.upper(), i) if rand.random() < .8 else "",
+                              occurrences=[("file%i.js" % (i % 50), str(i))],
+                              comment="settings-schema.json->key%i->description" % i)
+
+        if rand.random() < .1:
+            entry.msgctxt = "context"
+
+        if rand.random() < .1:
+            entry.flags.append("fuzzy")
+
+        po_file.append(entry)
+
+    return po_file
+
+
+def print_row(*columns):
+    """Print a row of a result table.
+
+    Parameters
+    ----------
+    *columns
+        The column values.
+    """
+    print("  ".join("%-14s" % column for column in columns))
+
+
+if __name__ == "__main__":
+    pass
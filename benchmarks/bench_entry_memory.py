@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of the memory used by polib entries.
+
+It reports the bytes allocated per entry (measured with tracemalloc) for bare entries, for
+entries with one occurrence and one flag and for the entries of a catalog read with
+``polib.pofile``.
+"""
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import _common
+
+
+def measure(count, func, *args):
+    """Measure the memory allocated by a function that creates objects.
+
+    Parameters
+    ----------
+    count : int
+        The number of objects created by the function.
+    func : function
+        The function. Its return value is kept alive until the measurement is done.
+    *args
+        Arguments passed to the function.
+
+    Returns
+    -------
+    float
+        The allocated bytes per object.
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        result = func(*args)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del result
+
+    return allocated / count
+
+
+def bare_entries(polib, msgids):
+    """Create entries with only a msgid.
+    """
+    return [polib.POEntry(msgid=msgid) for msgid in msgids]
+
+
+def full_entries(polib, msgids):
+    """Create entries with a msgid, an occurrence and a flag.
+    """
+    entries = []
+
+    for i, msgid in enumerate(msgids):
+        entry = polib.POEntry(msgid=msgid, occurrences=[("applet.js", str(i))])
+        entry.flags.append("javascript-format")
+        entries.append(entry)
+
+    return entries
+
+
+def main():
+    """Run the benchmark.
+    """
+    parser = _common.get_parser(__doc__)
+    parser.add_argument("--entries", type=int, default=100000)
+    args = parser.parse_args()
+    # NOTE: The strings are created beforehand so that only the entries are measured.
+    msgids = ["String %i" % i for i in range(args.entries)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        po_path = os.path.join(tmp_dir, "bench.po")
+        _common.make_catalog(_common.load_polib(), args.entries // 2).save(po_path)
+
+        with open(po_path, "r", encoding="UTF-8") as po_file:
+            po_data = po_file.read()
+
+        _common.print_row("polib", "bare entry", "with occ+flag", "pofile() entry")
+
+        for label, polib in _common.get_modules(args):
+            _common.print_row(
+                label,
+                "%.0f B" % measure(args.entries, bare_entries, polib, msgids),
+                "%.0f B" % measure(args.entries, full_entries, polib, msgids),
+                "%.0f B" % measure(args.entries // 2, polib.pofile, po_data))
+
+
+if __name__ == "__main__":
+    main()
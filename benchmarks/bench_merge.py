@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of ``POFile.merge``.
+
+It merges a translated catalog with a template in which a third of the strings changed, at
+growing catalog sizes. If msgmerge is installed, ``msgmerge --no-fuzzy-matching`` (which is
+what ``POFile.merge`` replaces) is timed too.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import _common
+
+
+def make_template(polib, po_file):
+    """Create the template to merge a catalog with.
+
+    Parameters
+    ----------
+    polib : module
+        The polib module to use.
+    po_file : polib.POFile
+        The catalog.
+
+    Returns
+    -------
+    polib.POFile
+        A template with the strings of the catalog, a third of them modified.
+    """
+    pot_file = polib.POFile()
+
+    for i, entry in enumerate(po_file):
+        msgid = entry.msgid + " (changed)" if i % 3 == 0 else entry.msgid
+        pot_file.append(polib.POEntry(msgid=msgid, msgctxt=entry.msgctxt,
+                                      occurrences=[("applet.js", str(i))]))
+
+    return pot_file
+
+
+def time_merge(polib, size, repeat):
+    """Time the merge of a catalog.
+
+    Parameters
+    ----------
+    polib : module
+        The polib module to use.
+    size : int
+        The number of entries of the catalog.
+    repeat : int
+        Number of runs. The best one is kept.
+
+    Returns
+    -------
+    float
+        The duration of the fastest merge, in seconds.
+    """
+    best = None
+
+    for i in range(repeat):
+        # NOTE: The catalog is modified by the merge, so a new one is needed for every run.
+        po_file = _common.make_catalog(polib, size)
+        pot_file = make_template(polib, po_file)
+        start = time.perf_counter()
+        po_file.merge(pot_file)
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+
+    return best
+
+
+def main():
+    """Run the benchmark.
+    """
+    parser = _common.get_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[12500, 25000, 50000])
+    args = parser.parse_args()
+    msgmerge = shutil.which("msgmerge")
+
+    _common.print_row("polib", "entries", "merge", "msgmerge")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, polib in _common.get_modules(args):
+            for size in args.sizes:
+                msgmerge_time = None
+
+                if msgmerge:
+                    po_file = _common.make_catalog(polib, size)
+                    po_path = os.path.join(tmp_dir, "bench.po")
+                    pot_path = os.path.join(tmp_dir, "bench.pot")
+                    po_file.save(po_path)
+                    make_template(polib, po_file).save(pot_path)
+                    msgmerge_time = _common.best_of(
+                        args.repeat, subprocess.run,
+                        [msgmerge, "--quiet", "--no-fuzzy-matching", po_path, pot_path,
+                         "--output-file=%s" % os.path.join(tmp_dir, "merged.po")], check=True)
+
+                _common.print_row(label, size, "%.2f s" % time_merge(polib, size, args.repeat),
+                                  "%.2f s" % msgmerge_time if msgmerge_time is not None else "n/a")
+
+
+if __name__ == "__main__":
+    main()
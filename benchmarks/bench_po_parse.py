@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of the PO file parsers.
+
+It parses a large generated .po file with the regular parser and with the fast parser
+(``fast_parser=True``) and reports their throughput.
+"""
+import os
+import tempfile
+
+import _common
+
+
+def main():
+    """Run the benchmark.
+    """
+    parser = _common.get_parser(__doc__)
+    parser.add_argument("--entries", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        po_path = os.path.join(tmp_dir, "bench.po")
+        _common.make_catalog(_common.load_polib(), args.entries).save(po_path)
+        size = os.path.getsize(po_path) / 1024 / 1024
+
+        print("%i entries, %.1f MB" % (args.entries, size))
+        _common.print_row("polib", "parser", "time", "throughput")
+
+        for label, polib in _common.get_modules(args):
+            parsers = [("regular", {})]
+
+            if hasattr(polib, "_FastPOFileParser"):
+                parsers.append(("fast", {"fast_parser": True}))
+
+            for name, kwargs in parsers:
+                duration = _common.best_of(args.repeat, polib.pofile, po_path, **kwargs)
+                _common.print_row(label, name, "%.2f s" % duration, "%.1f MB/s" % (
+                    size / duration))
+
+
+if __name__ == "__main__":
+    main()
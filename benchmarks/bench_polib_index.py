@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of msgid lookups with and without polib's msgid index.
+
+It runs the find-or-append loop that the JSON extraction runs for every string (half of the
+strings are repeated) with growing catalog sizes. With the index, the time grows linearly
+with the number of strings. Without it, it grows quadratically.
+"""
+import _common
+
+
+def find_or_append(polib, msgids, indexed):
+    """Add strings to a catalog the way the JSON extraction does.
+
+    Parameters
+    ----------
+    polib : module
+        The polib module to use.
+    msgids : list
+        The strings to add.
+    indexed : bool
+        Whether to use an indexed catalog.
+    """
+    kwargs = {"indexed": True} if indexed else {}
+    po_file = polib.POFile(**kwargs)
+
+    for msgid in msgids:
+        entry = po_file.find(msgid)
+
+        if entry is None:
+            po_file.append(polib.POEntry(msgid=msgid, comment="settings-schema.json->key"))
+        else:
+            entry.comment += "\nsettings-schema.json->other"
+
+
+def main():
+    """Run the benchmark.
+    """
+    parser = _common.get_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+    args = parser.parse_args()
+
+    _common.print_row("polib", "strings", "linear scan", "indexed")
+
+    for label, polib in _common.get_modules(args):
+        supports_index = "indexed" in polib.POFile().__dict__
+
+        for size in args.sizes:
+            msgids = ["String %i" % (i % (size // 2)) for i in range(size)]
+            linear = _common.best_of(args.repeat, find_or_append, polib, msgids, False)
+            indexed = _common.best_of(args.repeat, find_or_append, polib, msgids, True) \
+                if supports_index else None
+            _common.print_row(label, size, "%.3f s" % linear,
+                              "%.3f s" % indexed if indexed is not None else "n/a")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of the .mo file generation.
+
+It times ``POFile.to_binary`` with and without the hash table at growing catalog sizes, so the
+growth can be checked to be linear. If msgfmt is installed, it's timed too.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+
+import _common
+
+
+def main():
+    """Run the benchmark.
+    """
+    parser = _common.get_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 10000, 20000])
+    args = parser.parse_args()
+    msgfmt = shutil.which("msgfmt")
+
+    _common.print_row("polib", "entries", "to_binary", "+ hash table", "msgfmt")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, polib in _common.get_modules(args):
+            supports_hash_table = hasattr(polib, "_mo_hash_table")
+
+            for size in args.sizes:
+                po_file = _common.make_catalog(polib, size)
+                plain = _common.best_of(args.repeat, po_file.to_binary)
+                hashed = _common.best_of(args.repeat, po_file.to_binary, hash_table=True) \
+                    if supports_hash_table else None
+                msgfmt_time = None
+
+                if msgfmt:
+                    po_path = os.path.join(tmp_dir, "bench.po")
+                    po_file.save(po_path)
+                    msgfmt_time = _common.best_of(
+                        args.repeat, subprocess.run,
+                        [msgfmt, po_path, "-o", os.path.join(tmp_dir, "bench.mo")], check=True)
+
+                _common.print_row(label, size, "%.2f s" % plain,
+                                  "%.2f s" % hashed if hashed is not None else "n/a",
+                                  "%.2f s" % msgfmt_time if msgfmt_time is not None else "n/a")
+
+
+if __name__ == "__main__":
+    main()
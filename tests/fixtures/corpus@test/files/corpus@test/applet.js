@@ -0,0 +1,23 @@
+const Gettext = imports.gettext;
+const UUID = "corpus@test";
+
+function _(str) {
+    return Gettext.dgettext(UUID, str);
+}
+
+// Translators: Shown in the panel tooltip.
+let tooltip = _("Hello world");
+let quoted = _('It\'s "quoted"');
+let joined = _("First part, " +
+    "second part");
+
+/* Translators: A block comment. */
+let files = ngettext("%d file", "%d files", count);
+let menu = pgettext("menu", "Open");
+let escaped = _("Tab\there\nnew line é");
+let regex = /"not a string/g;
+let again = _("Hello world");
+let ratio = total / _("Divided") / 2;
+let formatted = _("%s of %s");
+let ignored = _(variable);
+let method = obj._("Method named like the keyword");
@@ -0,0 +1,14 @@
+from gettext import gettext as _
+from gettext import ngettext
+
+
+def describe(count, name):
+    # Translators: A Python comment.
+    print(_("Python string"))
+    print(_("Hello world"))
+    print(_("Adjacent " "literals"))
+    print(_("Named %(name)s") % {"name": name})
+    print(_('''Triple
+quoted'''))
+    print(ngettext("one item", "%d items", count) % count)
+    print(_(name))
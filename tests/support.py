@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the tests.
+
+Attributes
+----------
+REQUIRE_GETTEXT : bool
+    Whether the tests that need the gettext commands must fail instead of being skipped when
+    the commands aren't installed. Set by the CI with the ``REQUIRE_GETTEXT`` environment
+    variable.
+UPDATE_FIXTURES : bool
+    Whether the tests that compare against files generated by the gettext commands must
+    regenerate them first. Set with the ``UPDATE_FIXTURES`` environment variable.
+fixtures_folder : str
+    The folder containing the files used by the tests.
+root_folder : str
+    The repository root folder.
+"""
+import contextlib
+import functools
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+root_folder = os.path.realpath(os.path.join(os.path.dirname(__file__), os.pardir))
+fixtures_folder = os.path.join(root_folder, "tests", "fixtures")
+
+REQUIRE_GETTEXT = bool(os.environ.get("REQUIRE_GETTEXT"))
+UPDATE_FIXTURES = bool(os.environ.get("UPDATE_FIXTURES"))
+
+
+def requires_commands(*commands):
+    """Skip a test if any of the given commands isn't installed.
+
+    Parameters
+    ----------
+    *commands
+        The names of the commands needed by the test.
+
+    Returns
+    -------
+    function
+        The test decorator. If :any:`REQUIRE_GETTEXT` is set, the test fails instead of being
+        skipped.
+    """
+    missing = [command for command in commands if not shutil.which(command)]
+
+    if not missing:
+        return lambda func: func
+
+    msg = "%s isn't installed" % ", ".join(missing)
+
+    if not REQUIRE_GETTEXT:
+        return unittest.skip(msg)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            self.fail(msg)
+
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def app_folder():
+    """Create a temporary folder from which ``app.py`` can be run.
+
+    The application stores its log files in the **UserData/logs** folder of the working
+    directory. Running it from a temporary folder keeps them out of the repository.
+
+    Yields
+    ------
+    str
+        The path to the folder.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ("app.py", "AppData", ".make-cinnamon-xlet-pot.flag"):
+            os.symlink(os.path.join(root_folder, name), os.path.join(tmp_dir, name))
+
+        yield tmp_dir
+
+
+def run_app(args, env=None):
+    """Run ``app.py`` in a new process from a temporary folder.
+
+    Parameters
+    ----------
+    args : list
+        The command line arguments.
+    env : dict, optional
+        The environment variables of the process.
+
+    Returns
+    -------
+    subprocess.CompletedProcess
+        The result, with stderr merged into stdout.
+    """
+    with app_folder() as cwd:
+        return subprocess.run([sys.executable, "app.py"] + list(args), cwd=cwd, env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+
+if __name__ == "__main__":
+    pass
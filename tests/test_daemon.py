@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""Tests for the daemon socket and the data it keeps between commands.
+"""
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import daemon
+from AppData.MakeCinnamonXletPOTApp import daemon_client
+
+from support import app_folder
+from support import fixtures_folder
+
+PO_FILE = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+msgid "Hello world"
+msgstr "Hallo Welt"
+"""
+
+FAKE_XDG_OPEN = """#!/bin/sh
+echo "$PWD $1" >> "%s"
+"""
+
+
+class BindTest(unittest.TestCase):
+    """Only sockets left behind by a previous daemon can be replaced.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp_dir.name, "daemon.sock")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_refuses_regular_file(self):
+        with open(self.path, "w", encoding="UTF-8") as user_file:
+            user_file.write("not a socket")
+
+        with self.assertRaises(SystemExit):
+            daemon._bind(self.path)
+
+        with open(self.path, "r", encoding="UTF-8") as user_file:
+            self.assertEqual(user_file.read(), "not a socket")
+
+    def test_refuses_symlink(self):
+        target = os.path.join(self._tmp_dir.name, "target")
+        os.symlink(target, self.path)
+
+        with self.assertRaises(SystemExit):
+            daemon._bind(self.path)
+
+        self.assertTrue(os.path.islink(self.path))
+
+    def test_replaces_stale_socket(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+
+        with daemon._bind(self.path) as server:
+            self.assertEqual(server.getsockname(), self.path)
+
+    def test_refuses_live_socket(self):
+        with daemon._bind(self.path):
+            with self.assertRaises(SystemExit):
+                daemon._bind(self.path)
+
+    def test_refuses_socket_of_another_user(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            with self.assertRaises(SystemExit):
+                daemon._bind(self.path)
+
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_permission_error(self):
+        with mock.patch("socket.socket.bind", side_effect=PermissionError(13, "Permission denied")):
+            with self.assertRaises(SystemExit) as context:
+                daemon._bind(self.path)
+
+        self.assertIn("Permission denied", str(context.exception.code))
+
+
+class SocketPathTest(unittest.TestCase):
+    """Without a runtime directory, the socket is put in a private folder.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.private_dir = os.path.join(self._tmp_dir.name,
+                                        "make-cinnamon-xlet-pot-%i" % os.getuid())
+        self._patches = [
+            mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}),
+            mock.patch("tempfile.gettempdir", return_value=self._tmp_dir.name),
+        ]
+
+        for patch in self._patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self._patches:
+            patch.stop()
+
+        self._tmp_dir.cleanup()
+
+    def test_private_folder(self):
+        self.assertEqual(daemon_client.get_socket_path(),
+                         os.path.join(self.private_dir, "daemon.sock"))
+        self.assertEqual(os.stat(self.private_dir).st_mode & 0o777, 0o700)
+
+        # NOTE: The folder is reused.
+        self.assertEqual(daemon_client.get_socket_path(),
+                         os.path.join(self.private_dir, "daemon.sock"))
+
+    def test_refuses_shared_folder(self):
+        os.mkdir(self.private_dir)
+        os.chmod(self.private_dir, 0o777)
+
+        with self.assertRaises(SystemExit):
+            daemon_client.get_socket_path()
+
+    def test_refuses_symlink(self):
+        os.symlink(self._tmp_dir.name, self.private_dir)
+
+        with self.assertRaises(SystemExit):
+            daemon_client.get_socket_path()
+
+    def test_refuses_folder_of_another_user(self):
+        # NOTE: The folder of the (fake) user ID is created by the current user.
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            with self.assertRaises(SystemExit):
+                daemon_client.get_socket_path()
+
+    def test_client_refuses_socket_of_another_user(self):
+        path = os.path.join(self._tmp_dir.name, "daemon.sock")
+
+        with daemon._bind(path):
+            with mock.patch("os.getuid", return_value=os.getuid() + 1):
+                with self.assertRaises(SystemExit):
+                    daemon_client.run(["--help"], path)
+
+
+class BoundedCacheTest(unittest.TestCase):
+    """The data kept between commands must not grow without bound.
+    """
+
+    def test_drops_least_recently_used(self):
+        caches = daemon._BoundedCache(3)
+
+        for i in range(3):
+            caches[("stats", i)] = i
+
+        self.assertEqual(caches[("stats", 0)], 0)
+        self.assertEqual(caches.get(("stats", 1)), 1)
+        caches[("stats", 3)] = 3
+        caches[("stats", 4)] = 4
+
+        self.assertEqual(len(caches), 3)
+        self.assertNotIn(("stats", 2), caches)
+        self.assertIsNone(caches.get(("stats", 2)))
+        self.assertEqual(list(caches), [("stats", 1), ("stats", 3), ("stats", 4)])
+
+
+class DaemonRequestsTest(unittest.TestCase):
+    """Commands sent to a running daemon from another folder give the same results as commands
+    run without it.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.home = os.path.join(self._tmp_dir.name, "home")
+        self.socket_path = os.path.join(self._tmp_dir.name, "daemon.sock")
+        self.opened_log = os.path.join(self._tmp_dir.name, "opened.log")
+        bin_dir = os.path.join(self._tmp_dir.name, "bin")
+        os.makedirs(self.home)
+        os.makedirs(bin_dir)
+
+        xdg_open = os.path.join(bin_dir, "xdg-open")
+
+        with open(xdg_open, "w", encoding="UTF-8") as script:
+            script.write(FAKE_XDG_OPEN % self.opened_log)
+
+        os.chmod(xdg_open, 0o755)
+
+        self.env = dict(os.environ, HOME=self.home,
+                        PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""))
+        self.env.pop("XDG_RUNTIME_DIR", None)
+
+        self._daemon_folder = app_folder()
+        self._client_folder = app_folder()
+        daemon_cwd = self._daemon_folder.__enter__()
+        self.client_cwd = self._client_folder.__enter__()
+
+        self.xlet_dir = os.path.join(self.client_cwd, "xlets", "corpus@test")
+        shutil.copytree(os.path.join(fixtures_folder, "corpus@test"), self.xlet_dir,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        os.makedirs(os.path.join(self.xlet_dir, "po"))
+
+        with open(os.path.join(self.xlet_dir, "po", "de.po"), "w", encoding="UTF-8") as po_file:
+            po_file.write(PO_FILE)
+
+        self.daemon = subprocess.Popen(
+            [sys.executable, "app.py", "daemon", "--socket=%s" % self.socket_path],
+            cwd=daemon_cwd, env=self.env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        for i in range(500):
+            if os.path.exists(self.socket_path) or self.daemon.poll() is not None:
+                break
+
+            time.sleep(0.01)
+
+        self.assertTrue(os.path.exists(self.socket_path))
+
+    def tearDown(self):
+        self.daemon.send_signal(signal.SIGTERM)
+        self.daemon.wait(10)
+        self._client_folder.__exit__(None, None, None)
+        self._daemon_folder.__exit__(None, None, None)
+        self._tmp_dir.cleanup()
+
+    def _request(self, *args):
+        result = subprocess.run(
+            [sys.executable, "app.py", "client", "--socket=%s" % self.socket_path, "--"] +
+            list(args), cwd=self.client_cwd, env=self.env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        self.assertEqual(result.returncode, 0, result.stdout.decode("UTF-8"))
+
+        return result.stdout.decode("UTF-8")
+
+    def test_requests(self):
+        pot_path = os.path.join(self.xlet_dir, "po", "corpus@test.pot")
+
+        self._request("--extractor=builtin", "-x", "xlets/corpus@test")
+        self.assertTrue(os.path.exists(pot_path))
+
+        with open(pot_path, "r", encoding="UTF-8") as pot_file:
+            self.assertIn('msgid "Hello world"', pot_file.read())
+
+        os.remove(pot_path)
+        self._request("--extractor=builtin", "-o", "custom.pot", "-x", "xlets/corpus@test")
+        self.assertFalse(os.path.exists(pot_path))
+        self.assertTrue(os.path.exists(os.path.join(self.client_cwd, "custom.pot")))
+
+        self._request("-t", "-f", "custom.pot", "-x", "xlets/corpus@test")
+
+        # NOTE: The statistics file is opened by the client, from its working directory.
+        with open(self.opened_log, "r", encoding="UTF-8") as opened_log:
+            cwd, stats_path = opened_log.read().split()
+
+        self.assertEqual(os.path.realpath(cwd), os.path.realpath(self.client_cwd))
+
+        with open(stats_path, "r", encoding="UTF-8") as stats_file:
+            self.assertIn("|de.po|", stats_file.read())
+
+        self._request("-i", "-x", "xlets/corpus@test")
+        self.assertTrue(os.path.exists(os.path.join(self.home, ".local", "share", "locale", "de",
+                                                    "LC_MESSAGES", "corpus@test.mo")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Tests for the extraction cache.
+"""
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from AppData.MakeCinnamonXletPOTApp.extraction_cache import ExtractionCache
+
+
+class ExtractionCacheSaveTest(unittest.TestCase):
+    """The cache file must always be replaced by a complete file.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = self._tmp_dir.name
+        self.path = os.path.join(self.dir, "po", ".test.pot.cache")
+        self.source = os.path.join(self.dir, "source.js")
+
+        with open(self.source, "w", encoding="UTF-8") as source_file:
+            source_file.write('_("Hello");\n')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _new_cache(self, entries):
+        cache = ExtractionCache(self.path, {"keywords": ["_"]})
+
+        if cache.get("source.js", self.source) is None:
+            cache.set("source.js", entries)
+
+        return cache
+
+    def test_concurrent_saves(self):
+        caches = [self._new_cache([["String %i" % i] * 2000]) for i in range(8)]
+        threads = [threading.Thread(target=cache.save) for cache in caches]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        with open(self.path, "r", encoding="UTF-8") as cache_file:
+            data = json.load(cache_file)
+
+        self.assertEqual(len(data["files"]["source.js"]["entries"][0]), 2000)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [".test.pot.cache"])
+
+    def test_failed_save_keeps_previous_file(self):
+        self._new_cache(["first"]).save()
+        user_file = self.path + ".tmp"
+
+        with open(user_file, "w", encoding="UTF-8") as tmp_file:
+            tmp_file.write("not mine")
+
+        with open(self.source, "w", encoding="UTF-8") as source_file:
+            source_file.write('_("Modified");\n')
+
+        cache = self._new_cache([object()])
+
+        with self.assertRaises(TypeError):
+            cache.save()
+
+        self.assertEqual(ExtractionCache(self.path, {"keywords": ["_"]})._files[
+            "source.js"]["entries"], ["first"])
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.path))),
+                         [".test.pot.cache", ".test.pot.cache.tmp"])
+
+        with open(user_file, "r", encoding="UTF-8") as tmp_file:
+            self.assertEqual(tmp_file.read(), "not mine")
+
+
+if __name__ == "__main__":
+    unittest.main()
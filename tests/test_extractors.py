@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Tests for the built-in extractors.
+"""
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from AppData.MakeCinnamonXletPOTApp import extractors
+
+from support import UPDATE_FIXTURES
+from support import fixtures_folder
+from support import requires_commands
+from support import run_app
+
+# NOTE: The creation date is removed from the generated files. The expected file doesn't have it.
+_pot_creation_date_re = re.compile(r'^"POT-Creation-Date: [^\n]*\n', re.MULTILINE)
+_expected_path = os.path.join(fixtures_folder, "corpus@test.pot")
+
+
+class ExtractorCorpusTest(unittest.TestCase):
+    """Generate the POT file of the corpus xlet with both extractors and compare them.
+
+    The built-in extractor is compared with xgettext directly and with the expected POT file.
+    The expected file was written by hand following xgettext's rules, it still has to be
+    replaced by the output of xgettext. Running the tests with the ``UPDATE_FIXTURES``
+    environment variable set does it. The tests that run xgettext are skipped if it isn't
+    installed, except in the CI, where they are required.
+    """
+
+    def _generate(self, extractor):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            xlet_dir = os.path.join(tmp_dir, "corpus@test")
+            shutil.copytree(os.path.join(fixtures_folder, "corpus@test"), xlet_dir,
+                            ignore=shutil.ignore_patterns("__pycache__"))
+            result = run_app(["--extractor=%s" % extractor, "-x", xlet_dir])
+            self.assertEqual(result.returncode, 0, result.stdout.decode("UTF-8", "replace"))
+
+            with open(os.path.join(xlet_dir, "po", "corpus@test.pot"), "r",
+                      encoding="UTF-8") as pot_file:
+                return _pot_creation_date_re.sub("", pot_file.read())
+
+    def _expected(self):
+        with open(_expected_path, "r", encoding="UTF-8") as pot_file:
+            return pot_file.read()
+
+    def test_builtin_extractor(self):
+        self.maxDiff = None
+        self.assertEqual(self._generate("builtin"), self._expected())
+
+    @requires_commands("xgettext")
+    def test_builtin_extractor_matches_xgettext(self):
+        self.maxDiff = None
+        self.assertEqual(self._generate("builtin"), self._generate("xgettext"))
+
+    @requires_commands("xgettext")
+    def test_xgettext(self):
+        self.maxDiff = None
+        generated = self._generate("xgettext")
+
+        if UPDATE_FIXTURES:
+            with open(_expected_path, "w", encoding="UTF-8") as pot_file:
+                pot_file.write(generated)
+
+        self.assertEqual(generated, self._expected())
+
+
+class JavaScriptEscapeTest(unittest.TestCase):
+    """Escape sequences of JavaScript string literals.
+    """
+
+    def test_escapes(self):
+        entries = extractors.extract_javascript(
+            r'_("\x41 \u00e9 \u{1F600} \uD83D\uDE00 \q");', "a.js", ["_"])
+        self.assertEqual([entry["msgid"] for entry in entries],
+                         ["A \u00e9 \U0001f600 \U0001f600 q"])
+
+
+class PythonTokenizerErrorTest(unittest.TestCase):
+    """The Python extractor must keep scanning after a tokenizer error, as xgettext does.
+    """
+
+    def _extract(self, source):
+        errors = []
+        entries = extractors.extract_python(source, "a.py", ["_"], errors)
+
+        return [(entry["msgid"], entry["occurrences"][0][1]) for entry in entries], errors
+
+    def test_bad_indentation(self):
+        entries, errors = self._extract(
+            'def f():\n        print(_("a"))\n    print(_("b"))\nprint(_("c"))\n')
+        self.assertEqual(entries, [("a", "2"), ("b", "3"), ("c", "4")])
+        self.assertEqual([line for line, message in errors], [3])
+
+    def test_unterminated_string(self):
+        entries, errors = self._extract(
+            'print(_("a")); x = """\nprint(_("b"))\n')
+        self.assertEqual(entries, [("a", "1"), ("b", "2")])
+        self.assertEqual([line for line, message in errors], [1])
+
+    def test_unclosed_bracket(self):
+        entries, errors = self._extract('print(_("a"))\nfoo(\nprint(_("b"))\n')
+        self.assertEqual(entries, [("a", "1"), ("b", "3")])
+        self.assertEqual(len(errors), 1)
+
+
+class ExtractFileTest(unittest.TestCase):
+    """Errors of :any:`extractors.extract_file`.
+    """
+
+    def test_unsupported_language(self):
+        self.assertFalse(extractors.is_supported("C"))
+
+        with self.assertRaises(ValueError):
+            extractors.extract_file(__file__, "test.c", "C", ["_"])
+
+
+if __name__ == "__main__":
+    unittest.main()
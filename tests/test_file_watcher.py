@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Tests for the detection of file changes used by the watch mode.
+"""
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import file_watcher
+
+
+def _accept(path, is_dir):
+    return os.path.basename(path) != "ignored" and (is_dir or path.endswith(".js"))
+
+
+def _inotify_available():
+    try:
+        file_watcher.InotifyWatcher([], _accept).close()
+    except OSError:
+        return False
+
+    return True
+
+
+class _WatcherTest():
+    """Tests shared by both watchers.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self._tmp_dir.name
+        self.outside_dir = os.path.join(self.root, "outside")
+
+        for rel_path in ("xlet/applet.js", "xlet/lib/utils.js", "xlet/ignored/skip.js",
+                         "outside/extra.js", "outside/sub/deep.js"):
+            self._write(rel_path)
+
+        self.watcher = self._new_watcher([(self._path("xlet"), True), (self.outside_dir, False)])
+
+    def tearDown(self):
+        self.watcher.close()
+        self._tmp_dir.cleanup()
+
+    def _path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def _write(self, rel_path, contents=""):
+        os.makedirs(os.path.dirname(self._path(rel_path)), exist_ok=True)
+
+        with open(self._path(rel_path), "a", encoding="UTF-8") as file:
+            file.write(contents)
+
+    def _touch(self, rel_path):
+        # NOTE: A size change, so changes within the timestamp granularity are also detected.
+        self._write(rel_path, "// changed\n")
+
+    def test_modified_files(self):
+        self._touch("xlet/applet.js")
+        self._touch("xlet/lib/utils.js")
+        self._touch("outside/extra.js")
+
+        self.assertTrue({self._path("xlet/applet.js"), self._path("xlet/lib/utils.js"),
+                         self._path("outside/extra.js")} <= self._changes())
+
+    def test_not_watched_files(self):
+        self._touch("xlet/ignored/skip.js")
+        self._write("xlet/notes.txt", "text")
+        self._touch("outside/sub/deep.js")
+        self._touch("xlet/applet.js")
+
+        self.assertEqual(self._changes(), {self._path("xlet/applet.js")})
+
+    def test_new_and_removed_files(self):
+        os.remove(self._path("xlet/lib/utils.js"))
+        self._write("xlet/new/dir/new.js", "_('New');\n")
+
+        changes = self._changes()
+
+        self.assertIn(self._path("xlet/lib/utils.js"), changes)
+        self.assertTrue(self._path("xlet/new") in changes or
+                        self._path("xlet/new/dir/new.js") in changes)
+
+        # NOTE: Files inside new folders are watched too.
+        self._touch("xlet/new/dir/new.js")
+
+        self.assertIn(self._path("xlet/new/dir/new.js"), self._changes())
+
+    def test_wait(self):
+        self._touch("xlet/applet.js")
+
+        self.assertIn(self._path("xlet/applet.js"), self.watcher.wait(debounce=0.01))
+
+
+class PollingWatcherTest(_WatcherTest, unittest.TestCase):
+    """Changes are detected by comparing the modification times and sizes of the files.
+    """
+
+    def _new_watcher(self, roots):
+        return file_watcher.PollingWatcher(roots, _accept, interval=0.01)
+
+    def _changes(self):
+        return self.watcher._read_changes()
+
+    def test_no_changes(self):
+        self.assertEqual(self._changes(), set())
+
+
+@unittest.skipUnless(_inotify_available(), "inotify isn't available")
+class InotifyWatcherTest(_WatcherTest, unittest.TestCase):
+    """Changes are detected with inotify.
+    """
+
+    def _new_watcher(self, roots):
+        return file_watcher.InotifyWatcher(roots, _accept)
+
+    def _changes(self):
+        changes = set()
+
+        # NOTE: Read until no event arrives for a while, a single read could miss some.
+        while True:
+            more = self.watcher._read_changes(0.1)
+
+            if not more:
+                return changes
+
+            changes |= more
+
+    def test_no_changes(self):
+        self.assertEqual(self._changes(), set())
+
+
+class NewWatcherTest(unittest.TestCase):
+    """The polling watcher is used when inotify can't be used.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.roots = [(self._tmp_dir.name, True)]
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_fallback(self):
+        with mock.patch.object(file_watcher, "InotifyWatcher",
+                               side_effect=OSError(28, "No space left on device")):
+            watcher = file_watcher.new_watcher(self.roots, _accept)
+
+        self.assertIsInstance(watcher, file_watcher.PollingWatcher)
+        self.assertEqual(watcher.name, "polling")
+        watcher.close()
+
+    @unittest.skipUnless(_inotify_available(), "inotify isn't available")
+    def test_inotify(self):
+        watcher = file_watcher.new_watcher(self.roots, _accept)
+
+        try:
+            self.assertIsInstance(watcher, file_watcher.InotifyWatcher)
+            self.assertEqual(watcher.name, "inotify")
+        finally:
+            watcher.close()
+
+    def test_missing_root(self):
+        watcher = file_watcher.new_watcher([(os.path.join(self._tmp_dir.name, "missing"), True)],
+                                           _accept)
+        watcher.close()
+
+        self.assertIsInstance(watcher, file_watcher.PollingWatcher)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Tests for the installation of the localizations of an xlet (``--install``).
+"""
+import gettext
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import app_utils
+
+from support import requires_commands
+
+PO_FILE = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+msgid "Hello"
+msgstr "%s"
+"""
+
+BROKEN_PO_FILE = """msgid "Hello"
+msgstr "Hola"
+not a valid line
+"""
+
+
+class InstallTest(unittest.TestCase):
+    """The .po files are compiled into the locale store unless they are up to date.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = os.path.join(self._tmp_dir.name, "install@test")
+        self.locale_dir = os.path.join(self._tmp_dir.name, "locale")
+        os.makedirs(os.path.join(self.xlet_dir, "po"))
+
+        for lang, msgstr in (("de", "Hallo"), ("fr", "Bonjour")):
+            self._write_po(lang, PO_FILE % msgstr)
+
+        self.logger = mock.Mock()
+        self._patches = [
+            mock.patch.object(app_utils, "logger", self.logger, create=True),
+            mock.patch.object(app_utils, "LOCALE_DIR", self.locale_dir),
+        ]
+
+        for patch in self._patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self._patches:
+            patch.stop()
+
+        self._tmp_dir.cleanup()
+
+    def _write_po(self, lang, contents):
+        with open(self._po_path(lang), "w", encoding="UTF-8") as po_file:
+            po_file.write(contents)
+
+    def _po_path(self, lang):
+        return os.path.join(self.xlet_dir, "po", "%s.po" % lang)
+
+    def _mo_path(self, lang):
+        return os.path.join(self.locale_dir, lang, "LC_MESSAGES", "install@test.mo")
+
+    def _install(self, use_msgfmt=False):
+        if use_msgfmt:
+            app_utils._do_install("install@test", self.xlet_dir)
+        else:
+            with mock.patch.object(app_utils.cmd_utils, "which", return_value=None):
+                app_utils._do_install("install@test", self.xlet_dir)
+
+    def _translate(self, lang):
+        with open(self._mo_path(lang), "rb") as mo_file:
+            return gettext.GNUTranslations(mo_file).gettext("Hello")
+
+    def _assert_summary(self, installed, skipped, failed):
+        self.logger.info.assert_called_with(
+            "**Installed %i files, %i skipped (up to date), %i failed.**" %
+            (installed, skipped, failed), date=False)
+
+    def test_compile_and_skip(self):
+        self._install()
+
+        self._assert_summary(2, 0, 0)
+        self.assertEqual(self._translate("de"), "Hallo")
+        self.assertEqual(self._translate("fr"), "Bonjour")
+
+        # NOTE: Installed .mo files newer than their .po files aren't compiled again.
+        for lang in ("de", "fr"):
+            os.utime(self._po_path(lang), ns=(10 ** 18, 10 ** 18))
+            os.utime(self._mo_path(lang), ns=(2 * 10 ** 18, 2 * 10 ** 18))
+
+        self._write_po("de", PO_FILE % "Guten Tag")
+        os.utime(self._po_path("de"), ns=(3 * 10 ** 18, 3 * 10 ** 18))
+        self._install()
+
+        self._assert_summary(1, 1, 0)
+        self.assertEqual(self._translate("de"), "Guten Tag")
+        self.assertEqual(os.stat(self._mo_path("fr")).st_mtime_ns, 2 * 10 ** 18)
+
+    def test_failing_file(self):
+        self._write_po("es", BROKEN_PO_FILE)
+
+        with self.assertRaises(SystemExit) as context:
+            self._install()
+
+        self.assertEqual(context.exception.code, 1)
+        self._assert_summary(2, 0, 1)
+        self.assertTrue(any(call[0][0].startswith("**po/es.po:**")
+                            for call in self.logger.error.call_args_list))
+        self.assertFalse(os.path.exists(self._mo_path("es")))
+        self.assertEqual(self._translate("de"), "Hallo")
+
+    def test_missing_msgfmt_warning(self):
+        self._install()
+
+        self.assertIn("msgfmt command not found", self.logger.warning.call_args[0][0])
+
+    @requires_commands("msgfmt")
+    def test_msgfmt(self):
+        self._write_po("es", BROKEN_PO_FILE)
+
+        with self.assertRaises(SystemExit):
+            self._install(use_msgfmt=True)
+
+        self._assert_summary(2, 0, 1)
+        self.logger.warning.assert_not_called()
+        self.assertEqual(self._translate("de"), "Hallo")
+
+
+if __name__ == "__main__":
+    unittest.main()
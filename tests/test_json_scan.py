@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Tests for the extraction of the strings of metadata.json and settings-schema.json files.
+"""
+import json
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import app_utils
+from AppData.MakeCinnamonXletPOTApp.python_utils import polib
+
+SETTINGS_SCHEMA = {
+    "head": {"type": "header", "description": "General"},
+    "enable": {"type": "switch", "description": "Enable", "tooltip": "Enable"},
+    "enable2": {"type": "switch", "description": "Enable", "dependency": "enable"},
+    "list": {
+        "type": "list",
+        "description": "Enable",
+        "columns": [{"id": "on", "title": "Enable"}, {"id": "name", "title": "Name"}]
+    },
+    "mode": {"type": "combobox", "description": "Mode", "options": {"Enable": "on", "Off": "off"}},
+    "section": {"type": "section", "title": "General"}
+}
+
+
+class JSONCommentsTest(unittest.TestCase):
+    """Strings found more than once get one comment line per place they were found in.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = self._tmp_dir.name
+
+        for rel_path in ("settings-schema.json", "sub/settings-schema.json"):
+            os.makedirs(os.path.dirname(os.path.join(self.xlet_dir, rel_path)), exist_ok=True)
+
+            with open(os.path.join(self.xlet_dir, rel_path), "w", encoding="UTF-8") as schema:
+                json.dump(SETTINGS_SCHEMA, schema)
+
+        self._logger = mock.patch.object(app_utils, "logger", mock.Mock(), create=True)
+        self._logger.start()
+
+    def tearDown(self):
+        self._logger.stop()
+        self._tmp_dir.cleanup()
+
+    def test_repeated_keys(self):
+        pot_file = polib.POFile(indexed=True)
+        # NOTE: An entry extracted from a source file whose comment has a repeated line.
+        pot_file.append(polib.POEntry(msgid="General", comment="Translators: x\nTranslators: x",
+                                      occurrences=[("applet.js", "1")]))
+
+        app_utils._scan_json(self.xlet_dir, pot_file, app_utils._walk_xlet(self.xlet_dir)["json"])
+
+        self.assertEqual([(entry.msgid, entry.comment.split("\n")) for entry in pot_file], [
+            ("General", [
+                "Translators: x",
+                "Translators: x",
+                "settings-schema.json->head->description",
+                "settings-schema.json->section->title",
+                "sub->settings-schema.json->head->description",
+                "sub->settings-schema.json->section->title",
+            ]),
+            ("Enable", [
+                "settings-schema.json->enable->description",
+                "settings-schema.json->enable->tooltip",
+                "settings-schema.json->enable2->description",
+                "settings-schema.json->list->description",
+                "settings-schema.json->list->columns->title",
+                "settings-schema.json->mode->options",
+                "sub->settings-schema.json->enable->description",
+                "sub->settings-schema.json->enable->tooltip",
+                "sub->settings-schema.json->enable2->description",
+                "sub->settings-schema.json->list->description",
+                "sub->settings-schema.json->list->columns->title",
+                "sub->settings-schema.json->mode->options",
+            ]),
+            ("Name", [
+                "settings-schema.json->list->columns->title",
+                "sub->settings-schema.json->list->columns->title",
+            ]),
+            ("Mode", [
+                "settings-schema.json->mode->description",
+                "sub->settings-schema.json->mode->description",
+            ]),
+            ("Off", [
+                "settings-schema.json->mode->options",
+                "sub->settings-schema.json->mode->options",
+            ]),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,856 @@
+# -*- coding: utf-8 -*-
+"""Tests for the changes made to the bundled polib module.
+"""
+import copy
+import gettext
+import os
+import pickle
+import random
+import re
+import stat
+import struct
+import subprocess
+import tempfile
+import threading
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp.python_utils import polib
+
+from support import requires_commands
+
+PARSER_PO_FILE = r'''# Translator comment
+#
+msgid ""
+msgstr ""
+"Project-Id-Version: test\n"
+"Content-Type: text/plain; charset=UTF-8\n"
+"Plural-Forms: nplurals=3; plural=(n==1 ? 0 : n>=2 && n<=4 ? 1 : 2);\n"
+
+#. Extracted comment
+#: applet.js:1 applet.js:12
+#: helper.py:3
+#, fuzzy, javascript-format
+#| msgctxt "old menu"
+#| msgid "Old "
+#| "text"
+msgctxt "menu"
+msgid "Open "
+"\"file\""
+msgstr "Otevřít "
+"\"soubor\"\n"
+
+msgid "%d file"
+msgid_plural "%d files"
+msgstr[0] "%d soubor"
+msgstr[1] ""
+"%d soubory"
+msgstr[2] "%d souborů"
+
+#:
+#.
+#,
+msgid "Tab\there"
+msgstr ""
+
+#~ msgid "Removed"
+#~ msgstr "Odstraněno"
+
+#, fuzzy
+#~| msgid "Previous"
+#~| msgid_plural "Previouses"
+#~ msgctxt "ctx"
+#~ msgid "Obsolete"
+#~ "continued"
+#~ msgid_plural "Obsoletes"
+#~ msgstr[0] "Zastaralé"
+#~ msgstr[1] ""
+#~ "Zastaralé"
+#~ msgstr[2] "Zastaralých"
+'''
+
+MALFORMED_PO_FILES = [
+    'msgid "a"\nmsgstr "b"\nnot a valid line\n',
+    'msgid "a"b"\nmsgstr "b"\n',
+    'msgid "a"\nmsgstr "b"\n"c"d"\n',
+    'msgstr "b"\n',
+    'msgid "a"\nmsgid "b"\n',
+    'msgid "a"\nmsgstr[x "b"\n',
+    '#~ msgid "a"\n#~ bogus\n',
+    '"orphan continuation"\n',
+]
+
+
+class _CustomEntry(polib.POEntry):
+    # NOTE: Subclasses without __slots__ get a __dict__ again.
+    pass
+
+
+def _entry_state(entry):
+    return tuple(getattr(entry, name, None) for name in (
+        "msgid", "msgstr", "msgid_plural", "msgstr_plural", "msgctxt", "obsolete",
+        "encoding", "comment", "tcomment", "occurrences", "flags", "previous_msgctxt",
+        "previous_msgid", "previous_msgid_plural", "linenum"))
+
+
+def _translated_po_file(count=300):
+    po_file = polib.POFile()
+    po_file.metadata = {
+        "Content-Type": "text/plain; charset=UTF-8",
+        "Plural-Forms": "nplurals=3; plural=(n==1 ? 0 : n>=2 && n<=4 ? 1 : 2);",
+    }
+
+    for i in range(count):
+        po_file.append(polib.POEntry(msgid="Message %i" % i, msgstr="Zpráva %i" % i))
+
+    po_file.extend([
+        polib.POEntry(msgid="Open", msgstr="Otevřít"),
+        polib.POEntry(msgid="Open", msgstr="Otevřít soubor", msgctxt="file"),
+        polib.POEntry(msgid="%d file", msgid_plural="%d files",
+                      msgstr_plural={0: "%d soubor", 1: "%d soubory", 2: "%d souborů"}),
+        polib.POEntry(msgid="%d item", msgid_plural="%d items", msgctxt="menu",
+                      msgstr_plural={0: "%d položka", 1: "%d položky", 2: "%d položek"}),
+        polib.POEntry(msgid="Untranslated", msgstr=""),
+    ])
+
+    return po_file
+
+MERGE_PO_FILE = r'''msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\n"
+
+# Kept translator comment
+#. Old extracted comment
+#: old.js:1
+#, fuzzy
+msgid "Kept"
+msgstr "Zachováno"
+
+msgid "Removed"
+msgstr "Odstraněno"
+
+msgctxt "menu"
+msgid "Open"
+msgstr "Otevřít"
+
+msgid "%d file"
+msgid_plural "%d files"
+msgstr[0] "%d soubor"
+
+msgid "Duplicate"
+msgstr "First"
+
+msgid "Duplicate"
+msgstr "Second"
+
+msgid "Removed duplicate"
+msgstr "First"
+
+msgid "Removed duplicate"
+msgstr "Second"
+
+#~ msgid "Back"
+#~ msgstr "Zpět"
+
+#~ msgid "Still obsolete"
+#~ msgstr "Stále zastaralé"
+'''
+
+MERGE_POT_FILE = r'''msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\n"
+
+#. New extracted comment
+#: new.js:2
+#, javascript-format
+msgid "Kept"
+msgstr ""
+
+msgctxt "menu"
+msgid "Open"
+msgstr ""
+
+msgctxt "file"
+msgid "Open"
+msgstr ""
+
+msgid "%d file"
+msgid_plural "%d files"
+msgstr[0] ""
+msgstr[1] ""
+msgstr[2] ""
+
+msgid "Duplicate"
+msgstr ""
+
+msgid "Back"
+msgstr ""
+
+msgid "New"
+msgstr ""
+'''
+
+
+def _reference_merge(po_file, refpot):
+    # NOTE: The merge() of the original polib, which didn't return a summary.
+    self_entries = dict(
+        (entry.msgid_with_context, entry) for entry in po_file
+    )
+    refpot_msgids = set(entry.msgid_with_context for entry in refpot)
+    for entry in refpot:
+        e = self_entries.get(entry.msgid_with_context)
+        if e is None:
+            e = polib.POEntry()
+            po_file.append(e)
+        e.merge(entry)
+    for entry in po_file:
+        if entry.msgid_with_context not in refpot_msgids:
+            entry.obsolete = True
+
+
+def _reference_unescape(st):
+    # NOTE: The unescape() of the original polib.
+    def unescape_repl(m):
+        m = m.group(1)
+        if m == "n":
+            return "\n"
+        if m == "t":
+            return "\t"
+        if m == "r":
+            return "\r"
+        if m == "\\":
+            return "\\"
+        return m
+
+    return re.sub(r'\\(\\|n|t|r|")', unescape_repl, st)
+
+
+def _reference_str_field(fieldname, delflag, plural_index, field, wrapwidth=78):
+    # NOTE: The _str_field() of the original polib, which escaped each wrapped line again.
+    lines = field.splitlines(True)
+    if len(lines) > 1:
+        lines = [""] + lines
+    else:
+        escaped_field = polib.escape(field)
+        specialchars_count = 0
+        for c in ["\\", "\n", "\r", "\t", '"']:
+            specialchars_count += field.count(c)
+        flength = len(fieldname) + 3
+        if plural_index:
+            flength += len(plural_index)
+        real_wrapwidth = wrapwidth - flength + specialchars_count
+        if wrapwidth > 0 and len(field) > real_wrapwidth:
+            lines = [""] + [_reference_unescape(item) for item in polib.wrap(
+                escaped_field,
+                wrapwidth - 2,
+                drop_whitespace=False,
+                break_long_words=False
+            )]
+        else:
+            lines = [field]
+    if fieldname.startswith("previous_"):
+        fieldname = fieldname[9:]
+
+    ret = ['%s%s%s "%s"' % (delflag, fieldname, plural_index, polib.escape(lines.pop(0)))]
+    for line in lines:
+        ret.append('%s"%s"' % (delflag, polib.escape(line)))
+    return ret
+
+
+class IndexedFindTest(unittest.TestCase):
+    """Lookups on an indexed file must return the same entries as a linear scan.
+    """
+
+    def _assert_same_lookups(self, files, msgids):
+        indexed, linear = files
+
+        for msgid in msgids:
+            for msgctxt in (False, None, "ctx"):
+                self.assertIs(indexed.find(msgid, msgctxt=msgctxt),
+                              linear.find(msgid, msgctxt=msgctxt), (msgid, msgctxt))
+
+        self.assertEqual(indexed.find_many(msgids), linear.find_many(msgids))
+
+    def _populate(self):
+        entries = [
+            polib.POEntry(msgid="a", msgstr="first", msgctxt="ctx"),
+            polib.POEntry(msgid="b", msgstr="first"),
+            polib.POEntry(msgid="a", msgstr="second", msgctxt="other"),
+        ]
+        files = [polib.POFile(indexed=True), polib.POFile()]
+
+        for po_file in files:
+            po_file.extend(entries)
+
+        return files
+
+    def test_insert_duplicate_before_existing(self):
+        files = self._populate()
+        duplicate = polib.POEntry(msgid="a", msgstr="inserted", msgctxt="third")
+
+        for po_file in files:
+            po_file.insert(0, duplicate)
+
+        self.assertIs(files[0].find("a"), duplicate)
+        self._assert_same_lookups(files, ["a", "b", "c"])
+
+    def test_setitem_duplicate_before_existing(self):
+        files = self._populate()
+        duplicate = polib.POEntry(msgid="a", msgstr="replaced", msgctxt="third")
+
+        for po_file in files:
+            po_file[1] = duplicate
+
+        self._assert_same_lookups(files, ["a", "b"])
+
+        slice_entries = [polib.POEntry(msgid="b", msgstr="s%i" % i, msgctxt="c%i" % i)
+                         for i in range(3)]
+
+        for po_file in files:
+            po_file[0:1] = slice_entries
+
+        self._assert_same_lookups(files, ["a", "b"])
+
+    def test_sort_and_reverse(self):
+        files = self._populate()
+
+        for po_file in files:
+            po_file.insert(1, polib.POEntry(msgid="a", msgstr="middle", msgctxt="m"))
+            po_file.reverse()
+
+        self._assert_same_lookups(files, ["a", "b"])
+
+        for po_file in files:
+            po_file.sort(key=lambda e: e.msgstr)
+
+        self._assert_same_lookups(files, ["a", "b"])
+
+    def test_remove_keeps_index(self):
+        files = self._populate()
+
+        for po_file in files:
+            po_file.insert(0, polib.POEntry(msgid="a", msgstr="inserted", msgctxt="x"))
+            po_file.remove(po_file[1])
+            po_file.pop(0)
+
+        self._assert_same_lookups(files, ["a", "b"])
+
+
+class FastParserTest(unittest.TestCase):
+    """The fast parser must give the same result as the regular one.
+    """
+
+    def _parse(self, contents, **kwargs):
+        try:
+            return polib.pofile(contents, **kwargs)
+        except IOError as err:
+            return str(err)
+
+    def _assert_same(self, contents):
+        regular = self._parse(contents)
+        fast = self._parse(contents, fast_parser=True)
+
+        if isinstance(regular, str):
+            self.assertEqual(fast, regular)
+            return regular
+
+        self.assertEqual([_entry_state(entry) for entry in fast],
+                         [_entry_state(entry) for entry in regular])
+        self.assertEqual(fast.metadata, regular.metadata)
+        self.assertEqual(fast.header, regular.header)
+        self.assertEqual(str(fast), str(regular))
+
+        return fast
+
+    def test_all_fields(self):
+        po_file = self._assert_same(PARSER_PO_FILE)
+
+        self.assertEqual(len(po_file), 5)
+        self.assertEqual(po_file[0].previous_msgid, "Old text")
+        self.assertEqual(po_file[0].msgctxt, "menu")
+        self.assertEqual(po_file[1].msgstr_plural[1], "%d soubory")
+        # NOTE: Like the regular parser, the previous fields of obsolete entries are ignored.
+        self.assertIsNone(po_file[-1].previous_msgid_plural)
+        self.assertEqual(po_file[-1].msgid, "Obsoletecontinued")
+        self.assertEqual(po_file[-1].msgstr_plural[1], "Zastaralé")
+        self.assertTrue(po_file[-1].obsolete)
+
+    def test_malformed_lines(self):
+        for contents in MALFORMED_PO_FILES:
+            self.assertIsInstance(self._assert_same(contents), str, contents)
+
+    def test_truncated_files(self):
+        # NOTE: Every prefix, so files ending in the middle of an entry are covered.
+        lines = PARSER_PO_FILE.splitlines(True)
+
+        for i in range(len(lines)):
+            self._assert_same("".join(lines[:i]) or "\n")
+
+
+class IterEntriesTest(unittest.TestCase):
+    """Streamed entries must not depend on where the file is split into chunks.
+    """
+
+    def _states(self, **kwargs):
+        return [_entry_state(entry) for entry in polib.iter_entries(PARSER_PO_FILE, **kwargs)]
+
+    def test_chunk_boundaries(self):
+        expected = [_entry_state(entry) for entry in polib.pofile(PARSER_PO_FILE)]
+        # NOTE: The whole file in a single chunk.
+        with_metadata = self._states(with_metadata=True)
+
+        self.assertEqual(with_metadata[0][0], "")
+        self.assertEqual(with_metadata[1:], expected)
+
+        for chunk_size in range(1, len(PARSER_PO_FILE.splitlines()) + 2):
+            self.assertEqual(self._states(chunk_size=chunk_size), expected, chunk_size)
+            self.assertEqual(self._states(chunk_size=chunk_size, with_metadata=True),
+                             with_metadata, chunk_size)
+
+    def test_file_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "test.po")
+
+            with open(path, "w", encoding="UTF-8") as po_file:
+                po_file.write(PARSER_PO_FILE)
+
+            for chunk_size in (1, 2, 3, 1000):
+                self.assertEqual(
+                    [_entry_state(entry) for entry in polib.iter_entries(
+                        path, chunk_size=chunk_size)],
+                    [_entry_state(entry) for entry in polib.pofile(path)])
+
+    def test_malformed_lines(self):
+        for contents in MALFORMED_PO_FILES:
+            for chunk_size in (1, 2, 1000):
+                with self.assertRaises(IOError):
+                    list(polib.iter_entries(contents, chunk_size=chunk_size))
+
+
+class MOFileTest(unittest.TestCase):
+    """Compiled files must be readable by gettext, with or without a hash table.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.po_file = _translated_po_file()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _save(self, hash_table):
+        path = os.path.join(self._tmp_dir.name, "%s.mo" % hash_table)
+        self.po_file.save_as_mofile(path, hash_table=hash_table)
+
+        return path
+
+    def test_gnu_translations(self):
+        for hash_table in (True, False):
+            path = self._save(hash_table)
+
+            with open(path, "rb") as mo_file:
+                self.assertEqual(mo_file.read(28)[20:24] != b"\0\0\0\0", hash_table)
+                mo_file.seek(0)
+                translations = gettext.GNUTranslations(mo_file)
+
+            for i in (0, 1, 150, 299):
+                self.assertEqual(translations.gettext("Message %i" % i), "Zpráva %i" % i)
+
+            self.assertEqual(translations.gettext("Open"), "Otevřít")
+            self.assertEqual(translations.pgettext("file", "Open"), "Otevřít soubor")
+            self.assertEqual(translations.gettext("Untranslated"), "Untranslated")
+            self.assertEqual(translations.gettext("Missing"), "Missing")
+            self.assertEqual([translations.ngettext("%d file", "%d files", n) for n in (1, 3, 5)],
+                             ["%d soubor", "%d soubory", "%d souborů"])
+            self.assertEqual([translations.npgettext("menu", "%d item", "%d items", n)
+                              for n in (1, 3, 5)], ["%d položka", "%d položky", "%d položek"])
+
+    @requires_commands("msgunfmt")
+    def test_msgunfmt(self):
+        result = subprocess.run(["msgunfmt", self._save(True)], stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, check=True)
+        decompiled = polib.pofile(result.stdout.decode("UTF-8"))
+
+        def state(entries):
+            return sorted(((entry.msgctxt or "", entry.msgid, entry.msgstr, entry.msgstr_plural)
+                           for entry in entries), key=lambda item: item[:2])
+
+        self.assertEqual(state(decompiled),
+                         state(entry for entry in self.po_file if entry.translated()))
+
+
+class MappedMOFileTest(unittest.TestCase):
+    """Lookups must give the same translations with the hash table and the binary search.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.po_file = _translated_po_file()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _save(self, hash_table=True, name="test.mo"):
+        path = os.path.join(self._tmp_dir.name, name)
+        self.po_file.save_as_mofile(path, hash_table=hash_table)
+
+        return path
+
+    def _write(self, data):
+        path = os.path.join(self._tmp_dir.name, "broken.mo")
+
+        with open(path, "wb") as mo_file:
+            mo_file.write(data)
+
+        return path
+
+    def test_lookups(self):
+        for hash_table in (True, False):
+            with mock.patch.object(polib, "_mo_hash_string",
+                                   wraps=polib._mo_hash_string) as hash_string, \
+                    polib.mmap_mofile(self._save(hash_table)) as mo_file:
+                for i in (0, 1, 150, 299):
+                    self.assertEqual(mo_file.gettext("Message %i" % i), "Zpráva %i" % i)
+
+                self.assertEqual(mo_file.gettext("Open"), "Otevřít")
+                self.assertEqual(mo_file.gettext("Open", msgctxt="file"), "Otevřít soubor")
+                self.assertEqual(mo_file.gettext("Open", msgctxt="other"), "Open")
+                self.assertEqual(mo_file.gettext("%d file"), "%d soubor")
+                self.assertEqual(mo_file.gettext("%d item", msgctxt="menu"), "%d položka")
+                self.assertEqual(mo_file.gettext("%d item"), "%d item")
+                self.assertEqual(mo_file.gettext("Untranslated"), "Untranslated")
+                self.assertEqual(mo_file.gettext(""), "")
+                self.assertEqual(mo_file.gettext("Missing"), "Missing")
+
+                entry = mo_file.find("%d item", msgctxt="menu")
+                self.assertEqual(entry.msgid_plural, "%d items")
+                self.assertEqual(entry.msgstr_plural,
+                                 {0: "%d položka", 1: "%d položky", 2: "%d položek"})
+                self.assertIsNone(mo_file.find("Missing"))
+
+                self.assertEqual(mo_file.metadata["Plural-Forms"],
+                                 self.po_file.metadata["Plural-Forms"])
+                self.assertEqual(
+                    [(entry.msgctxt, entry.msgid, entry.msgstr) for entry in mo_file],
+                    [(entry.msgctxt, entry.msgid, entry.msgstr)
+                     for entry in polib.mofile(self._save(hash_table, "loaded.mo"))])
+
+            # NOTE: Strings are only hashed when the file has a hash table.
+            self.assertEqual(hash_string.called, hash_table)
+
+    def test_corrupt_files(self):
+        with open(self._save(), "rb") as mo_file:
+            data = mo_file.read()
+
+        for broken in (b"", data[:3], data[:20], data[:27], data[:100],
+                       b"\0\0\0\0" + data[4:],
+                       data[:4] + struct.pack("<I", 2 << 16) + data[8:]):
+            with self.assertRaises(IOError):
+                polib.mmap_mofile(self._write(broken)).close()
+
+        # NOTE: Strings are only checked when they are read.
+        with polib.mmap_mofile(self._write(data[:-2])) as mo_file:
+            with self.assertRaises(IOError):
+                list(mo_file)
+
+    def test_corrupt_hash_table(self):
+        with open(self._save(), "rb") as mo_file:
+            data = bytearray(mo_file.read())
+
+        hash_size, hash_offset = struct.unpack_from("<2I", data, 20)
+        struct.pack_into("<%iI" % hash_size, data, hash_offset, *([1] * hash_size))
+
+        with polib.mmap_mofile(self._write(bytes(data))) as mo_file:
+            with self.assertRaises(IOError):
+                mo_file.gettext("Missing")
+
+
+class MergeTest(unittest.TestCase):
+    """Merging must give the same file as the original merge.
+    """
+
+    def _assert_same(self, po_contents, pot_contents, **kwargs):
+        refpot = polib.pofile(pot_contents)
+        expected = polib.pofile(po_contents)
+        before = [(entry, entry.obsolete) for entry in expected]
+        keys = set(entry.msgid_with_context for entry in expected)
+        _reference_merge(expected, refpot)
+
+        po_file = polib.pofile(po_contents, **kwargs)
+        summary = po_file.merge(refpot)
+
+        self.assertEqual([_entry_state(entry) for entry in po_file],
+                         [_entry_state(entry) for entry in expected])
+        self.assertEqual(str(po_file), str(expected))
+        self.assertEqual(summary, {
+            "added": len(expected) - len(before),
+            "updated": len(keys & set(entry.msgid_with_context for entry in refpot)),
+            "obsoleted": sum(1 for entry, obsolete in before
+                             if entry.obsolete and not obsolete),
+        })
+
+        return po_file, summary
+
+    def test_merge(self):
+        po_file, summary = self._assert_same(MERGE_PO_FILE, MERGE_POT_FILE)
+
+        self.assertEqual(summary, {"added": 2, "updated": 5, "obsoleted": 3})
+        self.assertFalse(po_file.find("Back", include_obsolete_entries=True).obsolete)
+        self.assertTrue(po_file.find("Still obsolete", include_obsolete_entries=True).obsolete)
+        self.assertEqual(po_file.find("%d file").msgstr_plural,
+                         {0: "%d soubor", 1: "", 2: ""})
+        self.assertEqual(po_file.find("Kept").flags, ["javascript-format", "fuzzy"])
+        self.assertEqual([entry.obsolete for entry in po_file if entry.msgid == "Duplicate"],
+                         [False, False])
+
+    def test_indexed(self):
+        po_file = self._assert_same(MERGE_PO_FILE, MERGE_POT_FILE, indexed=True)[0]
+
+        self.assertEqual(po_file.find("Open", msgctxt="file").msgctxt, "file")
+        self.assertEqual(po_file.find("New").msgid, "New")
+
+    def test_empty_files(self):
+        self._assert_same(MERGE_PO_FILE, "")
+        self._assert_same("", MERGE_POT_FILE)
+        self._assert_same(MERGE_PO_FILE, MERGE_PO_FILE)
+
+
+class EntrySlotsTest(unittest.TestCase):
+    """Entries without a __dict__ must still be copied and pickled with all their data.
+    """
+
+    def setUp(self):
+        self.po_file = polib.pofile(PARSER_PO_FILE)
+
+    def test_pickle(self):
+        for entry in self.po_file:
+            loaded = pickle.loads(pickle.dumps(entry))
+
+            self.assertEqual(_entry_state(loaded), _entry_state(entry))
+            self.assertEqual(str(loaded), str(entry))
+
+        mo_entry = polib.MOEntry(msgid="a", msgstr="b", msgctxt="c")
+        self.assertEqual(_entry_state(pickle.loads(pickle.dumps(mo_entry))),
+                         _entry_state(mo_entry))
+
+        loaded = pickle.loads(pickle.dumps(self.po_file))
+        self.assertEqual(str(loaded), str(self.po_file))
+
+    def test_pickle_subclass(self):
+        entry = _CustomEntry(msgid="a", flags=["fuzzy"])
+        entry.extra = "kept"
+        loaded = pickle.loads(pickle.dumps(entry))
+
+        self.assertEqual(loaded.extra, "kept")
+        self.assertEqual(_entry_state(loaded), _entry_state(entry))
+
+    def test_state_without_slots(self):
+        # NOTE: The state of an entry pickled before __slots__ were used.
+        entry = polib.POEntry.__new__(polib.POEntry)
+        entry.__setstate__({
+            "msgid": "a", "msgstr": "", "msgid_plural": "as", "msgstr_plural": {0: "b"},
+            "msgctxt": None, "obsolete": False, "encoding": "utf-8", "comment": "",
+            "tcomment": "", "occurrences": [("a.js", "1")], "flags": ["fuzzy"],
+            "previous_msgctxt": None, "previous_msgid": None, "previous_msgid_plural": None,
+            "linenum": 3,
+        })
+
+        self.assertEqual(entry.msgstr_plural, {0: "b"})
+        self.assertEqual(entry.occurrences, [("a.js", "1")])
+        self.assertTrue(entry.fuzzy)
+        self.assertEqual(entry.linenum, 3)
+
+    def test_deepcopy(self):
+        for entry in self.po_file:
+            copied = copy.deepcopy(entry)
+            state = _entry_state(entry)
+
+            self.assertEqual(_entry_state(copied), state)
+
+            copied.flags.append("copied")
+            copied.occurrences.append(("copied.js", "1"))
+            copied.msgstr_plural[9] = "copied"
+
+            self.assertEqual(_entry_state(entry), state)
+
+    def test_lazy_containers(self):
+        first = polib.POEntry(msgid="a")
+        second = polib.POEntry(msgid="b")
+        first.flags.append("fuzzy")
+        first.occurrences.append(("a.js", "1"))
+        first.msgstr_plural[0] = "a"
+
+        self.assertEqual((second.flags, second.occurrences, second.msgstr_plural), ([], [], {}))
+        self.assertIsNot(polib.POEntry().flags, polib.POEntry().flags)
+        self.assertIsNot(polib.MOEntry().occurrences, polib.MOEntry().occurrences)
+
+        shared = ["fuzzy"]
+        entry = polib.POEntry(msgid="c", flags=shared)
+        entry.flags.append("c-format")
+        self.assertIs(entry.flags, shared)
+
+
+class StrFieldTest(unittest.TestCase):
+    """Fields must be serialized like the original polib did, escaping each string once.
+    """
+
+    def _str_field(self, func, *args):
+        try:
+            return func(*args)
+        except ValueError as err:
+            # NOTE: textwrap refuses widths below 1.
+            return type(err)
+
+    def _assert_same(self, field, wrapwidth):
+        entry = polib.POEntry()
+
+        for fieldname, delflag, plural_index in (("msgid", "", ""),
+                                                 ("msgstr", "", "[1]"),
+                                                 ("previous_msgid", "#| ", ""),
+                                                 ("msgctxt", "#~ ", "")):
+            args = (fieldname, delflag, plural_index, field, wrapwidth)
+            self.assertEqual(self._str_field(entry._str_field, *args),
+                             self._str_field(_reference_str_field, *args), args)
+
+    def test_special_chars_near_wrap_width(self):
+        rand = random.Random(0)
+        pieces = ["\\", '"', "\n", "\t", "\r", " ", "-", "a", "word", "\\n", '\\"', "a-b"]
+
+        for wrapwidth in (0, 1, 2, 10, 20, 78, 79, 80):
+            for length in range(max(wrapwidth - 12, 0), wrapwidth + 12):
+                for i in range(5):
+                    field = "".join(rand.choice(pieces) for j in range(length))[:length]
+                    self._assert_same(field, wrapwidth)
+
+    def test_long_lines(self):
+        for field in ("\\" * 200, '"' * 200, "\t" * 200, "\n" * 200,
+                      'a \\"b\\" c\td\n' * 40, "x" * 300, "x " * 150,
+                      "path\\to\\file - " * 20, "- " * 100):
+            for wrapwidth in (0, 1, 40, 78):
+                self._assert_same(field, wrapwidth)
+
+
+class FindManyTest(unittest.TestCase):
+    """Batch lookups must return what a lookup of each string returns.
+    """
+
+    def _files(self):
+        contents = PARSER_PO_FILE + "\n" + MERGE_PO_FILE.split("\n\n", 1)[1]
+        return polib.pofile(contents), polib.pofile(contents, indexed=True)
+
+    def test_same_as_find(self):
+        for po_file in self._files():
+            sts = set()
+
+            for entry in po_file:
+                sts.update([entry.msgid, entry.msgstr, entry.msgctxt])
+
+            sts = sorted(st for st in sts if st is not None) + ["Missing", "Missing"]
+
+            for by in ("msgid", "msgstr", "msgctxt"):
+                for include_obsolete_entries in (False, True):
+                    for msgctxt in (False, None, "menu", "ctx"):
+                        kwargs = {"by": by, "msgctxt": msgctxt,
+                                  "include_obsolete_entries": include_obsolete_entries}
+                        found = po_file.find_many(sts, **kwargs)
+
+                        self.assertEqual(set(found), set(sts))
+
+                        for st in sts:
+                            self.assertIs(found[st], po_file.find(st, **kwargs), (st, kwargs))
+
+    def test_obsolete_and_context(self):
+        for po_file in self._files():
+            found = po_file.find_many(["Back", "Open"])
+            self.assertIsNone(found["Back"])
+            self.assertEqual(found["Open"].msgctxt, "menu")
+
+            found = po_file.find_many(["Back", "Open"], include_obsolete_entries=True,
+                                      msgctxt=None)
+            self.assertEqual(found, {"Back": po_file.find("Back", include_obsolete_entries=True),
+                                     "Open": None})
+            found = po_file.find_many(["Back", "Obsoletecontinued"],
+                                      include_obsolete_entries=True)
+            self.assertEqual([found[st].msgid for st in found], ["Back", "Obsoletecontinued"])
+            self.assertEqual(po_file.find_many([]), {})
+
+    def test_occurrences(self):
+        for po_file in self._files():
+            found = po_file.find_many(["applet.js", "helper.py", "old.js", "missing.js"],
+                                      by="occurrences")
+
+            self.assertEqual(found, {"applet.js": [po_file[0]], "helper.py": [po_file[0]],
+                                     "old.js": [po_file.find("Kept")], "missing.js": []})
+
+    def test_invalid_property(self):
+        with self.assertRaises(ValueError):
+            polib.POFile().find_many(["a"], by="comment")
+
+
+class SaveTest(unittest.TestCase):
+    """Files must be replaced atomically by :any:`polib._BaseFile.save`.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp_dir.name, "test.po")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _new_file(self, msgid, count=1, **kwargs):
+        po_file = polib.POFile(**kwargs)
+        po_file.extend(polib.POEntry(msgid="%s %i" % (msgid, i), msgstr=msgid)
+                       for i in range(count))
+
+        return po_file
+
+    def test_concurrent_saves(self):
+        files = [self._new_file("Writer %i" % i, 2000) for i in range(8)]
+        threads = [threading.Thread(target=po_file.save, args=(self.path,)) for po_file in files]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        with open(self.path, "r", encoding="UTF-8") as po_file:
+            content = po_file.read()
+
+        self.assertIn(content, [str(po_file) for po_file in files])
+        self.assertEqual(os.listdir(self._tmp_dir.name), ["test.po"])
+
+    def test_failed_save(self):
+        self._new_file("First").save(self.path)
+        user_file = self.path + ".tmp"
+
+        with open(user_file, "w", encoding="UTF-8") as tmp_file:
+            tmp_file.write("not mine")
+
+        with self.assertRaises(UnicodeEncodeError):
+            self._new_file("Ünicode", encoding="ascii").save(self.path)
+
+        self.assertEqual(polib.pofile(self.path)[0].msgid, "First 0")
+        self.assertEqual(sorted(os.listdir(self._tmp_dir.name)), ["test.po", "test.po.tmp"])
+
+        with open(user_file, "r", encoding="UTF-8") as tmp_file:
+            self.assertEqual(tmp_file.read(), "not mine")
+
+    def test_file_mode(self):
+        umask = os.umask(0o027)
+
+        try:
+            self._new_file("New").save(self.path)
+            self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+            os.chmod(self.path, 0o604)
+            self._new_file("Existing").save_as_mofile(self.path)
+            self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o604)
+        finally:
+            os.umask(umask)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Tests for the header and the saving of the generated POT files.
+"""
+import datetime
+import json
+import os
+import re
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import app_utils
+
+from support import run_app
+
+TIMESTAMP = "2021-09-27 08:34+0000"
+
+
+def _fragment(msgid, comment=""):
+    return [{
+        "msgid": msgid,
+        "msgid_plural": "",
+        "msgctxt": None,
+        "comment": comment,
+        "flags": [],
+        "occurrences": [["applet.js", "1"]]
+    }]
+
+
+class HeaderTest(unittest.TestCase):
+    """The header of the POT files.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = os.path.join(self._tmp_dir.name, "header@test")
+        os.makedirs(self.xlet_dir)
+
+        with open(os.path.join(self.xlet_dir, "metadata.json"), "w",
+                  encoding="UTF-8") as metadata_file:
+            json.dump({"uuid": "header@test", "version": "1.2"}, metadata_file)
+
+        self._patches = [
+            mock.patch.object(app_utils, "logger", mock.Mock(), create=True),
+            mock.patch.object(app_utils, "_get_timestamp", lambda: TIMESTAMP),
+        ]
+
+        for patch in self._patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self._patches:
+            patch.stop()
+
+        self._tmp_dir.cleanup()
+
+    def _content_type(self, pot_file):
+        return pot_file.metadata["Content-Type"]
+
+    def test_ascii_charset(self):
+        # NOTE: xgettext only declares the charset if a string or a comment isn't ASCII.
+        self.assertEqual(self._content_type(app_utils._build_source_catalog(
+            [_fragment("Hello")])), "text/plain; charset=CHARSET")
+        self.assertEqual(self._content_type(app_utils._build_source_catalog(
+            [_fragment("Hello"), _fragment("Café")])), "text/plain; charset=UTF-8")
+        self.assertEqual(self._content_type(app_utils._build_source_catalog(
+            [_fragment("Hello", "Translators: café")])), "text/plain; charset=UTF-8")
+
+    def test_custom_header(self):
+        pot_file = app_utils._build_source_catalog([_fragment("Hello")])
+        app_utils._apply_custom_header(self.xlet_dir, pot_file, {
+            "FIRST_AUTHOR": "Jane Doe",
+            "FIRST_AUTHOR_EMAIL": "<jane@example.com>",
+            "COPY_INITIAL_YEAR": "2019"
+        })
+
+        self.assertEqual(pot_file.__unicode__(), app_utils.POT_HEADER.format(
+            FIRST_AUTHOR="Jane Doe",
+            FIRST_AUTHOR_EMAIL="<jane@example.com>",
+            COPY_CURRENT_YEAR=str(datetime.datetime.now().year),
+            COPY_INITIAL_YEAR="2019-",
+            PACKAGE="header@test",
+            VERSION="1.2",
+            SCRIPT_VERSION=app_utils.__version__,
+            TIMESTAMP=TIMESTAMP
+        ) + "\n".join([
+            "",
+            "#: applet.js:1",
+            'msgid "Hello"',
+            'msgstr ""',
+            "",
+        ]))
+
+
+class SkipUnchangedTest(unittest.TestCase):
+    """POT files whose only change is their creation date aren't overwritten.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.pot_path = os.path.join(self._tmp_dir.name, "test.pot")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _save(self, fragments, timestamp, skip_unchanged=True):
+        with mock.patch.object(app_utils, "_get_timestamp", lambda: timestamp):
+            pot_file = app_utils._build_source_catalog(fragments)
+
+        return app_utils._save_pot_file(pot_file, self.pot_path, skip_unchanged)
+
+    def _set_old_mtime(self):
+        os.utime(self.pot_path, ns=(10 ** 18, 10 ** 18))
+
+    def _read(self):
+        with open(self.pot_path, "r", encoding="UTF-8") as pot_file:
+            return pot_file.read()
+
+    def test_only_creation_date_changed(self):
+        self.assertTrue(self._save([_fragment("Hello")], "2021-01-01 00:00+0000"))
+        self._set_old_mtime()
+        contents = self._read()
+
+        self.assertFalse(self._save([_fragment("Hello")], "2021-09-27 08:34+0000"))
+        self.assertEqual(os.stat(self.pot_path).st_mtime_ns, 10 ** 18)
+        self.assertEqual(self._read(), contents)
+
+    def test_content_changed(self):
+        self._save([_fragment("Hello")], "2021-01-01 00:00+0000")
+
+        for fragments in ([_fragment("Hello", "Translators: new comment")],
+                          [_fragment("Hello"), _fragment("World")],
+                          [_fragment("Bye")]):
+            self._set_old_mtime()
+
+            self.assertTrue(self._save(fragments, "2021-01-01 00:00+0000"))
+            self.assertNotEqual(os.stat(self.pot_path).st_mtime_ns, 10 ** 18)
+            self.assertIn(fragments[-1][0]["msgid"], self._read())
+
+    def test_option_not_passed(self):
+        self._save([_fragment("Hello")], "2021-01-01 00:00+0000")
+        self._set_old_mtime()
+
+        self.assertTrue(self._save([_fragment("Hello")], "2021-01-01 00:00+0000",
+                                   skip_unchanged=False))
+        self.assertNotEqual(os.stat(self.pot_path).st_mtime_ns, 10 ** 18)
+
+    def test_command_line(self):
+        xlet_dir = os.path.join(self._tmp_dir.name, "skip@test")
+        os.makedirs(xlet_dir)
+
+        with open(os.path.join(xlet_dir, "metadata.json"), "w", encoding="UTF-8") as md_file:
+            json.dump({"uuid": "skip@test", "name": "Skip"}, md_file)
+
+        with open(os.path.join(xlet_dir, "applet.js"), "w", encoding="UTF-8") as js_file:
+            js_file.write('_("Hello");\n')
+
+        args = ["--extractor=builtin", "--skip-unchanged", "-x", xlet_dir]
+        self.pot_path = os.path.join(xlet_dir, "po", "skip@test.pot")
+        self.assertEqual(run_app(args).returncode, 0)
+
+        # NOTE: Both runs could happen within the same minute, so the date is changed by hand.
+        contents = re.sub(r'"POT-Creation-Date: [^\n]*',
+                          lambda match: r'"POT-Creation-Date: 2000-01-01 00:00+0000\n"',
+                          self._read())
+
+        with open(self.pot_path, "w", encoding="UTF-8") as pot_file:
+            pot_file.write(contents)
+
+        self._set_old_mtime()
+        result = run_app(args)
+
+        self.assertIn(b"POT file unchanged.", result.stdout)
+        self.assertEqual(os.stat(self.pot_path).st_mtime_ns, 10 ** 18)
+        self.assertEqual(self._read(), contents)
+
+        with open(os.path.join(xlet_dir, "applet.js"), "a", encoding="UTF-8") as js_file:
+            js_file.write('_("World");\n')
+
+        result = run_app(args)
+
+        self.assertIn(b"POT file saved.", result.stdout)
+        self.assertIn('msgid "World"', self._read())
+
+
+if __name__ == "__main__":
+    unittest.main()
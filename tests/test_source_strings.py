@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Tests for the extraction of the strings of JavaScript and Python files.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import app_utils
+from AppData.MakeCinnamonXletPOTApp.python_utils import polib
+
+from support import fixtures_folder
+from support import requires_commands
+from support import run_app
+
+_pot_creation_date_re = re.compile(r'^"POT-Creation-Date: [^\n]*\n', re.MULTILINE)
+
+POT_HEADER = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+"""
+
+# NOTE: The output of a single xgettext run over a.js and lib/b.js.
+BATCH_OUTPUT = POT_HEADER + """#: a.js:3 lib/b.js:1 lib/b.js:9
+msgid "Shared"
+msgstr ""
+
+#: a.js:5
+msgid "Only in a"
+msgstr ""
+
+#: lib/b.js:4
+msgctxt "menu"
+msgid "Only in b"
+msgstr ""
+
+#: lib/b.js:2
+msgid "Shared"
+msgstr ""
+"""
+
+# NOTE: The output of a single xgettext run over a.js, b.js and c.js.
+AMBIGUOUS_OUTPUT = POT_HEADER + """#. Translators: from a
+#: a.js:1 b.js:1
+msgid "Commented"
+msgstr ""
+
+#: b.js:2 c.js:2
+msgid "One file"
+msgid_plural "Many files"
+msgstr[0] ""
+msgstr[1] ""
+
+#: c.js:3
+msgid "Only in c"
+msgstr ""
+"""
+
+
+def _data(msgid, occurrences, msgctxt=None, msgid_plural="", comment="", flags=[]):
+    return {
+        "msgid": msgid,
+        "msgid_plural": msgid_plural,
+        "msgctxt": msgctxt,
+        "comment": comment,
+        "flags": flags,
+        "occurrences": occurrences
+    }
+
+
+def _split(output, files):
+    return app_utils._split_xgettext_entries(polib.pofile(output), files)
+
+
+def _completed(output, returncode=0):
+    return subprocess.CompletedProcess([], returncode, stdout=output.encode("UTF-8"),
+                                       stderr=b"")
+
+
+class SplitXgettextEntriesTest(unittest.TestCase):
+    """The output of a single xgettext run is split by file.
+    """
+
+    def test_split(self):
+        self.assertEqual(_split(BATCH_OUTPUT, ["./a.js", "lib/b.js"]), [
+            [
+                _data("Shared", [["a.js", "3"]]),
+                _data("Only in a", [["a.js", "5"]]),
+            ],
+            [
+                _data("Shared", [["lib/b.js", "1"], ["lib/b.js", "9"]]),
+                _data("Shared", [["lib/b.js", "2"]]),
+                _data("Only in b", [["lib/b.js", "4"]], msgctxt="menu"),
+            ],
+        ])
+
+    def test_ambiguous_entries(self):
+        # NOTE: Only c.js doesn't have a string with comments, flags or a plural form that is
+        # also found in other files.
+        self.assertEqual(_split(AMBIGUOUS_OUTPUT, ["a.js", "b.js", "c.js", "d.js"]), [
+            None,
+            None,
+            None,
+            [],
+        ])
+        self.assertEqual(_split(AMBIGUOUS_OUTPUT.split("#: b.js:2")[0],
+                                     ["a.js", "b.js", "c.js"]),
+                         [None, None, []])
+
+    def test_unknown_file(self):
+        self.assertEqual(_split(BATCH_OUTPUT, ["a.js", "b.js"]), [None, None])
+
+
+class ExtractSourceStringsTest(unittest.TestCase):
+    """Files of the same language are scanned with a single xgettext run.
+    """
+
+    def setUp(self):
+        self._logger = mock.patch.object(app_utils, "logger", mock.Mock(), create=True)
+        self._logger.start()
+
+    def tearDown(self):
+        self._logger.stop()
+
+    def _extract(self, outputs, source_files):
+        # NOTE: The files scanned on their own are scanned concurrently, so the output is
+        # chosen by the files passed to xgettext and the order of their runs is ignored.
+        with mock.patch.object(app_utils.cmd_utils, "run_cmd", side_effect=lambda cmd, **kwargs:
+                               outputs[tuple(cmd[7:])]) as run_cmd:
+            fragments = app_utils._extract_source_strings("/xlet", source_files, ["_"])
+
+        calls = [call[0][0][7:] for call in run_cmd.call_args_list]
+
+        return fragments, calls[:1] + sorted(calls[1:])
+
+    def test_single_run(self):
+        fragments, calls = self._extract({("./a.js", "lib/b.js"): _completed(BATCH_OUTPUT)},
+                                         [("JavaScript", "./a.js"), ("JavaScript", "lib/b.js")])
+
+        self.assertEqual(calls, [["./a.js", "lib/b.js"]])
+        self.assertEqual(fragments, _split(BATCH_OUTPUT, ["./a.js", "lib/b.js"]))
+
+    def test_ambiguous_files_scanned_alone(self):
+        fragments, calls = self._extract({
+            ("a.js", "b.js", "d.js"): _completed(AMBIGUOUS_OUTPUT.split("#: b.js:2")[0]),
+            ("a.js",): _completed(POT_HEADER + '#. Translators: from a\n#: a.js:1\n'
+                                  'msgid "Commented"\nmsgstr ""\n'),
+            ("b.js",): _completed(POT_HEADER + '#: b.js:1\nmsgid "Commented"\nmsgstr ""\n'),
+        }, [("JavaScript", "a.js"), ("JavaScript", "b.js"), ("JavaScript", "d.js")])
+
+        self.assertEqual(calls, [["a.js", "b.js", "d.js"], ["a.js"], ["b.js"]])
+        self.assertEqual(fragments, [
+            [_data("Commented", [["a.js", "1"]], comment="Translators: from a")],
+            [_data("Commented", [["b.js", "1"]])],
+            [],
+        ])
+
+    def test_failed_run(self):
+        fragments, calls = self._extract({
+            ("a.py", "b.py"): _completed("", returncode=1),
+            ("a.py",): _completed(""),
+            ("b.py",): _completed(POT_HEADER + '#: b.py:1\nmsgid "Hello"\nmsgstr ""\n'),
+        }, [("Python", "a.py"), ("Python", "b.py")])
+
+        self.assertEqual(calls, [["a.py", "b.py"], ["a.py"], ["b.py"]])
+        self.assertEqual(fragments, [[], [_data("Hello", [["b.py", "1"]])]])
+
+
+class ExtractionCacheRunsTest(unittest.TestCase):
+    """Generating a POT file with the strings taken from the cache gives the same file.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = os.path.join(self._tmp_dir.name, "corpus@test")
+        self.pot_path = os.path.join(self.xlet_dir, "po", "corpus@test.pot")
+        shutil.copytree(os.path.join(fixtures_folder, "corpus@test"), self.xlet_dir,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _run(self, extractor):
+        result = run_app(["--extractor=%s" % extractor, "--use-cache", "-x", self.xlet_dir])
+        self.assertEqual(result.returncode, 0, result.stdout.decode("UTF-8", "replace"))
+
+        with open(self.pot_path, "r", encoding="UTF-8") as pot_file:
+            return _pot_creation_date_re.sub("", pot_file.read()), result.stdout
+
+    def _check_runs(self, extractor):
+        cold, output = self._run(extractor)
+        self.assertIn(b"Scanned 2 file(s), 0 taken from cache.", output)
+
+        warm, output = self._run(extractor)
+        self.assertIn(b"Scanned 0 file(s), 2 taken from cache.", output)
+        self.assertEqual(warm, cold)
+
+        with open(os.path.join(self.xlet_dir, "files", "corpus@test", "applet.js"), "a",
+                  encoding="UTF-8") as js_file:
+            js_file.write('\n_("Appended string");\n')
+
+        edited, output = self._run(extractor)
+        self.assertIn(b"Scanned 1 file(s), 1 taken from cache.", output)
+        self.assertIn('msgid "Appended string"', edited)
+
+        with open(os.path.join(os.path.dirname(self.pot_path), ".corpus@test.pot.cache"), "r",
+                  encoding="UTF-8") as cache_file:
+            cached = json.load(cache_file)["files"]
+
+        self.assertIn("Appended string", [data["msgid"] for file_data in cached.values()
+                                          for data in file_data["entries"]])
+
+    def test_builtin_extractor(self):
+        self._check_runs("builtin")
+
+    @requires_commands("xgettext")
+    def test_xgettext(self):
+        self._check_runs("xgettext")
+
+    @requires_commands("xgettext")
+    def test_batch_matches_single_files(self):
+        source_dir = os.path.join(self.xlet_dir, "files", "corpus@test")
+        shutil.copy(os.path.join(source_dir, "applet.js"), os.path.join(source_dir, "copy.js"))
+
+        with open(os.path.join(source_dir, "other.js"), "w", encoding="UTF-8") as js_file:
+            js_file.write('_("Hello world");\n_("Divided");\n_("Only in other");\n')
+
+        source_files = [("JavaScript", "files/corpus@test/%s" % name)
+                        for name in ("applet.js", "copy.js", "other.js")]
+
+        with mock.patch.object(app_utils, "logger", mock.Mock(), create=True):
+            self.assertEqual(
+                app_utils._extract_source_strings(self.xlet_dir, source_files, ["_"]),
+                [app_utils._run_xgettext(self.xlet_dir, file, language, ["_"])
+                 for language, file in source_files])
+
+
+if __name__ == "__main__":
+    unittest.main()
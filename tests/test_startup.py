@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Tests for the startup time of the command line interface.
+
+Commands that docopt handles by itself (``--help``, ``--version``) must not import the modules
+that are only needed to scan xlets. The import time of the ``cli`` module is measured with
+``python3 -X importtime`` in a fresh interpreter.
+"""
+import subprocess
+import sys
+import unittest
+
+from support import app_folder
+
+PACKAGE = "AppData.MakeCinnamonXletPOTApp"
+
+HEAVY_MODULES = [
+    "%s.app_utils" % PACKAGE,
+    "%s.python_utils.polib" % PACKAGE,
+    "%s.python_utils.log_system" % PACKAGE,
+    "%s.python_utils.file_utils" % PACKAGE,
+]
+
+IMPORT_BUDGET = 0.2
+"""float: Maximum cumulative import time of the ``cli`` module, in seconds.
+
+It is about ten times what it takes on a desktop machine, so only eager imports of heavy
+modules should exceed it.
+"""
+
+
+def _import_times(*args):
+    """Run a Python command with ``-X importtime`` from a temporary folder.
+
+    Parameters
+    ----------
+    *args
+        Arguments passed to the Python interpreter after ``-X importtime``.
+
+    Returns
+    -------
+    dict
+        The cumulative import time of each imported module, in seconds.
+    """
+    with app_folder() as cwd:
+        proc = subprocess.run([sys.executable, "-X", "importtime"] + list(args), cwd=cwd,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+
+    times = {}
+
+    for line in proc.stderr.decode("UTF-8").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        cumulative, module = line.split("|")[1:]
+        times[module.strip()] = int(cumulative) / 1000000
+
+    return times
+
+
+class StartupTest(unittest.TestCase):
+    """The command line interface must start quickly.
+    """
+
+    def test_help_and_version_import_no_heavy_module(self):
+        for option in ("--help", "--version"):
+            imported = _import_times("app.py", option)
+
+            self.assertIn("%s.cli" % PACKAGE, imported)
+            self.assertEqual([module for module in HEAVY_MODULES if module in imported], [],
+                             option)
+
+    def test_cli_import_time(self):
+        # NOTE: Keep the best of a few runs so that a busy machine doesn't make the test fail.
+        best = min(_import_times("-c", "import %s.cli" % PACKAGE)["%s.cli" % PACKAGE]
+                   for i in range(3))
+
+        self.assertLess(best, IMPORT_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Tests for the translation statistics (``--gen-stats``).
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import app_utils
+from AppData.MakeCinnamonXletPOTApp.python_utils import misc_utils
+from AppData.MakeCinnamonXletPOTApp.python_utils import polib
+
+from support import requires_commands
+
+POT_FILE = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: nplurals=INTEGER; plural=EXPRESSION;\\n"
+
+msgid "One"
+msgstr ""
+
+msgid "Two"
+msgstr ""
+
+msgid "%d file"
+msgid_plural "%d files"
+msgstr[0] ""
+msgstr[1] ""
+
+msgctxt "menu"
+msgid "Open"
+msgstr ""
+
+msgctxt "button"
+msgid "Open"
+msgstr ""
+
+msgid "Revived"
+msgstr ""
+
+msgid "New string"
+msgid_plural "New strings"
+msgstr[0] ""
+msgstr[1] ""
+"""
+
+PO_FILE = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: nplurals=3; plural=(n==1 ? 0 : n>=2 && n<=4 ? 1 : 2);\\n"
+
+msgid "One"
+msgstr "Jeden"
+
+msgid "%d file"
+msgid_plural "%d files"
+msgstr[0] ""
+msgstr[1] ""
+msgstr[2] ""
+
+#, fuzzy
+msgctxt "menu"
+msgid "Open"
+msgstr "Otevřít"
+
+msgctxt "button"
+msgid "Open"
+msgstr ""
+
+msgid "Gone"
+msgstr "Pryč"
+
+#~ msgid "Revived"
+#~ msgstr "Oživený"
+
+#~ msgid "Old"
+#~ msgstr "Starý"
+"""
+
+
+class _Logger():
+    """Logger that discards everything.
+    """
+
+    def info(self, *args, **kwargs):
+        pass
+
+    warning = error = info
+
+
+class TransStatsTableTest(unittest.TestCase):
+    """The statistics table keeps the layout generated by the msgmerge/msggrep pipeline.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = os.path.join(self._tmp_dir.name, "stats@test")
+        po_dir = os.path.join(self.xlet_dir, "po")
+        os.makedirs(po_dir)
+        self.pot_path = os.path.join(po_dir, "stats@test.pot")
+
+        pot_file = polib.POFile()
+        pot_file.extend(polib.POEntry(msgid="String %i" % i) for i in range(4))
+        pot_file.save(self.pot_path)
+
+        po_file = polib.POFile()
+        po_file.metadata = {"Content-Type": "text/plain; charset=UTF-8"}
+        po_file.append(polib.POEntry(msgid="String 0", msgstr="Translated"))
+        po_file.append(polib.POEntry(msgid="String 1", msgstr="Fuzzy", flags=["fuzzy"]))
+        po_file.append(polib.POEntry(msgid="Gone", msgstr="Obsolete"))
+        po_file.save(os.path.join(po_dir, "de.po"))
+
+        self._logger = mock.patch.object(app_utils, "logger", _Logger(), create=True)
+        self._logger.start()
+
+    def tearDown(self):
+        self._logger.stop()
+        self._tmp_dir.cleanup()
+
+    def _generate(self, full_stats):
+        with mock.patch.object(app_utils.cmd_utils, "run_cmd") as run_cmd:
+            app_utils._generate_trans_stats("stats@test", self.xlet_dir, self.pot_path,
+                                            full_stats=full_stats)
+
+        table_path = os.path.join(misc_utils.get_system_tempdir(), "MakeCinnamonXletPOT-tmp",
+                                  "stats@test", "po_files_untranslated_table.md")
+        run_cmd.assert_called_once_with(["xdg-open", table_path])
+
+        with open(table_path, "r", encoding="UTF-8") as table_file:
+            return table_file.read()
+
+    def test_default_table(self):
+        self.assertEqual(self._generate(False), "\n".join([
+            "### stats@test",
+            "",
+            "|LANGUAGE|UNTRANSLATED|",
+            "|--------|------------|",
+            "|de.po|2|",
+        ]))
+
+    def test_full_table(self):
+        self.assertEqual(self._generate(True), "\n".join([
+            "### stats@test",
+            "",
+            "|LANGUAGE|UNTRANSLATED|FUZZY|OBSOLETE|",
+            "|--------|------------|-----|--------|",
+            "|de.po|2|1|1|",
+        ]))
+
+
+
+class MergedStatsTest(unittest.TestCase):
+    """The strings are counted after updating the .po files from the POT file.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = os.path.join(self._tmp_dir.name, "merge@test")
+        self.po_dir = os.path.join(self.xlet_dir, "po")
+        os.makedirs(self.po_dir)
+        self.pot_path = os.path.join(self.po_dir, "merge@test.pot")
+
+        with open(self.pot_path, "w", encoding="UTF-8") as pot_file:
+            pot_file.write(POT_FILE)
+
+        for lang in ("cs", "sk"):
+            with open(os.path.join(self.po_dir, "%s.po" % lang), "w",
+                      encoding="UTF-8") as po_file:
+                po_file.write(PO_FILE)
+
+        self._logger = mock.patch.object(app_utils, "logger", _Logger(), create=True)
+        self._logger.start()
+
+    def tearDown(self):
+        self._logger.stop()
+        self._tmp_dir.cleanup()
+
+    def _stats(self, lang):
+        return app_utils._po_file_stats(os.path.join(self.po_dir, "%s.po" % lang),
+                                        polib.pofile(self.pot_path))
+
+    def test_stats(self):
+        # NOTE: "Two", "button|Open" and both plural strings (with 3 plural forms) are
+        # untranslated, "menu|Open" is fuzzy and "Gone" and "Old" are obsolete. "Revived" comes
+        # back from the obsolete strings with its translation.
+        self.assertEqual(self._stats("cs"), (8, 1, 2))
+
+    def test_worker_processes(self):
+        with mock.patch.object(app_utils.cmd_utils, "run_cmd"):
+            app_utils._generate_trans_stats("merge@test", self.xlet_dir, self.pot_path,
+                                            full_stats=True)
+
+        with open(os.path.join(misc_utils.get_system_tempdir(), "MakeCinnamonXletPOT-tmp",
+                               "merge@test", "po_files_untranslated_table.md"), "r",
+                  encoding="UTF-8") as table_file:
+            self.assertEqual(table_file.read().splitlines()[-2:], ["|cs.po|8|1|2|",
+                                                                   "|sk.po|8|1|2|"])
+
+    def test_cached_stats(self):
+        caches = {}
+
+        with mock.patch.object(app_utils, "_po_file_stats",
+                               wraps=app_utils._po_file_stats) as po_file_stats, \
+                mock.patch.object(app_utils.cmd_utils, "run_cmd"):
+            for i in range(2):
+                app_utils._generate_trans_stats("merge@test", self.xlet_dir, self.pot_path,
+                                                caches)
+
+        # NOTE: The .po files are counted in this process and only once.
+        self.assertEqual(po_file_stats.call_count, 2)
+        self.assertEqual(sorted(stats for fingerprint, stats in caches.values()),
+                         [(8, 1, 2), (8, 1, 2)])
+
+    @requires_commands("msgmerge", "msggrep")
+    def test_msgmerge_parity(self):
+        # NOTE: The pipeline used before the statistics were generated without gettext.
+        po_path = os.path.join(self._tmp_dir.name, "cs.po")
+        shutil.copy(os.path.join(self.po_dir, "cs.po"), po_path)
+        subprocess.run(["msgmerge", "--silent", "--no-wrap", "--no-fuzzy-matching",
+                        "--backup=off", "--update", po_path, self.pot_path], check=True)
+        output = subprocess.run('msggrep -v -T -e "." "%s" | grep -c ^msgstr' % po_path,
+                                shell=True, stdout=subprocess.PIPE).stdout
+        count = int(output.decode("UTF-8").strip())
+
+        self.assertEqual(self._stats("cs")[0], count - 1 if count > 0 else count)
+
+
+if __name__ == "__main__":
+    unittest.main()
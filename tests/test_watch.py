@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""Tests for the data kept in memory between the runs of the watch mode (``--watch``).
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import app_utils
+from AppData.MakeCinnamonXletPOTApp import cli
+from AppData.MakeCinnamonXletPOTApp.python_utils.docopt import docopt
+from AppData.MakeCinnamonXletPOTApp.source_catalog import SourceCatalog
+
+from support import fixtures_folder
+
+TIMESTAMP = "2021-09-27 08:34+0000"
+
+
+def _data(msgid, file, line, comment="", msgid_plural="", flags=[], msgctxt=None):
+    return {
+        "msgid": msgid,
+        "msgid_plural": msgid_plural,
+        "msgctxt": msgctxt,
+        "comment": comment,
+        "flags": list(flags),
+        "occurrences": [[file, str(line)]]
+    }
+
+
+def _fragments():
+    return {
+        "a.js": [
+            _data("Hello", "a.js", 1, "Translators: from a"),
+            _data("%d file", "a.js", 2, msgid_plural="%d files"),
+            _data("Open", "a.js", 3, msgctxt="menu"),
+        ],
+        "b.js": [
+            _data("Hello", "b.js", 5, "Translators: from b", flags=["javascript-format"]),
+            _data("Open", "b.js", 1),
+        ],
+        "c.py": [
+            _data("%d file", "c.py", 1),
+            _data("Hello", "c.py", 2, "Translators: from a"),
+        ],
+    }
+
+
+class SourceCatalogTest(unittest.TestCase):
+    """Updating a catalog gives the same result as merging all the files again.
+    """
+
+    def setUp(self):
+        self._timestamp = mock.patch.object(app_utils, "_get_timestamp", lambda: TIMESTAMP)
+        self._timestamp.start()
+        self.catalog = SourceCatalog()
+        self.fragments = _fragments()
+
+    def tearDown(self):
+        self._timestamp.stop()
+
+    def _check(self, files):
+        fragments = [self.fragments[file] for file in files]
+
+        with mock.patch.object(SourceCatalog, "_merge", autospec=True,
+                               side_effect=SourceCatalog._merge) as merge:
+            updated = app_utils._build_source_catalog(fragments, files, self.catalog)
+
+        self.assertEqual(updated.__unicode__(),
+                         app_utils._build_source_catalog(fragments).__unicode__())
+
+        return set(call[0][1] for call in merge.call_args_list)
+
+    def test_updates(self):
+        self.assertEqual(self._check(["a.js", "b.js", "c.py"]), {
+            ("menu", "Open"), (None, "%d file"), (None, "Hello"), (None, "Open")})
+
+        # NOTE: Unmodified files, even if scanned again.
+        self.fragments = _fragments()
+        self.assertEqual(self._check(["a.js", "b.js", "c.py"]), set())
+
+        self.fragments["b.js"] = [_data("Open", "b.js", 2), _data("Close", "b.js", 3)]
+        self.assertEqual(self._check(["a.js", "b.js", "c.py"]),
+                         {(None, "Close"), (None, "Hello"), (None, "Open")})
+
+        self.fragments["0.js"] = [_data("Hello", "0.js", 1, "Translators: first")]
+        self.assertEqual(self._check(["0.js", "a.js", "b.js", "c.py"]), {(None, "Hello")})
+
+        self.assertEqual(self._check(["0.js", "b.js", "c.py"]),
+                         {(None, "%d file"), (None, "Hello")})
+        self.assertNotIn(("menu", "Open"), self.catalog.entries)
+
+    def test_repeated_and_reordered_files(self):
+        self._check(["a.js", "b.js", "c.py"])
+        self._check(["a.js", "b.js", "c.py", "a.js"])
+        self._check(["c.py", "b.js", "a.js"])
+        self._check([])
+        self.assertEqual(self.catalog.entries, {})
+
+    def test_entries_not_modified(self):
+        fragments = [self.fragments[file] for file in ("a.js", "b.js")]
+        pot_file = app_utils._build_source_catalog(fragments, ["a.js", "b.js"], self.catalog)
+        pot_file.find("Hello").comment = "Modified"
+
+        self.assertEqual(self.catalog.entries[(None, "Hello")].comment,
+                         "Translators: from a\nTranslators: from b")
+
+
+class JSONCacheTest(unittest.TestCase):
+    """JSON files are only loaded again when they are modified.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = self._tmp_dir.name
+
+        for name, data in (("metadata.json", {"name": "Cached"}),
+                           ("settings-schema.json", {"key": {"description": "Setting"}})):
+            with open(os.path.join(self.xlet_dir, name), "w", encoding="UTF-8") as json_file:
+                json.dump(data, json_file)
+
+        self._logger = mock.patch.object(app_utils, "logger", mock.Mock(), create=True)
+        self._logger.start()
+
+    def tearDown(self):
+        self._logger.stop()
+        self._tmp_dir.cleanup()
+
+    def _scan(self, json_cache):
+        pot_file = app_utils.polib.POFile()
+
+        with mock.patch("json.load", wraps=json.load) as json_load:
+            app_utils._scan_json(self.xlet_dir, pot_file,
+                                 app_utils._walk_xlet(self.xlet_dir)["json"], [], json_cache)
+
+        return [entry.msgid for entry in pot_file], json_load.call_count
+
+    def test_cache(self):
+        json_cache = {}
+
+        self.assertEqual(self._scan(json_cache), (["Cached", "Setting"], 2))
+        self.assertEqual(self._scan(json_cache), (["Cached", "Setting"], 0))
+
+        with open(os.path.join(self.xlet_dir, "metadata.json"), "w",
+                  encoding="UTF-8") as json_file:
+            json.dump({"name": "Modified name"}, json_file)
+
+        self.assertEqual(self._scan(json_cache), (["Modified name", "Setting"], 1))
+
+        os.remove(os.path.join(self.xlet_dir, "settings-schema.json"))
+
+        self.assertEqual(self._scan(json_cache), (["Modified name"], 0))
+        self.assertEqual(list(json_cache), [os.path.join(self.xlet_dir, "metadata.json")])
+
+
+class WatchRunsTest(unittest.TestCase):
+    """Runs that reuse the data of previous runs generate the same POT file as a normal run.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = os.path.join(self._tmp_dir.name, "corpus@test")
+        shutil.copytree(os.path.join(fixtures_folder, "corpus@test"), self.xlet_dir,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        self.source_dir = os.path.join(self.xlet_dir, "files", "corpus@test")
+
+        self._patches = [
+            mock.patch.object(app_utils, "logger", mock.Mock(), create=True),
+            mock.patch.object(app_utils, "_get_timestamp", lambda: TIMESTAMP),
+        ]
+
+        for patch in self._patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self._patches:
+            patch.stop()
+
+        self._tmp_dir.cleanup()
+
+    def _generate(self, caches=None):
+        pot_path = os.path.join(self._tmp_dir.name, "%s.pot" % ("normal" if caches is None
+                                                                else "watch"))
+        app_utils._process_xlet(self.xlet_dir, docopt(cli.docopt_doc, argv=[
+            "--extractor=builtin", "-o", pot_path, "-x", self.xlet_dir]), caches)
+
+        with open(pot_path, "r", encoding="UTF-8") as pot_file:
+            return pot_file.read()
+
+    def _write(self, rel_path, contents):
+        with open(os.path.join(self.xlet_dir, rel_path), "w", encoding="UTF-8") as file:
+            file.write(contents)
+
+    def _check(self, caches):
+        self.assertEqual(self._generate(caches), self._generate())
+
+    def test_runs(self):
+        caches = {}
+        self._check(caches)
+
+        self._write("files/corpus@test/applet.js", '_("Hello world");\n_("Edited");\n')
+        self._check(caches)
+
+        self._write("files/corpus@test/extra.js", '// Translators: new file\n_("Edited");\n')
+        self._write("settings-schema.json",
+                    json.dumps({"key": {"description": "Edited", "tooltip": "Hello world"}}))
+        self._check(caches)
+
+        os.remove(os.path.join(self.source_dir, "helper.py"))
+        self._write("metadata.json", json.dumps({"uuid": "corpus@test", "name": "Renamed"}))
+        self._check(caches)
+
+        self.assertIn('msgid "Renamed"', self._generate(caches))
+
+
+if __name__ == "__main__":
+    unittest.main()
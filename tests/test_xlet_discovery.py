@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Tests for the discovery of xlets and of the files inside them.
+"""
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from AppData.MakeCinnamonXletPOTApp import app_utils
+
+XLET_FILES = (
+    "metadata.json",
+    "settings-schema.json",
+    "applet.js",
+    "b.py",
+    "a.py",
+    "README.md",
+    "lib/utils.js",
+    "lib/deep/more.js",
+    "lib/metadata.json",
+    "z/settings-schema.json",
+    "z/tool.py",
+    "node_modules/dep/index.js",
+    "node_modules/dep/metadata.json",
+)
+
+
+def _touch(root, rel_path):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write("{}" if rel_path.endswith(".json") else "")
+
+
+class WalkXletTest(unittest.TestCase):
+    """A single walk finds the JavaScript, Python and JSON files of an xlet.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.xlet_dir = self._tmp_dir.name
+
+        for rel_path in XLET_FILES:
+            _touch(self.xlet_dir, rel_path)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_relative_paths_and_order(self):
+        self.assertEqual(app_utils._walk_xlet(self.xlet_dir), {
+            "js": ["./applet.js", "lib/utils.js", "lib/deep/more.js",
+                   "node_modules/dep/index.js"],
+            "py": ["./a.py", "./b.py", "z/tool.py"],
+            "json": ["./metadata.json", "./settings-schema.json", "lib/metadata.json",
+                     "node_modules/dep/metadata.json", "z/settings-schema.json"],
+        })
+
+    def test_same_as_os_walk(self):
+        # NOTE: The order and the relative paths the files had when os.walk was used.
+        expected = {"js": [], "py": [], "json": []}
+
+        for root, dirs, files in os.walk(self.xlet_dir):
+            dirs.sort()
+
+            for name in sorted(files):
+                rel_path = os.path.join(os.path.relpath(root, self.xlet_dir), name)
+
+                if name.endswith(".js"):
+                    expected["js"].append(rel_path)
+                elif name.endswith(".py"):
+                    expected["py"].append(rel_path)
+                elif name in ("metadata.json", "settings-schema.json"):
+                    expected["json"].append(rel_path)
+
+        self.assertEqual(app_utils._walk_xlet(self.xlet_dir), expected)
+
+    def test_ignored_patterns(self):
+        found = app_utils._walk_xlet(self.xlet_dir, ["node_modules", "lib/deep", "b.py"])
+
+        self.assertEqual(found["js"], ["./applet.js", "lib/utils.js"])
+        self.assertEqual(found["py"], ["./a.py", "z/tool.py"])
+        # NOTE: JSON files inside ignored folders are ignored too.
+        self.assertEqual(found["json"], ["./metadata.json", "./settings-schema.json",
+                                         "lib/metadata.json", "z/settings-schema.json"])
+
+    def test_ignored_folders_not_entered(self):
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            app_utils._walk_xlet(self.xlet_dir, ["node_modules", "deep"])
+
+        scanned = sorted(os.path.relpath(call[0][0], self.xlet_dir)
+                         for call in scandir.call_args_list)
+        self.assertEqual(scanned, [".", "lib", "z"])
+
+    def test_symbolic_links(self):
+        with tempfile.TemporaryDirectory() as outside_dir:
+            _touch(outside_dir, "outside.js")
+            _touch(outside_dir, "settings-schema.json")
+            os.symlink(outside_dir, os.path.join(self.xlet_dir, "linked_dir"))
+            os.symlink(os.path.join(outside_dir, "settings-schema.json"),
+                       os.path.join(self.xlet_dir, "lib", "settings-schema.json"))
+            os.symlink(os.path.join(outside_dir, "outside.js"),
+                       os.path.join(self.xlet_dir, "linked.js"))
+
+            found = app_utils._walk_xlet(self.xlet_dir)
+
+        # NOTE: Symbolic links to folders aren't followed and the ones to JSON files are
+        # ignored, but the ones to source files are scanned.
+        self.assertIn("./linked.js", found["js"])
+        self.assertFalse(any("outside" in path for path in found["js"]))
+        self.assertNotIn("lib/settings-schema.json", found["json"])
+        self.assertNotIn("linked_dir/settings-schema.json", found["json"])
+
+
+class FindXletsTest(unittest.TestCase):
+    """Any folder containing a metadata.json file is an xlet.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self._tmp_dir.name
+
+        for rel_path in ("spices/b@test/metadata.json",
+                         "spices/b@test/files/b@test/metadata.json",
+                         "spices/a@test/metadata.json",
+                         "spices/group/c@test/metadata.json",
+                         "spices/.git/d@test/metadata.json",
+                         "spices/empty/README.md"):
+            _touch(self.root, rel_path)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def test_nested_xlets(self):
+        # NOTE: Folders inside xlets and hidden folders aren't searched.
+        self.assertEqual(app_utils._find_xlets([self._path("spices")]), [
+            self._path("spices", "a@test"),
+            self._path("spices", "b@test"),
+            self._path("spices", "group", "c@test"),
+        ])
+
+    def test_xlet_folder(self):
+        self.assertEqual(app_utils._find_xlets([self._path("spices", "b@test")]),
+                         [self._path("spices", "b@test")])
+
+    def test_folder_without_xlets(self):
+        self.assertEqual(app_utils._find_xlets([self._path("spices", "empty")]),
+                         [self._path("spices", "empty")])
+
+    def test_relative_and_repeated_paths(self):
+        with mock.patch("os.getcwd", return_value=self._path("spices")):
+            found = app_utils._find_xlets(["group", "a@test", self._path("spices", "a@test")])
+
+        self.assertEqual(found, [self._path("spices", "a@test"),
+                                 self._path("spices", "group", "c@test")])
+
+    def test_missing_path(self):
+        with self.assertRaises(SystemExit) as context:
+            app_utils._find_xlets([self._path("spices"), self._path("missing")])
+
+        self.assertEqual(str(context.exception), "%s does not exist." % self._path("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()